@@ -0,0 +1,66 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import pytest
+
+from fakes import make_isa, with_latency
+from qiskit_rigetti import RigettiQCSProvider
+
+# Simulated round trip to the QCS API for each request
+LATENCY = 0.005
+
+
+@pytest.fixture
+def qcs_api(mocker):
+    def patch(num_qpus):
+        qpus = [f"Device-{i}" for i in range(num_qpus)]
+        isas = {qpu: make_isa(qpu, 8) for qpu in qpus}
+        mocker.patch(
+            "qiskit_rigetti._qcs_provider.list_quantum_computers", side_effect=with_latency(lambda **_: qpus, LATENCY)
+        )
+        mocker.patch(
+            "qiskit_rigetti._qcs_provider.get_instruction_set_architecture",
+            side_effect=with_latency(lambda qpu, client: isas[qpu], LATENCY),
+        )
+
+    return patch
+
+
+@pytest.mark.parametrize("num_qpus", [1, 100])
+def test_backends(benchmark, qcs_api, num_qpus):
+    qcs_api(num_qpus)
+
+    backends = benchmark(lambda: RigettiQCSProvider().backends())
+
+    assert len(backends) == num_qpus
+
+
+@pytest.mark.parametrize("num_qpus", [1, 100])
+def test_backends__name(benchmark, qcs_api, num_qpus):
+    qcs_api(num_qpus)
+
+    backends = benchmark(lambda: RigettiQCSProvider().backends("Device-0"))
+
+    assert len(backends) == 1
+
+
+@pytest.mark.parametrize("num_qpus", [1, 100])
+def test_backends__discovery_cache(benchmark, qcs_api, tmp_path, num_qpus):
+    qcs_api(num_qpus)
+    RigettiQCSProvider(discovery_cache=tmp_path).backends()
+
+    backends = benchmark(lambda: RigettiQCSProvider(discovery_cache=tmp_path).backends())
+
+    assert len(backends) == num_qpus
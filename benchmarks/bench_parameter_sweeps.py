@@ -0,0 +1,57 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+
+from fakes import make_fake_backend
+
+
+@pytest.mark.parametrize("num_bindings", [1, 100, 10_000])
+def test_parameter_binds(benchmark, num_bindings):
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(2, 2)
+    circuit.rx(theta, 0)
+    circuit.cz(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    bindings = [{theta: i / num_bindings} for i in range(num_bindings)]
+
+    result = benchmark.pedantic(
+        lambda backend: backend.run(circuit, shots=100, parameter_binds=bindings).result(),
+        setup=lambda: ((make_fake_backend(2),), {}),
+        rounds=1 if num_bindings > 100 else 5,
+    )
+
+    assert len(result.results) == num_bindings
+
+
+@pytest.mark.parametrize("num_points", [1, 100, 10_000])
+def test_parameter_binds__array(benchmark, num_points):
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(2, 2)
+    circuit.rx(theta, 0)
+    circuit.cz(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    values = np.linspace(0, 1, num_points)[:, np.newaxis]
+
+    result = benchmark.pedantic(
+        lambda backend: backend.run(circuit, shots=100, parameter_binds=values).result(),
+        setup=lambda: ((make_fake_backend(2),), {}),
+        rounds=1 if num_points > 100 else 5,
+    )
+
+    assert result.get_memory_array().shape == (num_points, 100, 2)
@@ -0,0 +1,32 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import pytest
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+from qiskit_rigetti._qcs_backend import _prepare_circuit
+
+
+@pytest.mark.parametrize("readout", ["ro", "c"])
+@pytest.mark.parametrize("num_gates", [10, 10_000])
+def test_prepare_circuit(benchmark, num_gates, readout):
+    circuit = QuantumCircuit(QuantumRegister(4, "q"), ClassicalRegister(4, readout))
+    for i in range(num_gates):
+        circuit.rx(0.1, i % 4)
+    circuit.measure(range(4), range(4))
+
+    prepared = benchmark(_prepare_circuit, circuit)
+
+    assert prepared.data == circuit.data
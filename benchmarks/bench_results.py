@@ -0,0 +1,49 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+
+from fakes import make_fake_backend
+from qiskit_rigetti._qcs_job import _decode_readout
+
+SHOTS = [1, 10_000, 1_000_000]
+
+
+@pytest.mark.parametrize("num_bits", [3, 80])
+@pytest.mark.parametrize("shots", SHOTS)
+def test_decode_readout(benchmark, shots, num_bits):
+    readout = np.random.default_rng(seed=0).integers(0, 2, size=(shots, num_bits), dtype=np.int8)
+
+    bitstrings, _, counts = benchmark(_decode_readout, readout)
+
+    assert sum(counts) == shots
+
+
+@pytest.mark.parametrize("memory", [False, True])
+@pytest.mark.parametrize("shots", SHOTS)
+def test_result(benchmark, shots, memory):
+    circuit = QuantumCircuit(3, 3)
+    circuit.h(0)
+    circuit.measure(range(3), range(3))
+    backend = make_fake_backend(3)
+    backend.run(circuit, shots=shots).result()  # Compile once, so that only execution and decoding are measured
+
+    result = benchmark.pedantic(
+        lambda: backend.run(circuit, shots=shots, memory=memory).result(), rounds=3 if shots > 10_000 else 5
+    )
+
+    assert sum(result.get_counts().values()) == shots
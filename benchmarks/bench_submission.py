@@ -0,0 +1,62 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import pytest
+from qiskit import QuantumCircuit
+
+from fakes import make_fake_backend
+from qiskit_rigetti import ExecutableCache
+
+SIZES = [1, 100, 10_000]
+
+
+def make_circuits(num_circuits: int) -> list:
+    # Distinct angles give distinct programs, so that nothing is served from the executable cache
+    circuits = []
+    for i in range(num_circuits):
+        circuit = QuantumCircuit(3, 3)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.rx(i / num_circuits, 2)
+        circuit.measure(range(3), range(3))
+        circuits.append(circuit)
+    return circuits
+
+
+@pytest.mark.parametrize("num_circuits", SIZES)
+def test_run(benchmark, num_circuits):
+    circuits = make_circuits(num_circuits)
+
+    result = benchmark.pedantic(
+        lambda backend: backend.run(circuits, shots=100).result(),
+        setup=lambda: ((make_fake_backend(3),), {}),
+        rounds=1 if num_circuits > 100 else 5,
+    )
+
+    assert len(result.results) == num_circuits
+
+
+@pytest.mark.parametrize("num_circuits", SIZES)
+def test_run__cached(benchmark, num_circuits):
+    circuits = make_circuits(num_circuits)
+    backend = make_fake_backend(3, executable_cache=ExecutableCache(max_size=num_circuits))
+    backend.run(circuits, shots=100).result()
+
+    result = benchmark.pedantic(
+        lambda: backend.run(circuits, shots=100).result(), rounds=1 if num_circuits > 100 else 5
+    )
+
+    assert len(result.results) == num_circuits
+    assert backend.executable_cache.hits >= num_circuits
@@ -0,0 +1,139 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""Offline stand-ins for quilc, the QAM and QCS discovery, returning canned executables and synthetic readout."""
+import json
+from time import sleep
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import networkx as nx
+import numpy as np
+from pyquil import Program
+from pyquil.api import QuantumComputer
+from pyquil.quantum_processor import NxQuantumProcessor
+from qcs_sdk.qpu.isa import InstructionSetArchitecture
+
+from qiskit_rigetti import ExecutableCache, RigettiQCSBackend
+from qiskit_rigetti._qcs_provider import _configuration
+
+
+class FakeCompiler:
+    """Stand-in for quilc: every program is already native, and is its own executable."""
+
+    def __init__(self, quantum_processor: NxQuantumProcessor) -> None:
+        self.quantum_processor = quantum_processor
+
+    def transpile_qasm_2(self, qasm: str) -> Program:
+        return Program()
+
+    def quil_to_native_quil(self, program: Program, *, protoquil: Optional[bool] = None) -> Program:
+        return program
+
+    def native_quil_to_executable(self, program: Program) -> Program:
+        return program
+
+
+class FakeExecutionResult:
+    def __init__(self, readout: np.ndarray) -> None:
+        self.readout_data = {"ro": readout}
+        self.execution_duration_microseconds = None
+
+
+class FakeQAM:
+    """Stand-in for the QVM or a QPU, returning uniformly random readout of the executable's number of shots."""
+
+    def __init__(self, num_bits: int) -> None:
+        self._num_bits = num_bits
+        self._readouts: Dict[int, np.ndarray] = {}
+
+    def execute(self, executable: Program, memory_map: Any = None, **__: Any) -> Program:
+        return executable
+
+    def execute_with_memory_map_batch(
+        self, executable: Program, memory_maps: Sequence[Any], **__: Any
+    ) -> List[Program]:
+        return [executable] * len(memory_maps)
+
+    def get_result(self, executable: Program) -> FakeExecutionResult:
+        # Readout is generated once per shot count, so that generating it is not measured
+        readout = self._readouts.get(executable.num_shots)
+        if readout is None:
+            rng = np.random.default_rng(seed=executable.num_shots)
+            readout = rng.integers(0, 2, size=(executable.num_shots, self._num_bits), dtype=np.int8)
+            self._readouts[executable.num_shots] = readout
+        return FakeExecutionResult(readout)
+
+
+def make_fake_qc(num_qubits: int) -> QuantumComputer:
+    """A `QuantumComputer` with a line topology, and a fake compiler and QAM."""
+    return QuantumComputer(
+        name=f"{num_qubits}q-fake",
+        qam=FakeQAM(num_qubits),  # type: ignore[arg-type]
+        compiler=FakeCompiler(NxQuantumProcessor(nx.path_graph(num_qubits))),  # type: ignore[arg-type]
+    )
+
+
+def make_fake_backend(
+    num_qubits: int, *, executable_cache: Optional[ExecutableCache] = None, **configuration: Any
+) -> RigettiQCSBackend:
+    """A backend running against :func:`make_fake_qc`, with a fresh executable cache unless one is given."""
+    return RigettiQCSBackend(
+        compiler_timeout=10.0,
+        execution_timeout=10.0,
+        client_configuration=None,  # type: ignore[arg-type]
+        backend_configuration=_configuration(
+            f"{num_qubits}q-fake", num_qubits=num_qubits, local=True, simulator=True, **configuration
+        ),
+        provider=None,
+        qc=make_fake_qc(num_qubits),
+        executable_cache=executable_cache,
+    )
+
+
+def make_isa(name: str, num_qubits: int) -> InstructionSetArchitecture:
+    """An instruction set architecture with a line of qubits, supporting RX, RZ and CZ."""
+    nodes = list(range(num_qubits))
+    edges = [[a, a + 1] for a in nodes[:-1]]
+    instructions = [("RX", [[q] for q in nodes]), ("RZ", [[q] for q in nodes]), ("CZ", edges)]
+    return InstructionSetArchitecture.from_raw(
+        json.dumps(
+            {
+                "architecture": {"nodes": [{"node_id": q} for q in nodes], "edges": [{"node_ids": e} for e in edges]},
+                "benchmarks": [],
+                "instructions": [
+                    {
+                        "name": instruction,
+                        "node_count": len(sites[0]),
+                        "parameters": [],
+                        "arguments": ["_"] * len(sites[0]),
+                        "sites": [{"node_ids": site, "characteristics": []} for site in sites],
+                        "characteristics": [],
+                    }
+                    for instruction, sites in instructions
+                ],
+                "name": name,
+            }
+        )
+    )
+
+
+def with_latency(fn: Callable[..., Any], seconds: float) -> Callable[..., Any]:
+    """Wrap ``fn`` to simulate a network round trip before each call."""
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        sleep(seconds)
+        return fn(*args, **kwargs)
+
+    return call
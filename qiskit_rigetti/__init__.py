@@ -16,9 +16,13 @@
 import sys
 
 from ._quil_circuit import QuilCircuit
-from ._qcs_backend import RigettiQCSBackend, GetQuantumProcessorException
+from ._discovery_cache import DiscoveryCache
+from ._executable_cache import ExecutableCache, ExecutableStore
+from ._qcs_backend import RigettiQCSBackend, RigettiQCSBackendV2, GetQuantumProcessorException
 from ._qcs_job import RigettiQCSJob
+from ._qcs_result import RigettiQCSResult
 from ._qcs_provider import RigettiQCSProvider
+from ._topology import Topology
 
 if sys.version_info < (3, 8):
     from importlib_metadata import version  # pragma: nocover
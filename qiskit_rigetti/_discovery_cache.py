@@ -0,0 +1,125 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, List, Optional, Tuple, Union, cast
+
+from qcs_sdk.qpu.isa import InstructionSetArchitecture
+
+_QUANTUM_COMPUTERS = "quantum_computers"
+_ISA = "isa"
+_COUPLING_MAP = "coupling_map"
+
+
+class DiscoveryCache:
+    """
+    Persistent cache of quantum processor discovery data (available quantum computers, instruction set architectures
+    and coupling maps) in a SQLite database, safe to share between processes on one host.
+
+    Entries older than :attr:`ttl` are ignored, so a fresh cache lets a :class:`RigettiQCSProvider` start without any
+    network calls while still picking up changes to the fleet within ``ttl`` seconds.
+    """
+
+    FILENAME = "discovery.sqlite3"
+    """Name of the database file created when a directory is given."""
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"], ttl: float = 3600.0) -> None:
+        """
+        Args:
+            path: Path to a SQLite database file, or to a directory in which to create :attr:`FILENAME`. The file is
+                created if it does not exist.
+            ttl: Time after which entries are stale and refetched, in seconds.
+        """
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            path = os.path.join(path, self.FILENAME)
+        self._path = path
+        self._ttl = ttl
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS discovery ("
+                "kind TEXT NOT NULL, name TEXT NOT NULL, value TEXT NOT NULL, fetched REAL NOT NULL, "
+                "PRIMARY KEY (kind, name))"
+            )
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get_quantum_computers(self) -> Optional[List[str]]:
+        """
+        Returns:
+            The names of the available quantum processors, or `None` if they are not cached or stale.
+        """
+        value = self._get(_QUANTUM_COMPUTERS, "")
+        return None if value is None else cast(List[str], json.loads(value))
+
+    def put_quantum_computers(self, names: List[str]) -> None:
+        self._put(_QUANTUM_COMPUTERS, "", json.dumps(names))
+
+    def get_isa(self, name: str) -> Optional[InstructionSetArchitecture]:
+        """
+        Returns:
+            The instruction set architecture of quantum processor ``name``, or `None` if it is not cached or stale.
+        """
+        value = self._get(_ISA, name)
+        return None if value is None else InstructionSetArchitecture.from_raw(value)
+
+    def put_isa(self, name: str, isa: InstructionSetArchitecture) -> None:
+        self._put(_ISA, name, isa.json())
+
+    def get_coupling_map(self, name: str) -> Optional[List[Tuple[int, int]]]:
+        """
+        Returns:
+            The coupling map of quantum computer ``name``, or `None` if it is not cached or stale.
+        """
+        value = self._get(_COUPLING_MAP, name)
+        return None if value is None else [(a, b) for a, b in json.loads(value)]
+
+    def put_coupling_map(self, name: str, coupling_map: List[Tuple[int, int]]) -> None:
+        self._put(_COUPLING_MAP, name, json.dumps([list(edge) for edge in coupling_map]))
+
+    def clear(self) -> None:
+        """Delete all cached entries."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM discovery")
+
+    def _get(self, kind: str, name: str) -> Optional[str]:
+        with closing(self._connect()) as conn:
+            row: Any = conn.execute(
+                "SELECT value FROM discovery WHERE kind = ? AND name = ? AND fetched > ?",
+                (kind, name, time.time() - self._ttl),
+            ).fetchone()
+        return None if row is None else cast(str, row[0])
+
+    def _put(self, kind: str, name: str, value: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO discovery (kind, name, value, fetched) VALUES (?, ?, ?, ?)",
+                (kind, name, value, time.time()),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30.0)
@@ -0,0 +1,352 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import types
+from collections import OrderedDict
+from contextlib import closing
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union, cast
+from weakref import WeakKeyDictionary
+
+from pyquil.api import QuantumComputer, QuantumExecutable
+
+_fingerprints: "WeakKeyDictionary[QuantumComputer, str]" = WeakKeyDictionary()
+
+
+class ExecutableStore:
+    """
+    Persistent store of compiled executables in a SQLite database, safe to share between processes on one host.
+
+    Executables are serialized with :mod:`pickle`, so only point this at a location writable by trusted users.
+    """
+
+    FILENAME = "executables.sqlite3"
+    """Name of the database file created when a directory is given."""
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """
+        Args:
+            path: Path to a SQLite database file, or to a directory in which to create :attr:`FILENAME`. The file is
+                created if it does not exist.
+        """
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            path = os.path.join(path, self.FILENAME)
+        self._path = path
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = Lock()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS executables ("
+                "key TEXT PRIMARY KEY, name TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                "executable BLOB NOT NULL, created REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS executables_name ON executables (name)")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def get(self, key: str) -> Optional[QuantumExecutable]:
+        """
+        Look up a compiled executable.
+
+        Returns:
+            The stored executable, or `None` if there is none.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT executable FROM executables WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return cast(QuantumExecutable, pickle.loads(row[0]))
+
+    def put(self, key: str, executable: QuantumExecutable, *, name: str, fingerprint: str) -> None:
+        """
+        Store a compiled executable.
+
+        The first time an executable is stored for ``name`` with a new ``fingerprint``, executables compiled for
+        ``name`` under any other fingerprint are deleted, since the quantum computer's ISA has changed since they were
+        compiled.
+
+        Args:
+            key: Cache key, see :func:`executable_cache_key`.
+            executable: Executable to store.
+            name: Name of the quantum computer the executable was compiled for.
+            fingerprint: Fingerprint of that quantum computer, see :func:`quantum_computer_fingerprint`.
+        """
+        blob = pickle.dumps(executable)
+        with closing(self._connect()) as conn, conn:
+            with self._lock:
+                stale = self._fingerprints.get(name) != fingerprint
+                self._fingerprints[name] = fingerprint
+            if stale:
+                conn.execute("DELETE FROM executables WHERE name = ? AND fingerprint != ?", (name, fingerprint))
+            conn.execute(
+                "INSERT OR REPLACE INTO executables (key, name, fingerprint, executable, created) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, name, fingerprint, blob, time.time()),
+            )
+
+    def clear(self) -> None:
+        """Delete all stored executables."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM executables")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return cast(int, conn.execute("SELECT COUNT(*) FROM executables").fetchone()[0])
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30.0)
+
+
+class ExecutableCache:
+    """
+    Thread-safe, in-memory LRU cache of compiled executables, optionally backed by an :class:`ExecutableStore`.
+
+    Entries are keyed by :func:`executable_cache_key`, so a hit means the same program was already compiled for the
+    same shot count, hooks and quantum computer, and the compiler can be skipped entirely.
+    """
+
+    def __init__(self, max_size: int = 1024, store: Optional[ExecutableStore] = None) -> None:
+        """
+        Args:
+            max_size: Maximum number of executables to hold. Least-recently used entries are evicted first. A value of
+                `0` disables caching.
+            store: Persistent store to consult on in-memory misses and to write newly-compiled executables through to.
+        """
+        self._max_size = max_size
+        self._store = store
+        self._entries: "OrderedDict[str, QuantumExecutable]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def store(self) -> Optional[ExecutableStore]:
+        return self._store
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups that found a compiled executable, in memory or in the backing store."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that required compilation."""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Number of executables dropped to stay within :attr:`max_size`."""
+        return self._evictions
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[QuantumExecutable]:
+        """
+        Look up a compiled executable, marking it as most-recently used.
+
+        Returns:
+            The cached executable, or `None` on a miss.
+        """
+        with self._lock:
+            executable = self._entries.get(key)
+            if executable is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return executable
+
+        executable = self._store.get(key) if self._store is not None else None
+        with self._lock:
+            if executable is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+        self._remember(key, executable)
+        return executable
+
+    def put(self, key: str, executable: QuantumExecutable, *, name: str = "", fingerprint: str = "") -> None:
+        """
+        Store a compiled executable, evicting the least-recently used entries if the cache is full.
+
+        Args:
+            key: Cache key, see :func:`executable_cache_key`.
+            executable: Executable to store.
+            name: Name of the quantum computer the executable was compiled for. Only used by the backing store.
+            fingerprint: Fingerprint of that quantum computer. Only used by the backing store.
+        """
+        self._remember(key, executable)
+        if self._store is not None:
+            self._store.put(key, executable, name=name, fingerprint=fingerprint)
+
+    def _remember(self, key: str, executable: QuantumExecutable) -> None:
+        if self._max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = executable
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters. The backing store, if any, is left untouched."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+def executable_cache_key(
+    *,
+    source: str,
+    shots: int,
+    hooks: Sequence[Callable[..., Any]],
+    fingerprint: str,
+    **settings: Any,
+) -> Optional[str]:
+    """
+    Build a content-addressed cache key for a compiled executable, or `None` if the executable cannot be cached
+    because one of its ``hooks`` has no ``cache_key`` attribute, or cannot be identified reliably (e.g. an instance of
+    a class with ``__slots__``).
+
+    Args:
+        source: Program text handed to the compiler, after any pre-compilation hooks have been applied.
+        shots: Number of shots the executable is wrapped in.
+        hooks: Hooks applied to the compiled program (e.g. ``before_execute``). Pre-compilation hooks are already
+            reflected in ``source``. Each hook must opt in to caching with a ``cache_key`` attribute: any value
+            (other than `None`) that, along with the hook's code and state, determines its output.
+        fingerprint: Fingerprint of the target quantum computer, see :func:`quantum_computer_fingerprint`.
+        settings: Any other JSON-serializable settings that affect compilation (e.g. ``ensure_native_quil``).
+    """
+    hook_fingerprints = [_hook_fingerprint(fn) for fn in hooks]
+    if any(f is None for f in hook_fingerprints):
+        return None
+
+    payload = json.dumps(
+        {
+            "source": source,
+            "shots": shots,
+            "hooks": hook_fingerprints,
+            "fingerprint": fingerprint,
+            "settings": settings,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def quantum_computer_fingerprint(qc: QuantumComputer) -> str:
+    """
+    Fingerprint a quantum computer by name and compiler ISA, so executables compiled against a since-changed ISA are
+    never reused. Computed once per :class:`QuantumComputer` instance.
+    """
+    fingerprint = _fingerprints.get(qc)
+    if fingerprint is None:
+        compiler_isa = qc.quantum_processor.to_compiler_isa()
+        isa = json.dumps(compiler_isa.dict(), sort_keys=True, default=str)  # type: ignore[no-untyped-call]
+        fingerprint = hashlib.sha256(f"{qc.name}\n{isa}".encode()).hexdigest()
+        _fingerprints[qc] = fingerprint
+    return fingerprint
+
+
+def _hook_fingerprint(fn: Callable[..., Any]) -> Optional[str]:
+    # A hook may read module globals, configuration or random state, none of which can be inspected reliably, so only
+    # hooks that declare with a `cache_key` attribute that their output depends on nothing else are fingerprinted.
+    # They are then identified by qualified name, bytecode and every value they depend on, together with that key,
+    # rather than by `id()`, which is reused once a hook is collected.
+    cache_key = getattr(fn, "cache_key", None)
+    if cache_key is None:
+        return None
+    return _value_fingerprint((fn, cache_key), depth=0)
+
+
+_MAX_FINGERPRINT_DEPTH = 8
+
+_SCALARS = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _value_fingerprint(value: Any, *, depth: int) -> Optional[str]:
+    if depth > _MAX_FINGERPRINT_DEPTH:
+        return None
+
+    def parts(*values: Any) -> Optional[str]:
+        fingerprints = [_value_fingerprint(v, depth=depth + 1) for v in values]
+        if any(f is None for f in fingerprints):
+            return None
+        return ",".join(cast(List[str], fingerprints))
+
+    if isinstance(value, _SCALARS):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        items = parts(*value)
+        return None if items is None else f"{type(value).__name__}({items})"
+    if isinstance(value, dict):
+        items = parts(*(item for key_value in sorted(value.items(), key=lambda kv: repr(kv[0])) for item in key_value))
+        return None if items is None else f"dict({items})"
+    if isinstance(value, (set, frozenset)):
+        fingerprints = [_value_fingerprint(v, depth=depth + 1) for v in value]
+        if any(f is None for f in fingerprints):
+            return None
+        return f"set({','.join(sorted(cast(List[str], fingerprints)))})"
+    if isinstance(value, functools.partial):
+        items = parts(value.func, value.args, value.keywords)
+        return None if items is None else f"partial({items})"
+    if isinstance(value, types.MethodType):
+        items = parts(value.__func__, value.__self__)
+        return None if items is None else f"method({items})"
+    if isinstance(value, types.FunctionType):
+        code = _code_fingerprint(value.__code__)
+        closure = [cell.cell_contents for cell in value.__closure__ or ()]
+        items = parts(value.__defaults__, value.__kwdefaults__, closure)
+        if items is None:
+            return None
+        return f"function({value.__module__}:{value.__qualname__}:{code}:{items})"
+    if isinstance(value, (type, types.BuiltinFunctionType, types.ModuleType)):
+        name = getattr(value, "__qualname__", None) or value.__name__
+        return f"{type(value).__name__}({getattr(value, '__module__', None) or ''}:{name})"
+
+    # Instances, including callable ones, are identified by their class and state. Those without a `__dict__` (e.g.
+    # defined in C, or with `__slots__`) have no state that can be inspected reliably.
+    state = getattr(value, "__dict__", None)
+    if not isinstance(state, dict) or hasattr(value, "__slots__"):
+        return None
+    items = parts(type(value), state)
+    return None if items is None else f"object({items})"
+
+
+def _code_fingerprint(code: types.CodeType) -> str:
+    # Nested functions appear among constants as code objects, whose `repr()` includes their memory address
+    consts = [_code_fingerprint(c) if isinstance(c, types.CodeType) else repr(c) for c in code.co_consts]
+    return hashlib.sha256(code.co_code + repr((consts, code.co_names)).encode()).hexdigest()
@@ -0,0 +1,37 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional
+
+MAX_WORKERS = 32
+"""Number of threads shared by all jobs to compile circuits, submit executions and wait for their results."""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = Lock()
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """
+    The executor that every job runs its compilation, submission and result retrieval on, created on first use. Jobs
+    schedule each step as a separate task that never waits on another, so any number of jobs can be in flight on a
+    bounded number of threads.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="RigettiQCSJob")
+        return _executor
@@ -0,0 +1,81 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from ._topology import Topology
+
+
+class Placement(NamedTuple):
+    """Qubits on which to place a circuit: its qubit ``i`` is placed on ``qubits[i]``."""
+
+    circuit_idx: int
+    qubits: Tuple[int, ...]
+
+
+def pack_circuits(
+    num_qubits: Sequence[int], topology: Topology, *, crosstalk_distance: int = 2
+) -> List[List[Placement]]:
+    """
+    Pack circuits into groups that can run side by side in one program, each on its own connected region of the
+    topology (see :meth:`Topology.regions`). Circuits are placed in order, each in the first group with a free region
+    at least ``crosstalk_distance`` away from the other circuits in the group (so `1` only requires regions to be
+    disjoint, and `2` leaves at least one idle qubit between them), or in a new group otherwise.
+
+    Args:
+        num_qubits: Number of qubits of each circuit.
+        topology: Topology of the quantum computer.
+        crosstalk_distance: Minimum distance in the coupling map between qubits of different circuits in a group.
+
+    Returns:
+        Groups of placements, in order of their first circuit. Circuits that fit on no region have a group of their
+        own, with their qubits placed on the qubits with the same indices.
+    """
+    crosstalk_distance = max(crosstalk_distance, 1)
+    distance_matrix = topology.distance_matrix
+    groups: List[List[Placement]] = []
+    # For each group, the qubits too close to one of its circuits to be used by another
+    blocked: List[np.ndarray] = []
+
+    for circuit_idx, size in enumerate(num_qubits):
+        regions = topology.regions(size)
+        placed = False
+        for group, group_blocked in zip(groups, blocked):
+            region = next((r for r in regions if not group_blocked[list(r)].any()), None)
+            if region is not None:
+                group.append(Placement(circuit_idx, region))
+                group_blocked |= _near(distance_matrix, region, crosstalk_distance)
+                placed = True
+                break
+        if placed:
+            continue
+
+        if regions:
+            groups.append([Placement(circuit_idx, regions[0])])
+            blocked.append(_near(distance_matrix, regions[0], crosstalk_distance))
+        else:
+            # Circuits that fit on no region do not share their group
+            groups.append([Placement(circuit_idx, tuple(range(size)))])
+            blocked.append(np.ones(len(distance_matrix), dtype=bool))
+
+    return groups
+
+
+def _near(distance_matrix: np.ndarray, region: Tuple[int, ...], distance: int) -> np.ndarray:
+    """Mask of the qubits less than ``distance`` away from any qubit in ``region``."""
+    near: np.ndarray = np.any(distance_matrix[list(region)] < distance, axis=0)
+    return near
@@ -0,0 +1,112 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import math
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Sequence, Set, Union
+from weakref import WeakKeyDictionary
+
+from pyquil import Program
+from pyquil.api import QuantumComputer
+from pyquil.quilbase import Declare, Fence, Gate, Halt, Measurement, Pragma, Reset, ResetQubit
+
+_ParameterSpec = List[Union[float, str]]
+
+
+class _NativeGates(NamedTuple):
+    """Gates an ISA implements natively, by operator name, for each qubit and (undirected) edge."""
+
+    qubits: Dict[int, Dict[str, List[_ParameterSpec]]]
+    edges: Dict[FrozenSet[int], Dict[str, List[_ParameterSpec]]]
+    measurable: Set[int]
+
+
+_native_gates: "WeakKeyDictionary[QuantumComputer, _NativeGates]" = WeakKeyDictionary()
+
+_ATOL = 1e-9
+
+# Instructions that native Quil may contain besides gates and measurements, and that need no checking
+_PASSTHROUGH = (Declare, Pragma, Fence, Reset, ResetQubit, Halt)
+
+
+def is_native_program(program: Program, qc: QuantumComputer) -> bool:
+    """
+    Determine whether a program can be executed on a quantum computer without compilation by quilc, i.e. it only uses
+    gates (with parameters) that the quantum computer's ISA implements natively, on live qubits and edges.
+    """
+    if program.defined_gates:
+        return False
+
+    native = _get_native_gates(qc)
+    for instruction in program.instructions:
+        if isinstance(instruction, Gate):
+            if instruction.modifiers:
+                return False
+            qubits = instruction.get_qubit_indices()
+            if len(qubits) == 1:
+                gates = native.qubits.get(qubits[0], {})
+            elif len(qubits) == 2:
+                gates = native.edges.get(frozenset(qubits), {})
+            else:
+                return False
+            specs = gates.get(instruction.name, [])
+            if not any(_matches(spec, instruction.params) for spec in specs):
+                return False
+        elif isinstance(instruction, Measurement):
+            if not instruction.get_qubit_indices() <= native.measurable:
+                return False
+        elif not isinstance(instruction, _PASSTHROUGH):
+            return False
+
+    return True
+
+
+def _get_native_gates(qc: QuantumComputer) -> _NativeGates:
+    native = _native_gates.get(qc)
+    if native is None:
+        isa = qc.quantum_processor.to_compiler_isa()
+        native = _NativeGates(qubits={}, edges={}, measurable=set())
+        for qubit in isa.qubits.values():
+            if qubit.dead:
+                continue
+            for gate in qubit.gates:
+                if gate.operator_type == "measure":
+                    native.measurable.add(qubit.id)
+                elif gate.operator is not None:
+                    native.qubits.setdefault(qubit.id, {}).setdefault(gate.operator, []).append(gate.parameters)
+        for edge in isa.edges.values():
+            if edge.dead:
+                continue
+            for gate in edge.gates:
+                if gate.operator is not None:
+                    native.edges.setdefault(frozenset(edge.ids), {}).setdefault(gate.operator, []).append(
+                        gate.parameters
+                    )
+        _native_gates[qc] = native
+    return native
+
+
+def _matches(spec: _ParameterSpec, params: Sequence[Any]) -> bool:
+    # ISAs list either fixed angles (e.g. RX(pi/2)) or a named parameter, which accepts any value (e.g. RZ(theta))
+    if len(spec) != len(params):
+        return False
+    for expected, actual in zip(spec, params):
+        if isinstance(expected, str):
+            continue
+        # pyquil stores numeric gate parameters as complex numbers
+        if not isinstance(actual, (int, float, complex)) or abs(complex(actual).imag) > _ATOL:
+            return False
+        if not math.isclose(complex(actual).real, expected, abs_tol=_ATOL):
+            return False
+    return True
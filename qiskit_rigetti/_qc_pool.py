@@ -0,0 +1,123 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from pyquil import get_qc
+from pyquil.api import QCSClient, QPU, QPUCompiler, QuantumComputer
+from pyquil.quantum_processor import QCSQuantumProcessor
+from qcs_sdk.qpu.isa import InstructionSetArchitecture
+
+_Key = Tuple[str, float, float]
+
+
+class QuantumComputerPool:
+    """
+    Thread-safe pool of :class:`QuantumComputer` instances, so that backends targeting the same quantum computer share
+    one instance, along with its compiler and QAM clients and their connections.
+
+    Instances are keyed by name (which includes ``-noisy`` for noisy QVMs) and timeouts. Each one is created at most
+    once, even when requested from several threads at the same time.
+    """
+
+    def __init__(self, client_configuration: QCSClient) -> None:
+        """
+        Args:
+            client_configuration: QCS client configuration used to create every quantum computer in the pool.
+        """
+        self._client_configuration = client_configuration
+        self._qcs: Dict[_Key, QuantumComputer] = {}
+        self._locks: Dict[_Key, Lock] = {}
+        self._lock = Lock()
+
+    def get(
+        self,
+        name: str,
+        *,
+        compiler_timeout: float,
+        execution_timeout: float,
+        isa: Optional[InstructionSetArchitecture] = None,
+    ) -> QuantumComputer:
+        """
+        Get the pooled quantum computer for the given name and timeouts, creating it if necessary.
+
+        Args:
+            isa: Instruction set architecture of QPU ``name``, from which to create the quantum computer without
+                fetching it again. If not provided, the quantum computer is created with ``get_qc``.
+
+        Raises:
+            Exception: Any error raised by ``get_qc``. Nothing is pooled in that case, so a later call retries.
+        """
+        key = (name, compiler_timeout, execution_timeout)
+        with self._lock:
+            qc = self._qcs.get(key)
+            if qc is not None:
+                return qc
+            key_lock = self._locks.setdefault(key, Lock())
+
+        with key_lock:
+            qc = self._qcs.get(key)
+            if qc is None:
+                if isa is not None:
+                    qc = get_qpu_from_isa(
+                        name,
+                        isa,
+                        compiler_timeout=compiler_timeout,
+                        execution_timeout=execution_timeout,
+                        client_configuration=self._client_configuration,
+                    )
+                else:
+                    qc = get_qc(
+                        name,
+                        compiler_timeout=compiler_timeout,
+                        execution_timeout=execution_timeout,
+                        client_configuration=self._client_configuration,
+                    )
+                with self._lock:
+                    self._qcs[key] = qc
+            return qc
+
+    def clear(self) -> None:
+        """Drop all pooled quantum computers. Backends already holding one keep using it."""
+        with self._lock:
+            self._qcs.clear()
+
+    def __len__(self) -> int:
+        return len(self._qcs)
+
+
+def get_qpu_from_isa(
+    name: str,
+    isa: InstructionSetArchitecture,
+    *,
+    compiler_timeout: float,
+    execution_timeout: float,
+    client_configuration: QCSClient,
+) -> QuantumComputer:
+    """
+    Create the quantum computer for QPU ``name`` the way ``get_qc`` does, but from an instruction set architecture that
+    has already been fetched (or loaded from a :class:`DiscoveryCache`) rather than fetching it again.
+    """
+    return QuantumComputer(
+        name=name,
+        qam=QPU(quantum_processor_id=name, timeout=execution_timeout, client_configuration=client_configuration),
+        compiler=QPUCompiler(
+            quantum_processor_id=name,
+            quantum_processor=QCSQuantumProcessor(name, isa),
+            timeout=compiler_timeout,
+            client_configuration=client_configuration,
+        ),
+    )
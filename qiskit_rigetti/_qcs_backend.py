@@ -13,27 +13,51 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
-from typing import Iterable, Optional, Any, Union, List, cast, Tuple
+import asyncio
+from typing import Optional, Any, Union, List, cast, Tuple
 from uuid import uuid4
 
 from pyquil import get_qc
 from pyquil.api import QuantumComputer, QCSClient
-from qiskit import QuantumCircuit, ClassicalRegister
-from qiskit.circuit import Measure, CircuitInstruction, Clbit
-from qiskit.providers import BackendV1, Options, Provider
+from pyquil.external.rpcq import CompilerISA
+from pyquil.quantum_processor.transformers import qcs_isa_to_compiler_isa
+from qcs_sdk.qpu.isa import InstructionSetArchitecture
+from qiskit import QuantumCircuit
+from qiskit.circuit import Instruction
+from qiskit.providers import BackendV1, BackendV2, Options, Provider
 from qiskit.providers.models import QasmBackendConfiguration
-from qiskit.transpiler import CouplingMap
+from qiskit.transpiler import CouplingMap, Target
+from ._discovery_cache import DiscoveryCache
+from ._executable_cache import ExecutableCache
+from ._executor import shared_executor
+from ._qc_pool import QuantumComputerPool, get_qpu_from_isa
+from ._quil_translation import readout_register
+from ._target import get_target
+from ._timings import TimingObserver
+from ._topology import Topology
 from ._qcs_job import RigettiQCSJob
 
 
 def _prepare_readouts(circuit: QuantumCircuit) -> None:
     """
-    Errors if measuring into more than one readout. If only measuring one, ensures its name is 'ro'. Mutates the input
-    circuit.
+    Errors if measuring into more than one readout. The readout is emitted as Quil's ``ro`` register when the circuit is
+    compiled (see :func:`readout_register`), so the circuit itself is not modified.
     """
+    if len(circuit.cregs) == 1:
+        # Measurements are usually last, so only the end of the circuit is scanned in practice
+        if not any(instruction.operation.name == "measure" for instruction in reversed(circuit.data)):
+            raise RuntimeError("Circuit has no measurements")
+        return
 
-    measures: List[CircuitInstruction] = [d for d in circuit.data if isinstance(d[0], Measure)]
-    readout_names: List[str] = list({clbit.register.name for m in measures for clbit in m.clbits})
+    readout_names: List[str] = list(
+        {
+            reg.name
+            for instruction in circuit.data
+            if instruction.operation.name == "measure"
+            for clbit in instruction.clbits
+            for reg, _ in circuit.find_bit(clbit).registers
+        }
+    )
 
     num_readouts = len(readout_names)
 
@@ -46,41 +70,25 @@ def _prepare_readouts(circuit: QuantumCircuit) -> None:
             f"Multiple readout registers are unsupported on QCSBackend; found {', '.join(readout_names)}"
         )
 
-    orig_readout_name = readout_names[0]
-    if orig_readout_name == "ro":
-        return
-
-    for i, reg in enumerate(circuit.cregs):
-        if reg.name != orig_readout_name:
-            continue
-
-        # rename register to "ro"
-        ro_reg = ClassicalRegister(size=reg.size, name="ro")
-        circuit.cregs[i] = ro_reg
-
-        def map_ro_reg(clbits: Iterable[Clbit]) -> List[Clbit]:
-            return [Clbit(ro_reg, clbit.index) for clbit in clbits if clbit.register.name == orig_readout_name]
-
-        circuit._clbits = map_ro_reg(circuit.clbits)
-        circuit._clbit_indices = {
-            Clbit(ro_reg, clbit.index): loc._replace(registers=[ro_reg])
-            for clbit, loc in circuit._clbit_indices.items()
-            if clbit.register.name == orig_readout_name
-        }
-
-        for instruction in circuit._data:
-            instruction.clbits = map_ro_reg(instruction.clbits)
-
-        break
+    readout = readout_register(circuit)
+    if readout is None or readout.name != readout_names[0]:
+        raise RuntimeError(f"Readout register {readout_names[0]} conflicts with another register named ro")
 
 
 def _prepare_circuit(circuit: QuantumCircuit) -> QuantumCircuit:
     """
-    Returns a prepared copy of the circuit for execution on the QCS Backend.
+    Returns a snapshot of the circuit, validated for execution on the QCS Backend, so that modifying the circuit
+    afterwards does not affect its job. Only the instruction list, and operations with unbound parameters (which
+    binding parameters in place modifies), are copied.
     """
-    circuit = circuit.copy()
     _prepare_readouts(circuit)
-    return circuit
+    snapshot = circuit.copy_empty_like()
+    for instruction in circuit.data:
+        operation = instruction.operation
+        if isinstance(operation, Instruction) and operation.is_parameterized():
+            instruction = instruction.replace(operation=operation.copy())
+        snapshot._append(instruction)
+    return snapshot
 
 
 class GetQuantumProcessorException(Exception):
@@ -102,6 +110,11 @@ class RigettiQCSBackend(BackendV1):
         provider: Optional[Provider],
         auto_set_coupling_map: bool = True,
         qc: Optional[QuantumComputer] = None,
+        executable_cache: Optional[ExecutableCache] = None,
+        discovery_cache: Optional[DiscoveryCache] = None,
+        qc_pool: Optional[QuantumComputerPool] = None,
+        isa: Optional[InstructionSetArchitecture] = None,
+        timing_observer: Optional[TimingObserver] = None,
         **fields: Any,
     ) -> None:
         """
@@ -115,6 +128,18 @@ class RigettiQCSBackend(BackendV1):
             auto_set_coupling_map: When `True`, this will set the `QasmBackendConfiguration`
                 `coupling_map` based on the `QuantumComputer` topology if the existing
                 `coupling_map` is empty.
+            executable_cache: Cache of compiled executables shared by every job run on this backend. If not
+                provided, a default-sized in-memory cache is created.
+            discovery_cache: Cache from which to load, and in which to save, the coupling map set from the
+                `QuantumComputer` topology, avoiding loading the `QuantumComputer` just for its topology.
+            qc_pool: Pool from which to get the `QuantumComputer` when ``qc`` is not provided, so that it is shared
+                with other backends targeting the same quantum computer.
+            isa: Instruction set architecture of the quantum processor, from which :attr:`target` is built without
+                loading the `QuantumComputer`, and from which the `QuantumComputer` is created without fetching it
+                again. If not provided, the `QuantumComputer` is created from the ISA in ``discovery_cache`` (if
+                fresh) or with ``get_qc``, and :attr:`target` is built from the `QuantumComputer`.
+            timing_observer: Called with the stage timings of each experiment run on this backend. See
+                :attr:`timing_observer`.
             fields: Keyword arguments for the values to use to override the default options.
         """
         super().__init__(backend_configuration, provider, **fields)
@@ -123,31 +148,119 @@ class RigettiQCSBackend(BackendV1):
         self._client_configuration = client_configuration
         self._qc = qc
         self._auto_set_coupling_map = auto_set_coupling_map
+        self._executable_cache = executable_cache if executable_cache is not None else ExecutableCache()
+        self._discovery_cache = discovery_cache
+        self._qc_pool = qc_pool
+        self._topology: Optional[Topology] = None
+        self._isa = isa
+        self._compiler_isa: Optional[CompilerISA] = None
+        self._timing_observer = timing_observer
 
     @classmethod
     def _default_options(cls) -> Options:
-        return Options(shots=None)
+        return Options(shots=None, memory=False)
 
     @property
     def qc(self) -> QuantumComputer:
         self._load_qc_if_necessary()
         return cast(QuantumComputer, self._qc)
 
+    @property
+    def executable_cache(self) -> ExecutableCache:
+        """
+        Cache of compiled executables, whose ``hits``, ``misses`` and ``evictions`` counters describe how often
+        compilation was skipped.
+        """
+        return self._executable_cache
+
+    @property
+    def timing_observer(self) -> Optional[TimingObserver]:
+        """
+        Optional callback, called with the job ID, the experiment's index and the time spent in each stage (translation,
+        hooks, compilation, submission, queueing, decoding...) as soon as each experiment's result is available, for
+        jobs run after it is set. The same timings are recorded in each experiment result's ``metadata["timings"]``.
+        """
+        return self._timing_observer
+
+    @timing_observer.setter
+    def timing_observer(self, timing_observer: Optional[TimingObserver]) -> None:
+        self._timing_observer = timing_observer
+
     @property
     def coupling_map(self) -> CouplingMap:
+        """
+        Coupling map of this backend. The same instance, with its distance matrix already computed, is returned until
+        the configuration's coupling map changes, so it must not be modified.
+
+        ``transpile(circuits, backend)`` builds a new coupling map from the configuration instead, so pass
+        ``coupling_map=backend.coupling_map`` explicitly, or transpile for :func:`as_backend_v2`, to reuse this one.
+        """
+        return self.topology.coupling_map
+
+    @property
+    def topology(self) -> Topology:
+        """
+        Precomputed index of this backend's qubit connectivity (coupling map, distances, neighbors and connected
+        regions), rebuilt only when the configuration's coupling map changes.
+        """
         self._set_coupling_map_based_on_qc_topology_if_necessary()
-        return CouplingMap(self.configuration().coupling_map)
+        edges = self.configuration().coupling_map or []
+        topology = self._topology
+        if topology is None or topology.edges != [(a, b) for a, b in edges]:
+            topology = self._topology = Topology(edges)
+        return topology
+
+    @property
+    def target(self) -> Target:
+        """
+        Transpiler target with the gates this backend implements natively on each qubit and edge, and their durations
+        and errors, built from its instruction set architecture. Targets are shared between backends with identical
+        instruction set architectures, and rebuilt only when the architecture changes.
+        """
+        if self._compiler_isa is None:
+            if self._isa is not None:
+                self._compiler_isa = qcs_isa_to_compiler_isa(self._isa)
+            else:
+                self._compiler_isa = self.qc.quantum_processor.to_compiler_isa()
+        return get_target(self._compiler_isa, self.configuration().num_qubits)
+
+    def as_backend_v2(self) -> "RigettiQCSBackendV2":
+        """
+        Returns:
+            RigettiQCSBackendV2: A :class:`BackendV2` view of this backend, whose :attr:`target` lets Qiskit's
+                transpiler produce device-native, noise-aware circuits.
+        """
+        return RigettiQCSBackendV2(self)
 
     def _load_qc_if_necessary(self) -> None:
         configuration: QasmBackendConfiguration = self.configuration()
         if self._qc is None:
+            isa = self._isa
+            if isa is None and self._discovery_cache is not None:
+                isa = self._discovery_cache.get_isa(configuration.backend_name)
             try:
-                self._qc = get_qc(
-                    configuration.backend_name,
-                    compiler_timeout=self._compiler_timeout,
-                    execution_timeout=self._execution_timeout,
-                    client_configuration=self._client_configuration,
-                )
+                if self._qc_pool is not None:
+                    self._qc = self._qc_pool.get(
+                        configuration.backend_name,
+                        compiler_timeout=self._compiler_timeout,
+                        execution_timeout=self._execution_timeout,
+                        isa=isa,
+                    )
+                elif isa is not None:
+                    self._qc = get_qpu_from_isa(
+                        configuration.backend_name,
+                        isa,
+                        compiler_timeout=self._compiler_timeout,
+                        execution_timeout=self._execution_timeout,
+                        client_configuration=self._client_configuration,
+                    )
+                else:
+                    self._qc = get_qc(
+                        configuration.backend_name,
+                        compiler_timeout=self._compiler_timeout,
+                        execution_timeout=self._execution_timeout,
+                        client_configuration=self._client_configuration,
+                    )
             except Exception as e:
                 raise GetQuantumProcessorException(
                     f"failed to retrieve quantum processor {configuration.backend_name}"
@@ -156,7 +269,13 @@ class RigettiQCSBackend(BackendV1):
     def _set_coupling_map_based_on_qc_topology_if_necessary(self) -> None:
         configuration: QasmBackendConfiguration = self.configuration()
         if not configuration.coupling_map and self._auto_set_coupling_map:
-            configuration.coupling_map = get_coupling_map_from_qc_topology(self.qc)
+            cache = self._discovery_cache
+            coupling_map = cache.get_coupling_map(configuration.backend_name) if cache is not None else None
+            if coupling_map is None:
+                coupling_map = get_coupling_map_from_qc_topology(self.qc)
+                if cache is not None:
+                    cache.put_coupling_map(configuration.backend_name, coupling_map)
+            configuration.coupling_map = coupling_map
 
     def run(
         self,
@@ -171,15 +290,12 @@ class RigettiQCSBackend(BackendV1):
             **options: Execution options to forward to :class:`RigettiQCSJob`.
 
         Returns:
-            RigettiQCSJob: The job that has been started. Wait for it by calling :func:`RigettiQCSJob.result`
+            RigettiQCSJob: The job that has been started. Compilation and execution continue in the background; poll
+                :func:`RigettiQCSJob.status` or wait for it by calling :func:`RigettiQCSJob.result`
         """
         if not isinstance(run_input, list):
             run_input = [run_input]
 
-        bindings = options.get("parameter_binds") or []
-        if len(bindings) > 0:
-            run_input = [circuit.bind_parameters(binding) for circuit in run_input for binding in bindings]
-
         run_input = [_prepare_circuit(circuit) for circuit in run_input]
 
         self._set_coupling_map_based_on_qc_topology_if_necessary()
@@ -191,8 +307,92 @@ class RigettiQCSBackend(BackendV1):
             qc=self.qc,
             backend=self,
             configuration=self.configuration(),
+            executable_cache=self._executable_cache,
+            timing_observer=self._timing_observer,
+            topology=self.topology if options.get("multiplexing") else None,
         )
 
+    async def run_async(
+        self,
+        run_input: Union[QuantumCircuit, List[QuantumCircuit]],
+        **options: Any,
+    ) -> RigettiQCSJob:
+        """
+        Like :func:`run`, but loads the quantum computer (the first time) without blocking the running event loop. Jobs
+        run on an executor shared by all jobs, so no thread is started per job. Await the returned job's results with
+        :func:`RigettiQCSJob.result_async` or :func:`RigettiQCSJob.iter_results_async`.
+
+        Args:
+            run_input: Either a single :class:`QuantumCircuit` to run or a list of them to run in parallel.
+            **options: Execution options to forward to :class:`RigettiQCSJob`.
+
+        Returns:
+            RigettiQCSJob: The job that has been started.
+        """
+        if self._qc is None or (not self.configuration().coupling_map and self._auto_set_coupling_map):
+            # Loading the quantum computer is the only step of starting a job that blocks
+            await asyncio.wrap_future(
+                shared_executor().submit(self._set_coupling_map_based_on_qc_topology_if_necessary)
+            )
+            await asyncio.wrap_future(shared_executor().submit(self._load_qc_if_necessary))
+        return self.run(run_input, **options)
+
 
 def get_coupling_map_from_qc_topology(qc: QuantumComputer) -> List[Tuple[int, int]]:
     return cast(List[Tuple[int, int]], qc.quantum_processor.qubit_topology().to_directed().edges())
+
+
+class RigettiQCSBackendV2(BackendV2):
+    """
+    :class:`BackendV2` view of a :class:`RigettiQCSBackend`, exposing its native gate set as a :class:`Target`. Jobs
+    are run by, and share the caches of, the underlying backend.
+    """
+
+    def __init__(self, backend: RigettiQCSBackend) -> None:
+        """
+        Args:
+            backend: Backend to view.
+        """
+        configuration: QasmBackendConfiguration = backend.configuration()
+        super().__init__(
+            provider=backend.provider(),
+            name=configuration.backend_name,
+            backend_version=configuration.backend_version,
+        )
+        self._backend = backend
+
+    @property
+    def backend_v1(self) -> RigettiQCSBackend:
+        """The viewed :class:`RigettiQCSBackend`."""
+        return self._backend
+
+    @property
+    def target(self) -> Target:
+        return self._backend.target
+
+    @property
+    def coupling_map(self) -> CouplingMap:
+        """
+        The underlying backend's cached :attr:`RigettiQCSBackend.coupling_map`, whose distance matrix is already
+        computed, rather than a new one built from :attr:`target` on every access.
+        """
+        return self._backend.coupling_map
+
+    @property
+    def max_circuits(self) -> Optional[int]:
+        """`None`, as jobs accept any number of circuits."""
+        return None
+
+    @classmethod
+    def _default_options(cls) -> Options:
+        return RigettiQCSBackend._default_options()
+
+    def run(self, run_input: Union[QuantumCircuit, List[QuantumCircuit]], **options: Any) -> RigettiQCSJob:
+        """
+        Run the quantum circuit(s) using the underlying :class:`RigettiQCSBackend`.
+
+        Args:
+            run_input: Either a single :class:`QuantumCircuit` to run or a list of them to run in parallel.
+            **options: Execution options to forward to :class:`RigettiQCSJob`.
+        """
+        return self._backend.run(run_input, **options)
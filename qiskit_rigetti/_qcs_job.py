@@ -13,28 +13,118 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
+import asyncio
+import re
 import warnings
-from collections import Counter
+from functools import partial
+from collections import Counter, deque
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union, Iterator, cast
+from threading import Event, Lock, local
+from time import monotonic
+from concurrent import futures
+from concurrent.futures import Executor, Future, TimeoutError as FutureTimeoutError
+from typing import (
+    Optional,
+    Dict,
+    Any,
+    List,
+    Union,
+    Iterable,
+    Iterator,
+    Mapping,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Deque,
+    FrozenSet,
+    Hashable,
+    NamedTuple,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 import numpy as np
 from dateutil.tz import tzutc
-from pyquil.api import QuantumComputer
+from pyquil import Program
+from pyquil.api import QuantumComputer, QuantumExecutable, MemoryMap
 from pyquil.api._qpu import QPUExecuteResponse
 from pyquil.api._qvm import QVMExecuteResponse
-from qiskit import QuantumCircuit
-from qiskit.providers import JobStatus, JobV1, Backend
+from qiskit import ClassicalRegister, QuantumCircuit
+from qiskit.circuit import Instruction, Parameter
+from qiskit.circuit.library import UnitaryGate, get_standard_gate_name_mapping
+from qiskit.providers import JobError, JobStatus, JobV1, Backend, JobTimeoutError
+from qiskit.providers.jobstatus import JOB_FINAL_STATES
 from qiskit.providers.models import QasmBackendConfiguration
 from qiskit.qobj import QobjExperimentHeader
-from qiskit.result import Result
 from qiskit.result.models import ExperimentResult, ExperimentResultData
 
-from .hooks.pre_compilation import PreCompilationHook
+from ._executable_cache import ExecutableCache, executable_cache_key, quantum_computer_fingerprint
+from ._executor import shared_executor
+from ._native_quil import is_native_program
+from ._qcs_result import RigettiQCSResult
+from ._multiplexing import Placement, pack_circuits
+from ._quil_translation import (
+    PARAMETER_REGION,
+    circuit_to_program,
+    circuits_to_program,
+    readout_register,
+    readout_size,
+)
+from ._timings import StageTimings, TimingObserver
+from ._topology import Topology
+from .hooks.pre_compilation import PreCompilationHook, QuilPreCompilationHook, set_quil_rewiring
 from .hooks.pre_execution import PreExecutionHook
 
 Response = Union[QVMExecuteResponse, QPUExecuteResponse]
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Operations of these types are fully identified by their name and parameters
+_STANDARD_OPERATIONS = {name: type(operation) for name, operation in get_standard_gate_name_mapping().items()}
+
+
+class _Compiled(NamedTuple):
+    """
+    Compiled executables, one per chunk of shots, and the memory maps to execute each of them with (or `None` to
+    execute them once, as-is). When sweeping an array of parameter values, ``points`` are the indices of the sweep
+    points that each memory map (or the executables themselves) run.
+    """
+
+    executables: List[QuantumExecutable]
+    memory_maps: Optional[Sequence[MemoryMap]] = None
+    timings: Optional[StageTimings] = None
+    points: Optional[Sequence[int]] = None
+
+
+class _Sweep(NamedTuple):
+    """
+    Values to bind a circuit's parameters to, one row per point of a parameter sweep. ``array`` is whether the sweep
+    was given as an array, in which case each circuit has one result with the readout of every point, rather than
+    one result per point.
+    """
+
+    parameters: List[Parameter]
+    values: np.ndarray
+    array: bool
+
+
+class _Execution(NamedTuple):
+    """
+    One execution of one or more experiments, running one chunk of their shots at one of their sweep points. Each
+    experiment is listed with the columns of the readout that belong to it, or `None` if the whole readout does.
+    """
+
+    experiments: Tuple[Tuple[int, Optional[slice]], ...]
+    chunk_idx: int
+    executable: QuantumExecutable
+    memory_map: Optional[MemoryMap]
+    point_idx: int = 0
+
 
 class RigettiQCSJob(JobV1):
     """
@@ -50,15 +140,47 @@ class RigettiQCSJob(JobV1):
         qc: QuantumComputer,
         backend: Backend,
         configuration: QasmBackendConfiguration,
+        executable_cache: Optional[ExecutableCache] = None,
+        timing_observer: Optional[TimingObserver] = None,
+        topology: Optional[Topology] = None,
+        executor: Optional[Executor] = None,
     ) -> None:
         """
         Args:
             job_id: Unique identifier for this job
             circuits: List of circuits to execute
-            options: Execution options (e.g. "shots")
+            options: Execution options (e.g. "shots"). Per-shot bitstrings are only included in results when
+                ``memory`` is `True`. ``max_compile_workers`` sets the number of threads used to compile circuits
+                concurrently (default: 1); hooks must be thread-safe when it is greater than 1.
+                ``max_result_workers`` sets the number of results waited for concurrently (default: 8).
+                ``max_outstanding_executions`` sets the number of executions submitted but not yet retrieved at a time
+                (default: 8); the next is submitted as soon as a result is retrieved.
+                ``direct_translation`` translates circuits straight to Quil instead of via OpenQASM; it is implied by
+                ``before_compile_quil`` hooks, and cannot be combined with ``before_compile`` hooks.
+                ``native_fast_path`` controls whether circuits already native to ``qc`` skip quilc: `None` (default)
+                detects them, `True` treats every directly-translatable circuit as native, and `False` always compiles.
+                ``multiplexing`` packs circuits side by side onto disjoint connected regions of ``qc``, each group
+                translated directly and compiled as one program, with its readout split back into one result per
+                circuit. Regions in a group are at least ``crosstalk_distance`` (default: 2) apart in the coupling map.
+                ``temporal_batch_size`` concatenates up to that many consecutive circuits into one program instead,
+                separated by active resets. Neither can be combined with ``parameter_binds`` or ``before_compile``
+                hooks, nor with each other.
+                ``parameter_binds`` is either a list of bindings, each run as its own experiment, or an array sweep: a
+                (points x parameters) array of values for each circuit's parameters, in the order of
+                ``circuit.parameters``, or a dict of parameters to arrays of values. Each circuit in an array sweep has
+                one result, whose readout is a (points x shots x bits) array.
             qc: Quantum computer to run against
             backend: :class:`RigettiQCSBackend` that created this job
-            configuration: Configuration from parent backend
+            configuration: Configuration from parent backend. Shot counts above its ``max_shots`` are split across
+                several executions, whose results are merged so that each experiment still has one result.
+            executable_cache: Cache of compiled executables to consult before compiling. If not provided, every
+                circuit is compiled.
+            timing_observer: Called with the stage timings of each experiment as soon as its result is available.
+                Timings are also recorded in each experiment result's ``metadata["timings"]``.
+            topology: Topology of ``qc``, used to place circuits when ``multiplexing``. If not provided, it is built
+                from ``configuration``.
+            executor: Executor to compile, submit and retrieve results on, shared by all jobs by default (see
+                :func:`shared_executor`). Each step runs as a separate task, so jobs do not hold threads while waiting.
         """
         super().__init__(backend, job_id)
 
@@ -67,10 +189,39 @@ class RigettiQCSJob(JobV1):
         self._options = options
         self._qc = qc
         self._configuration = configuration
-        self._result: Optional[Result] = None
+        self._executable_cache = executable_cache
+        self._timing_observer = timing_observer
+        self._topology = topology
+        self._shot_chunks = _split_shots(options["shots"], configuration.max_shots)
+        self._future: "Future[RigettiQCSResult]" = Future()
+        self._compiled: "Future[None]" = Future()
+        self._experiment_futures: List["Future[ExperimentResult]"] = []
         self._responses: List[Response] = []
+        self._experiment_circuits: List[QuantumCircuit] = []
+        self._readouts: List[List[Optional[np.ndarray]]] = []
+        self._durations: List[List[Optional[float]]] = []
+        self._remaining: List[int] = []
+        self._points: List[Optional[int]] = []
+        self._lock = Lock()
+        self._cancelled = Event()
+        self._cancelled_responses: Set[int] = set()
+        self._retrieved_responses: Set[int] = set()
+        self._submitted_at: List[float] = []
+        self._timings: List[StageTimings] = []
+        self._local = local()
+        self._executor = executor or shared_executor()
+
+        # Submission state, guarded by `_lock`
+        self._batches: Deque[List[_Execution]] = deque()
+        self._window = 1
+        self._in_flight = 0
+        self._outstanding = 0
+        self._submitting = False
+        self._retrievals: Deque[Tuple[_Execution, int]] = deque()
+        self._retrieving = 0
+        self._done = False
 
-        self._start()
+        self._spawn(self._start)
 
     def submit(self) -> None:
         """
@@ -79,64 +230,600 @@ class RigettiQCSJob(JobV1):
         """
         raise NotImplementedError("'submit' is not implemented as this class uses the asynchronous pattern")
 
+    def _spawn(self, fn: Callable[..., None], *args: Any) -> None:
+        """
+        Run one step of this job as a task on the executor. Steps never wait on each other, but schedule the next step
+        when they finish, so jobs do not need threads of their own. A step that fails fails the job.
+        """
+
+        def run() -> None:
+            try:
+                fn(*args)
+            except BaseException as e:
+                self._fail(e)
+
+        self._executor.submit(run)
+
     def _start(self) -> None:
-        self._responses = [self._start_circuit(circuit) for circuit in self._circuits]
-        self._status = JobStatus.RUNNING
+        """Compile each circuit (or group of circuits), then plan their executions."""
+        grouped = self._options.get("multiplexing") or (self._options.get("temporal_batch_size") or 1) > 1
+        if grouped:
+            groups, multiplexing = self._group()
+            compile_group = partial(self._compile_group, multiplexing=multiplexing)
+            self._compile_all(compile_group, groups, partial(self._plan_grouped, groups))
+        else:
+            # Structurally identical circuits are compiled once, and each of them is executed with the same executables
+            if len(self._circuits) > 1:
+                unique_circuits, unique_idx = _deduplicate(self._circuits)
+            else:
+                unique_circuits, unique_idx = self._circuits, list(range(len(self._circuits)))
+            self._compile_all(
+                self._compile_circuit, unique_circuits, lambda compiled: self._plan([compiled[i] for i in unique_idx])
+            )
 
-    def _start_circuit(self, circuit: QuantumCircuit) -> Response:
-        shots = self._options["shots"]
-        qasm = circuit.qasm()
-        qasm = self._handle_barriers(qasm, circuit.num_qubits)
+    def _compile_all(
+        self, fn: Callable[[_T], _R], items: List[_T], plan: Callable[[List[_R]], List[_Execution]]
+    ) -> None:
+        """
+        Apply ``fn`` to each item as separate tasks, up to ``max_compile_workers`` at a time, then plan executions from
+        the results, in input order. If any call fails, the exception raised by the earliest failing item fails the
+        job, and later items not yet started are skipped. Items not yet started when the job is cancelled are skipped,
+        by raising :class:`JobError`, and nothing is executed (see :func:`_plan_cancelled`).
+        """
+        results: List[Optional[_R]] = [None] * len(items)
+        errors: List[Optional[BaseException]] = [None] * len(items)
+        lock = Lock()
+        next_idx = 0
+        remaining = len(items)
+
+        def take() -> Optional[int]:
+            nonlocal next_idx
+            with lock:
+                if next_idx >= len(items):
+                    return None
+                next_idx += 1
+                return next_idx - 1
+
+        def finish() -> None:
+            error = next((e for e in errors if e is not None), None)
+            if error is None:
+                self._planned(plan(cast(List[_R], results)))
+            elif self._cancelled.is_set():
+                # Cancelled while compiling, so nothing will be executed
+                self._plan_cancelled()
+                self._planned([])
+            else:
+                raise error
+
+        def apply(i: int) -> None:
+            nonlocal remaining
+            try:
+                if self._cancelled.is_set():
+                    raise JobError(f"Job {self.job_id()} was cancelled")
+                if not any(e is not None for e in errors[:i]):
+                    results[i] = fn(items[i])
+            except BaseException as e:
+                errors[i] = e
+            following = take()
+            if following is not None:
+                self._spawn(apply, following)
+            with lock:
+                remaining -= 1
+                last = remaining == 0
+            if last:
+                finish()
+
+        if not items:
+            finish()
+            return
+        max_workers = self._options.get("max_compile_workers") or 1
+        next_idx = min(max_workers, len(items))
+        for i in range(next_idx):
+            self._spawn(apply, i)
+
+    def _plan(self, compiled: List[List[_Compiled]]) -> List[_Execution]:
+        """Plan each compiled circuit (or binding) to be executed as its own experiment."""
+        # Execute in circuit order regardless of the order in which compilation finished. Executions of the same
+        # executable are kept together, so that they can be submitted as one batch.
+        executions: List[_Execution] = []
+        for circuit, circuit_compiled in zip(self._circuits, compiled):
+            if circuit_compiled and circuit_compiled[0].points is not None:
+                # An array sweep, whose points are all executions of a single experiment
+                experiment_idx = len(self._experiment_circuits)
+                self._experiment_circuits.append(circuit)
+                self._points.append(sum(len(cast(Sequence[int], c.points)) for c in circuit_compiled))
+                timings = circuit_compiled[0].timings
+                self._timings.append(timings.copy() if timings else StageTimings())
+                for c in circuit_compiled:
+                    points = cast(Sequence[int], c.points)
+                    memory_maps: Sequence[Optional[MemoryMap]] = c.memory_maps or [None] * len(points)
+                    for chunk_idx, executable in enumerate(c.executables):
+                        executions.extend(
+                            _Execution(((experiment_idx, None),), chunk_idx, executable, memory_map, point_idx)
+                            for point_idx, memory_map in zip(points, memory_maps)
+                        )
+                continue
+
+            for c in circuit_compiled:
+                memory_maps = [None] if c.memory_maps is None else c.memory_maps
+                first_idx = len(self._experiment_circuits)
+                self._experiment_circuits.extend([circuit] * len(memory_maps))
+                self._points.extend([None] * len(memory_maps))
+                self._timings.extend(c.timings.copy() if c.timings else StageTimings() for _ in memory_maps)
+                for chunk_idx, executable in enumerate(c.executables):
+                    executions.extend(
+                        _Execution(((first_idx + i, None),), chunk_idx, executable, memory_map)
+                        for i, memory_map in enumerate(memory_maps)
+                    )
+        return executions
+
+    def _plan_cancelled(self) -> None:
+        """
+        Plan the experiments that would have been executed, had the job not been cancelled while compiling, so that
+        each of them still has an (unsuccessful) result: one per circuit, or per binding of a list of
+        ``parameter_binds``.
+        """
+        parameter_binds = self._options.get("parameter_binds")
+        per_circuit = 1
+        if parameter_binds is not None and not isinstance(parameter_binds, (np.ndarray, dict)):
+            per_circuit = max(len(parameter_binds), 1)
+        self._experiment_circuits = [circuit for circuit in self._circuits for _ in range(per_circuit)]
+        self._points = [None] * len(self._experiment_circuits)
+        self._timings = [StageTimings() for _ in self._experiment_circuits]
+
+    def _group(self) -> Tuple[List[List[Placement]], bool]:
+        """
+        Group circuits to be compiled and executed as one program each, whose readout is split back into one
+        experiment per circuit. With ``multiplexing``, the circuits in a group run side by side on disjoint regions of
+        the quantum computer; with ``temporal_batch_size``, they run one after another, separated by an active reset.
+
+        Returns:
+            The groups, and whether they are multiplexed.
+        """
+        multiplexing = bool(self._options.get("multiplexing"))
+        option = "multiplexing" if multiplexing else "temporal_batch_size"
+        if multiplexing and (self._options.get("temporal_batch_size") or 1) > 1:
+            raise ValueError("'multiplexing' cannot be combined with 'temporal_batch_size'")
+        if _has_parameter_binds(self._options):
+            raise ValueError(f"'{option}' cannot be combined with 'parameter_binds'")
+        if self._options.get("before_compile"):
+            raise ValueError(
+                f"'before_compile' hooks transform OpenQASM and cannot be used with '{option}', "
+                "use 'before_compile_quil' hooks instead"
+            )
+
+        if multiplexing:
+            topology = self._topology or Topology(self._configuration.coupling_map or [])
+            crosstalk_distance: int = self._options.get("crosstalk_distance", 2)
+            num_qubits = [c.num_qubits for c in self._circuits]
+            return pack_circuits(num_qubits, topology, crosstalk_distance=crosstalk_distance), True
+
+        batch_size: int = self._options["temporal_batch_size"]
+        placements = [Placement(i, tuple(range(c.num_qubits))) for i, c in enumerate(self._circuits)]
+        return [placements[i : i + batch_size] for i in range(0, len(placements), batch_size)], False
+
+    def _plan_grouped(self, groups: List[List[Placement]], compiled: List[_Compiled]) -> List[_Execution]:
+        """Plan each compiled group to be executed as one program, split into one experiment per circuit."""
+        executions: List[_Execution] = []
+        self._experiment_circuits = list(self._circuits)
+        self._points = [None] * len(self._circuits)
+        self._timings = [StageTimings() for _ in self._circuits]
+        for group, c in zip(groups, compiled):
+            experiments: List[Tuple[int, Optional[slice]]] = []
+            ro_offset = 0
+            for placement in group:
+                ro_size = readout_size(self._circuits[placement.circuit_idx])
+                columns = slice(ro_offset, ro_offset + ro_size) if len(group) > 1 else None
+                experiments.append((placement.circuit_idx, columns))
+                ro_offset += ro_size
+                self._timings[placement.circuit_idx] = c.timings.copy() if c.timings else StageTimings()
+            executions.extend(
+                _Execution(tuple(experiments), chunk_idx, executable, None)
+                for chunk_idx, executable in enumerate(c.executables)
+            )
+        return executions
+
+    def _planned(self, executions: List[_Execution]) -> None:
+        """Create a future for each planned experiment, and start submitting executions."""
+        num_experiments = len(self._experiment_circuits)
+        num_executions = [len(self._shot_chunks) * (points or 1) for points in self._points]
+        self._experiment_futures = [Future() for _ in range(num_experiments)]
+        self._readouts = [[None] * n for n in num_executions]
+        self._durations = [[None] * n for n in num_executions]
+        self._remaining = list(num_executions)
+        with self._lock:
+            self._window = self._options.get("max_outstanding_executions") or 8
+            self._batches.extend(_batch_executions(executions, self._window))
+            self._set_status(JobStatus.QUEUED)
+        self._compiled.set_result(None)
+        self._advance()
+
+    def _advance(self) -> None:
+        """
+        Submit the next batch of executions in order, if at most ``max_outstanding_executions`` executions would then be
+        outstanding, or finish the job once every execution has been retrieved (or the job is cancelled and nothing is
+        left in flight). Batches are submitted one at a time.
+        """
+        with self._lock:
+            if self._done or self._submitting or not self._compiled.done():
+                return
+            batch: Optional[List[_Execution]] = None
+            if self._batches and not self._cancelled.is_set():
+                if self._in_flight + len(self._batches[0]) > self._window:
+                    return
+                batch = self._batches.popleft()
+                self._in_flight += len(batch)
+                self._outstanding += len(batch)
+                self._submitting = True
+            elif self._outstanding == 0:
+                self._done = True
+            else:
+                return
+
+        if batch is None:
+            self._finish()
+        else:
+            self._spawn(self._submit_batch, batch)
+
+    def _submit_batch(self, batch: List[_Execution]) -> None:
+        start = monotonic()
+        responses = self._execute(batch)
+        submitted_at = monotonic()
+        for execution in batch:
+            for experiment_idx, _ in execution.experiments:
+                self._timings[experiment_idx].add("submit", submitted_at - start)
+        with self._lock:
+            first_idx = len(self._responses)
+            self._responses.extend(responses)
+            self._submitted_at.extend([submitted_at] * len(responses))
+            self._retrievals.extend((execution, first_idx + i) for i, execution in enumerate(batch))
+            self._submitting = False
+            cancelled = self._cancelled.is_set()
+            # The QAM starts working as soon as anything has been submitted
+            self._set_status(JobStatus.RUNNING)
+        if cancelled:
+            # cancel() may have missed these, as they were submitted while it ran
+            self._cancel_responses(range(first_idx, first_idx + len(responses)))
+        self._retrieve_next()
+        self._advance()
+
+    def _retrieve_next(self) -> None:
+        """Start retrieving the results of submitted executions, up to ``max_result_workers`` at a time."""
+        max_workers = self._options.get("max_result_workers") or 8
+        while True:
+            with self._lock:
+                if not self._retrievals or self._retrieving >= max_workers:
+                    return
+                execution, response_idx = self._retrievals.popleft()
+                self._retrieving += 1
+            self._spawn(self._retrieve_execution_result, execution, response_idx)
+
+    def _finish(self) -> None:
+        """Collect the results of all experiments, once nothing is left to submit or retrieve."""
+        try:
+            if self._cancelled.is_set():
+                # Experiments that were never submitted, or only partially, have no result
+                for future in self._experiment_futures:
+                    self._set_exception(future, JobError(f"Job {self.job_id()} was cancelled"))
+            result = self._collect_result()
+        except BaseException as e:
+            self._fail(e)
+            return
+
+        with self._lock:
+            if self._cancelled.is_set():
+                self._status = JobStatus.CANCELLED
+            else:
+                self._status = JobStatus.DONE if result.success else JobStatus.ERROR
+        self._future.set_result(result)
+
+    def _set_status(self, status: JobStatus) -> None:
+        """Move to a non-final ``status``, unless the job has already finished. Must be called holding the lock."""
+        if self._status not in JOB_FINAL_STATES:
+            self._status = status
+
+    def _fail(self, exception: BaseException) -> None:
+        with self._lock:
+            self._done = True
+            if self._future.done():
+                return
+            self._status = JobStatus.ERROR
+        for future in [self._compiled, *self._experiment_futures, self._future]:
+            self._set_exception(future, exception)
+
+    def _compile_circuit(self, circuit: QuantumCircuit) -> List[_Compiled]:
+        # Compilation stages are recorded against the circuit being compiled on this thread
+        timings = self._local.timings = StageTimings()
+        try:
+            if _has_parameter_binds(self._options):
+                compiled = self._compile_parametric_circuit(circuit, self._options["parameter_binds"])
+            else:
+                compiled = [_Compiled(self._compile_bound_circuit(circuit))]
+        finally:
+            self._local.timings = None
+        return [c._replace(timings=timings) for c in compiled]
+
+    def _compile_group(self, group: List[Placement], *, multiplexing: bool) -> _Compiled:
+        if len(group) == 1:
+            return self._compile_circuit(self._circuits[group[0].circuit_idx])[0]
+
+        timings = self._local.timings = StageTimings()
+        try:
+            circuits = [self._circuits[placement.circuit_idx] for placement in group]
+            with self._stage("translate"):
+                if multiplexing:
+                    program = circuits_to_program(circuits, [placement.qubits for placement in group])
+                else:
+                    program = circuits_to_program(circuits, reset_between=True)
+            if multiplexing:
+                # Keep each circuit on its own region, instead of letting quilc place them
+                program = set_quil_rewiring("NAIVE")(program)
+            executables = self._compile_program(self._apply_quil_hooks(program))
+        finally:
+            self._local.timings = None
+        return _Compiled(executables, timings=timings)
+
+    def _stage(self, name: str) -> ContextManager[None]:
+        timings: Optional[StageTimings] = getattr(self._local, "timings", None)
+        return nullcontext() if timings is None else timings.stage(name)
+
+    def _compile_parametric_circuit(self, circuit: QuantumCircuit, parameter_binds: Any) -> List[_Compiled]:
+        """
+        Compile an unbound circuit once, with its parameters read from Quil memory, to be executed once per sweep
+        point. Falls back to binding and compiling each point separately when the circuit cannot be compiled
+        parametrically.
+        """
+        sweep = _sweep(circuit, parameter_binds)
+        executables: Optional[List[QuantumExecutable]] = None
+        if (
+            sweep is not None
+            and len(sweep.parameters) > 0
+            and not self._options.get("before_compile")
+            and set(sweep.parameters) == set(circuit.parameters)
+        ):
+            try:
+                executables = self._compile_program(self._translate(circuit, sweep.parameters))
+            except Exception:
+                # Not every circuit can be translated directly, and quilc cannot compile every parametric program
+                # (e.g. arbitrary unitaries of a parameter), so these are compiled per binding as before.
+                executables = None
+
+        if sweep is None or executables is None:
+            return self._compile_bindings(circuit, parameter_binds, sweep)
+
+        # Each point's values are already in the order of the parameter memory region, so rows are used as-is
+        memory_maps: List[MemoryMap] = [{PARAMETER_REGION: row} for row in sweep.values]
+        points = range(len(memory_maps)) if sweep.array else None
+        return [_Compiled(executables, memory_maps, points=points)]
+
+    def _compile_bindings(
+        self, circuit: QuantumCircuit, parameter_binds: Any, sweep: Optional[_Sweep]
+    ) -> List[_Compiled]:
+        """Bind and compile a circuit once per distinct binding."""
+        bindings: List[Dict[Parameter, float]]
+        if sweep is None:
+            bindings = parameter_binds
+        else:
+            bindings = [dict(zip(sweep.parameters, row)) for row in sweep.values.tolist()]
+
+        # Repeated bindings share the executables compiled for their first occurrence
+        compiled: Dict[FrozenSet[Tuple[Parameter, float]], List[QuantumExecutable]] = {}
+        for binding in bindings:
+            key = frozenset(binding.items())
+            if key not in compiled:
+                compiled[key] = self._compile_bound_circuit(circuit.bind_parameters(binding))
+        executables = [compiled[frozenset(binding.items())] for binding in bindings]
+
+        if sweep is not None and sweep.array:
+            return [_Compiled(e, points=[point_idx]) for point_idx, e in enumerate(executables)]
+        return [_Compiled(e) for e in executables]
+
+    def _compile_bound_circuit(self, circuit: QuantumCircuit) -> List[QuantumExecutable]:
+        """
+        Compile a circuit without unbound parameters. Circuits are translated directly to Quil when
+        ``direct_translation`` or ``before_compile_quil`` hooks are requested, or when they may already be native to
+        the quantum computer, and via OpenQASM otherwise.
+        """
+        before_compile_quil: List[QuilPreCompilationHook] = self._options.get("before_compile_quil") or []
+        direct_translation = bool(self._options.get("direct_translation") or before_compile_quil)
+        before_compile = self._options.get("before_compile")
+        if direct_translation and before_compile:
+            raise ValueError(
+                "'before_compile' hooks transform OpenQASM and cannot be used with direct translation to Quil, "
+                "use 'before_compile_quil' hooks instead"
+            )
+
+        if not direct_translation and (before_compile or self._options.get("native_fast_path") is False):
+            return self._compile_qasm(circuit)
+
+        try:
+            program = self._translate(circuit)
+        except Exception:
+            if before_compile_quil:
+                raise
+            # Any circuit the translator cannot handle is still accepted via OpenQASM
+            return self._compile_qasm(circuit)
+
+        if direct_translation or self._is_native(program):
+            return self._compile_program(program)
+        return self._compile_qasm(circuit)
+
+    def _translate(self, circuit: QuantumCircuit, parameters: Optional[List[Parameter]] = None) -> Program:
+        with self._stage("translate"):
+            program = circuit_to_program(circuit, parameters)
+        return self._apply_quil_hooks(program)
+
+    def _apply_quil_hooks(self, program: Program) -> Program:
+        before_compile_quil: List[QuilPreCompilationHook] = self._options.get("before_compile_quil") or []
+        with self._stage("before_compile"):
+            for fn in before_compile_quil:
+                program = fn(program)
+        return program
+
+    def _is_native(self, program: Program) -> bool:
+        native_fast_path: Optional[bool] = self._options.get("native_fast_path")
+        if native_fast_path is None:
+            return is_native_program(program, self._qc)
+        return native_fast_path
+
+    def _compile_program(self, program: Program) -> List[QuantumExecutable]:
+        if self._is_native(program):
+            # Already native to the quantum computer, so quilc has nothing to do
+            return self._get_executables(program.out(), lambda: program, skip_compiler=True)
+
+        return self._get_executables(program.out(), lambda: self._qc.compiler.quil_to_native_quil(program))
+
+    def _compile_qasm(self, circuit: QuantumCircuit) -> List[QuantumExecutable]:
+        with self._stage("translate"):
+            qasm = circuit.qasm()
+            qasm = self._handle_barriers(qasm, circuit.num_qubits)
+            readout = readout_register(circuit)
+            if readout is not None and readout.name != "ro":
+                qasm = _rename_qasm_register(qasm, readout.name, "ro")
 
         before_compile: List[PreCompilationHook] = self._options.get("before_compile", [])
-        for fn in before_compile:
-            qasm = fn(qasm)
+        with self._stage("before_compile"):
+            for fn in before_compile:
+                qasm = fn(qasm)
+
+        return self._get_executables(qasm, lambda: self._qc.compiler.transpile_qasm_2(qasm))
 
-        program = self._qc.compiler.transpile_qasm_2(qasm)
-        program = program.wrap_in_numshots_loop(shots)
+    def _execute(self, batch: List[_Execution]) -> List[Response]:
+        # typing: QuantumComputer's inner QAM is generic, so we set the expected type here
+        executable = batch[0].executable
+        memory_maps = [execution.memory_map for execution in batch if execution.memory_map is not None]
+        if not memory_maps:
+            return [cast(Response, self._qc.qam.execute(executable))]
+        return cast(List[Response], self._qc.qam.execute_with_memory_map_batch(executable, memory_maps))
 
+    def _get_executables(
+        self, source: str, to_native_quil: Callable[[], Program], *, skip_compiler: bool = False
+    ) -> List[QuantumExecutable]:
+        """
+        Compile a program into one executable per chunk of shots, or reuse previously-compiled ones from the executable
+        cache. The program is compiled to native Quil at most once, however many distinct chunk sizes there are.
+
+        Args:
+            source: QASM or Quil text of the program, used to look up the executable cache.
+            to_native_quil: Compiles the program to native Quil.
+            skip_compiler: Whether ``to_native_quil`` returns the program as-is, without compiling it.
+        """
         before_execute: List[PreExecutionHook] = self._options.get("before_execute", [])
-        for fn in before_execute:
-            program = fn(program)
+        ensure_native_quil = bool(self._options.get("ensure_native_quil")) and len(before_execute) > 0
 
-        if self._options.get("ensure_native_quil") and len(before_execute) > 0:
-            program = self._qc.compiler.quil_to_native_quil(program)
+        shot_sizes = sorted(set(self._shot_chunks))
+        executables: Dict[int, QuantumExecutable] = {}
+        native_quil: Optional[Program] = None
+        for shots in shot_sizes:
+            cache = self._executable_cache
+            cache_key: Optional[str] = None
+            fingerprint = ""
+            if cache is not None:
+                fingerprint = quantum_computer_fingerprint(self._qc)
+                cache_key = executable_cache_key(
+                    source=source,
+                    shots=shots,
+                    hooks=before_execute,
+                    fingerprint=fingerprint,
+                    ensure_native_quil=ensure_native_quil,
+                    skip_compiler=skip_compiler,
+                )
+            if cache is not None and cache_key is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    executables[shots] = cached
+                    continue
 
-        executable = self._qc.compiler.native_quil_to_executable(program)
+            if native_quil is None:
+                if skip_compiler:
+                    native_quil = to_native_quil()
+                else:
+                    with self._stage("compile"):
+                        native_quil = to_native_quil()
+            # Wrapping in a shot loop modifies the program, so each chunk size needs its own copy
+            program = native_quil.copy() if len(shot_sizes) > 1 else native_quil
+            program = program.wrap_in_numshots_loop(shots)
 
-        # typing: QuantumComputer's inner QAM is generic, so we set the expected type here
-        return cast(Response, self._qc.qam.execute(executable))
+            with self._stage("before_execute"):
+                for fn in before_execute:
+                    program = fn(program)
+
+                if ensure_native_quil:
+                    program = self._qc.compiler.quil_to_native_quil(program)
+
+            with self._stage("executable"):
+                executable = self._qc.compiler.native_quil_to_executable(program)
+
+            if cache is not None and cache_key is not None:
+                cache.put(cache_key, executable, name=self._qc.name, fingerprint=fingerprint)
+
+            executables[shots] = executable
+
+        return [executables[shots] for shots in self._shot_chunks]
 
     @staticmethod
     def _handle_barriers(qasm: str, num_circuit_qubits: int) -> str:
-        lines = []
-        for line in qasm.splitlines():
-            if line.startswith("barrier"):
-                warnings.warn("barriers are currently omitted during execution on a RigettiQCSBackend")
-                continue
-
-            lines.append(line)
+        all_lines = qasm.splitlines()
+        lines = [line for line in all_lines if not line.startswith("barrier")]
+        if len(lines) < len(all_lines):
+            warnings.warn(
+                "barriers are currently omitted during execution on a RigettiQCSBackend, "
+                "use direct_translation=True to execute them as Quil FENCE instructions"
+            )
         return "\n".join(lines)
 
-    def result(self) -> Result:
+    def result(self, timeout: Optional[float] = None) -> RigettiQCSResult:
         """
         Wait until the job is complete, then return a result.
 
+        Args:
+            timeout: Maximum time to wait for the job to complete, in seconds. If `None`, waits indefinitely.
+
         Raises:
-            JobError: If there was a problem running the Job or retrieving the result
+            JobTimeoutError: If the job did not complete within ``timeout``.
+            Exception: Any error raised while compiling or executing the job's circuits.
+        """
+        try:
+            return self._future.result(timeout)
+        except FutureTimeoutError as e:
+            raise JobTimeoutError(f"Timed out after {timeout} seconds waiting for job {self.job_id()}") from e
+
+    async def result_async(self, timeout: Optional[float] = None) -> RigettiQCSResult:
         """
-        if self._result is not None:
-            return self._result
+        Like :func:`result`, but waits without blocking the running event loop. Cancelling the awaiting task does not
+        cancel the job.
 
+        Args:
+            timeout: Maximum time to wait for the job to complete, in seconds. If `None`, waits indefinitely.
+
+        Raises:
+            JobTimeoutError: If the job did not complete within ``timeout``.
+            Exception: Any error raised while compiling or executing the job's circuits.
+        """
+        try:
+            return await asyncio.wait_for(_await_future(self._future), timeout)
+        except asyncio.TimeoutError as e:
+            raise JobTimeoutError(f"Timed out after {timeout} seconds waiting for job {self.job_id()}") from e
+
+    async def iter_results_async(self) -> AsyncIterator[ExperimentResult]:
+        """
+        Asynchronously iterate over experiment results in submission order, yielding each one as soon as it and all
+        results before it have been retrieved.
+
+        Raises:
+            Exception: Any error raised while compiling or executing the job's circuits.
+        """
+        await _await_future(self._compiled)
+        for future in self._experiment_futures:
+            yield await _await_future(future)
+
+    def _collect_result(self) -> RigettiQCSResult:
         now = datetime.now(tzutc())
 
-        results = []
-        success = True
-        for r in self._get_experiment_results():
-            results.append(r)
-            success &= r.success
+        results = [self._collect_experiment_result(i) for i in range(len(self._experiment_futures))]
+        success = not self._cancelled.is_set() and all(r.success for r in results)
 
-        self._result = Result(
+        return RigettiQCSResult(
             backend_name=self._configuration.backend_name,
             backend_version=self._configuration.backend_version,
             qobj_id="",
@@ -147,53 +834,413 @@ class RigettiQCSJob(JobV1):
             execution_duration_microseconds=[r.execution_duration_microseconds for r in results],
         )
 
-        self._status = JobStatus.DONE if success else JobStatus.ERROR
-        return self._result
+    def _collect_experiment_result(self, experiment_idx: int) -> ExperimentResult:
+        future = self._experiment_futures[experiment_idx]
+        if not self._cancelled.is_set() or future.exception() is None:
+            return future.result()
 
-    def _get_experiment_results(self) -> Iterator[ExperimentResult]:
+        # Experiments that did not complete before the job was cancelled are reported as unsuccessful, alongside the
+        # results of those that did
+        return ExperimentResult(
+            header=QobjExperimentHeader(name=self._experiment_circuits[experiment_idx].name),
+            shots=self._options["shots"],
+            success=False,
+            status=f"Cancelled: {future.exception()}",
+            data=ExperimentResultData(),
+            execution_duration_microseconds=None,
+            metadata={"timings": self._timings[experiment_idx].as_dict()},
+        )
+
+    def _retrieve_execution_result(self, execution: _Execution, response_idx: int) -> None:
+        try:
+            self._process_execution_result(execution, response_idx)
+        finally:
+            with self._lock:
+                self._retrieving -= 1
+                self._outstanding -= 1
+            self._retrieve_next()
+            self._advance()
+
+    def _process_execution_result(self, execution: _Execution, response_idx: int) -> None:
+        try:
+            try:
+                with self._lock:
+                    if response_idx in self._cancelled_responses:
+                        raise JobError(f"Job {self.job_id()} was cancelled")
+                execution_result = self._qc.qam.get_result(self._responses[response_idx])
+            finally:
+                # Free up the submission window as soon as the execution is done with
+                with self._lock:
+                    self._in_flight -= 1
+                self._advance()
+            with self._lock:
+                self._retrieved_responses.add(response_idx)
+                submitted_at = self._submitted_at[response_idx]
+            queued = monotonic() - submitted_at
+
+            readout = np.asarray(execution_result.readout_data["ro"])
+            idx = execution.point_idx * len(self._shot_chunks) + execution.chunk_idx
+            complete = []
+            with self._lock:
+                for experiment_idx, columns in execution.experiments:
+                    self._timings[experiment_idx].add("queue", queued)
+                    readouts = self._readouts[experiment_idx]
+                    durations = self._durations[experiment_idx]
+                    readouts[idx] = readout if columns is None else readout[:, columns]
+                    durations[idx] = execution_result.execution_duration_microseconds
+                    self._remaining[experiment_idx] -= 1
+                    if self._remaining[experiment_idx] == 0:
+                        complete.append(experiment_idx)
+
+            # Only the last chunk of each experiment to finish builds its result
+            for experiment_idx in complete:
+                result = self._get_experiment_result(experiment_idx)
+                self._notify_timing_observer(experiment_idx, result.metadata["timings"])
+                future = self._experiment_futures[experiment_idx]
+                with self._lock:
+                    if not future.done():
+                        future.set_result(result)
+        except BaseException as e:
+            for experiment_idx, _ in execution.experiments:
+                self._set_exception(self._experiment_futures[experiment_idx], e)
+
+    def _get_experiment_result(self, experiment_idx: int) -> ExperimentResult:
         shots = self._options["shots"]
+        include_memory = bool(self._options.get("memory"))
 
-        for circuit_idx, response in enumerate(self._responses):
-            execution_result = self._qc.qam.get_result(response)
-            states = execution_result.readout_data["ro"]
-            memory = list(map(_to_binary_str, np.array(states)))
-            success = True
-            status = "Completed successfully"
+        readouts = cast(List[np.ndarray], self._readouts[experiment_idx])
+        durations = self._durations[experiment_idx]
+        duration = None if any(d is None for d in durations) else sum(cast(List[float], durations))
+        circuit = self._experiment_circuits[experiment_idx]
+        timings = self._timings[experiment_idx]
 
-            circuit = self._circuits[circuit_idx]
-            yield ExperimentResult(
+        if self._points[experiment_idx] is not None:
+            # Array sweeps are left undecoded, as counts and memory would need Python objects for every point
+            num_chunks = len(self._shot_chunks)
+            chunks = [readouts[i : i + num_chunks] for i in range(0, len(readouts), num_chunks)]
+            sweep_states = np.stack([c[0] if num_chunks == 1 else np.concatenate(c) for c in chunks])
+            return ExperimentResult(
                 header=QobjExperimentHeader(name=circuit.name),
                 shots=shots,
-                success=success,
-                status=status,
-                data=ExperimentResultData(counts=Counter(memory), memory=memory),
-                execution_duration_microseconds=execution_result.execution_duration_microseconds,
+                success=True,
+                status="Completed successfully",
+                data=ExperimentResultData(readout=sweep_states),
+                execution_duration_microseconds=duration,
+                metadata={"timings": timings.as_dict()},
             )
 
-    def cancel(self) -> None:
+        states = readouts[0] if len(readouts) == 1 else np.concatenate(readouts)
+        with timings.stage("decode"):
+            bitstrings, outcomes, counts = _decode_readout(states)
+            memory = np.array(bitstrings, dtype=object)[outcomes].tolist() if include_memory else None
+        success = True
+        status = "Completed successfully"
+
+        return ExperimentResult(
+            header=QobjExperimentHeader(name=circuit.name),
+            shots=shots,
+            success=success,
+            status=status,
+            data=ExperimentResultData(counts=Counter(dict(zip(bitstrings, counts))), memory=memory, readout=states),
+            execution_duration_microseconds=duration,
+            metadata={"timings": timings.as_dict()},
+        )
+
+    def _notify_timing_observer(self, experiment_idx: int, timings: Dict[str, float]) -> None:
+        if self._timing_observer is None:
+            return
+        try:
+            self._timing_observer(self.job_id(), experiment_idx, timings)
+        except Exception as e:
+            # Observers are for monitoring only, so they must not fail the job
+            warnings.warn(f"timing observer failed: {e!r}")
+
+    def _set_exception(self, future: "Future[_R]", exception: BaseException) -> None:
+        with self._lock:
+            if not future.done():
+                future.set_exception(exception)
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[Tuple[int, ExperimentResult]]:
         """
+        Iterate over experiment results in the order their executions finish, rather than the order they were
+        submitted in, so that post-processing can overlap with the remaining executions.
+
+        Args:
+            timeout: Maximum time to wait for all results, in seconds. If `None`, waits indefinitely.
+
+        Yields:
+            Tuple[int, ExperimentResult]: The index of each experiment within :func:`result`, and its result.
+
         Raises:
-            NotImplementedError: There is currently no way to cancel this job.
+            JobTimeoutError: If not all results were available within ``timeout``.
+            Exception: Any error raised while compiling or executing the job's circuits.
         """
-        raise NotImplementedError("Cancelling jobs is not supported")
+        deadline = None if timeout is None else monotonic() + timeout
+        try:
+            self._compiled.result(timeout)
+            indices = {future: i for i, future in enumerate(self._experiment_futures)}
+            remaining = None if deadline is None else max(0.0, deadline - monotonic())
+            for future in futures.as_completed(indices, timeout=remaining):
+                yield indices[future], future.result()
+        except FutureTimeoutError as e:
+            raise JobTimeoutError(f"Timed out after {timeout} seconds waiting for job {self.job_id()}") from e
 
-    def status(self) -> JobStatus:
-        """Get the current status of this Job
+    def cancel(self) -> bool:
+        """
+        Cancel this job, without waiting for it to stop. Has no effect if the job has already finished, or once the
+        results of all its executions have been retrieved.
+
+        Compilations that have not started are skipped, no further executions are submitted, and executions submitted
+        but not yet retrieved are cancelled through the QPU (on a best effort basis: executions that have already
+        started, or that run on a QVM, still complete). The job then moves to ``CANCELLED``, and :func:`result`
+        returns the results of the experiments that completed; the others are unsuccessful, so that there is one result
+        per experiment however early the job was cancelled.
 
-        If this job was RUNNING when you called it, this function will block until the job is complete.
+        Returns:
+            bool: Whether the job is being cancelled.
         """
+        if self._future.done():
+            return False
+        with self._lock:
+            if self._done or (
+                self._compiled.done() and not self._batches and not self._submitting and self._outstanding == 0
+            ):
+                # Every result has been retrieved, so only collecting them is left
+                return False
+            self._cancelled.set()
+            pending = [i for i in range(len(self._responses)) if i not in self._retrieved_responses]
+        self._cancel_responses(pending)
+        return True
 
-        if self._status == JobStatus.RUNNING:
-            # Wait for results _now_ to finish running, otherwise consuming code might wait forever.
-            self.result()
+    def _cancel_responses(self, response_indices: Iterable[int]) -> None:
+        cancel: Optional[Callable[[Response], None]] = getattr(self._qc.qam, "cancel", None)
+        if cancel is None:
+            # Only QPU executions can be cancelled
+            return
+
+        for response_idx in response_indices:
+            try:
+                cancel(self._responses[response_idx])
+            except Exception:
+                # The execution has already started, or finished, so its result is still retrieved
+                continue
+            with self._lock:
+                self._cancelled_responses.add(response_idx)
 
+    def status(self) -> JobStatus:
+        """Get the current status of this Job, without blocking.
+
+        * ``INITIALIZING``: circuits are being compiled.
+        * ``QUEUED``: circuits have been compiled, and no executable has been submitted yet.
+        * ``RUNNING``: executables have been submitted, and results are being retrieved.
+        * ``DONE`` or ``ERROR``: the job has finished, and :func:`result` returns (or raises) immediately.
+        * ``CANCELLED``: the job was cancelled, and :func:`result` returns the results available.
+        """
         return self._status
 
 
-def _to_binary_str(state: List[int]) -> str:
+def _split_shots(shots: int, max_shots: Optional[int]) -> List[int]:
+    """Split a number of shots into chunks of at most ``max_shots`` (if given), the last of which may be smaller."""
+    if not max_shots or shots <= max_shots:
+        return [shots]
+    full, remainder = divmod(shots, max_shots)
+    return [max_shots] * full + ([remainder] if remainder else [])
+
+
+def _has_parameter_binds(options: Dict[str, Any]) -> bool:
+    # Arrays have no truth value, so emptiness is checked by length
+    parameter_binds = options.get("parameter_binds")
+    return parameter_binds is not None and len(parameter_binds) > 0
+
+
+def _sweep(circuit: QuantumCircuit, parameter_binds: Any) -> Optional[_Sweep]:
+    """
+    Arrange ``parameter_binds`` for a circuit as a (points x parameters) array of values.
+
+    Returns:
+        The sweep, or `None` if ``parameter_binds`` is a list of bindings that do not all bind the same parameters to
+        numbers, and so can only be bound one at a time.
+
+    Raises:
+        ValueError: If an array sweep does not have one value per parameter at every point.
+    """
+    if isinstance(parameter_binds, Mapping):
+        parameters = list(parameter_binds)
+        columns = [np.asarray(parameter_binds[p], dtype=float) for p in parameters]
+        if any(column.ndim != 1 for column in columns) or len({len(column) for column in columns}) > 1:
+            raise ValueError("'parameter_binds' must map each parameter to a 1-D array of the same length")
+        return _Sweep(parameters, np.column_stack(columns), array=True)
+
+    if isinstance(parameter_binds, np.ndarray):
+        parameters = list(circuit.parameters)
+        values = np.asarray(parameter_binds, dtype=float)
+        if values.ndim == 1 and len(parameters) == 1:
+            values = values[:, np.newaxis]
+        if values.ndim != 2 or values.shape[1] != len(parameters):
+            raise ValueError(
+                f"'parameter_binds' must be a (points x {len(parameters)}) array for circuit {circuit.name}, "
+                f"got shape {values.shape}"
+            )
+        return _Sweep(parameters, values, array=True)
+
+    bindings: List[Dict[Parameter, Any]] = parameter_binds
+    parameters = list(bindings[0])
+    if any(set(binding) != set(parameters) for binding in bindings):
+        return None
+    try:
+        values = np.array([[binding[p] for p in parameters] for binding in bindings], dtype=float)
+    except (TypeError, ValueError):
+        return None
+    return _Sweep(parameters, values, array=False)
+
+
+def _rename_qasm_register(qasm: str, name: str, new_name: str) -> str:
+    """Rename a classical register in OpenQASM, where it is always followed by an index or a comparison."""
+    return re.sub(rf"\b{re.escape(name)}(?=\[|==)", new_name, qasm)
+
+
+def _deduplicate(circuits: List[QuantumCircuit]) -> Tuple[List[QuantumCircuit], List[int]]:
+    """
+    Find the structurally identical circuits in a list.
+
+    Returns:
+        The first occurrence of each distinct circuit, and the index into those of each circuit in ``circuits``.
+    """
+    unique: List[QuantumCircuit] = []
+    unique_idx: List[int] = []
+    seen: Dict[Hashable, int] = {}
+    for circuit in circuits:
+        key = _circuit_key(circuit)
+        if key is None:
+            idx = len(unique)
+        else:
+            idx = seen.setdefault(key, len(unique))
+        if idx == len(unique):
+            unique.append(circuit)
+        unique_idx.append(idx)
+    return unique, unique_idx
+
+
+def _circuit_key(circuit: QuantumCircuit) -> Optional[Hashable]:
+    """
+    A key that is equal for circuits with the same registers, instructions, operands and parameters, regardless of
+    their names and metadata, or `None` if the circuit contains operations that cannot be compared this way.
+    """
+    try:
+        key = (
+            circuit.num_qubits,
+            tuple((creg.name, creg.size) for creg in circuit.cregs),
+            _parameter_key(circuit.global_phase),
+            tuple(
+                (
+                    _operation_key(circuit, instruction.operation),
+                    tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits),
+                    tuple(circuit.find_bit(clbit).index for clbit in instruction.clbits),
+                )
+                for instruction in circuit.data
+            ),
+        )
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _operation_key(circuit: QuantumCircuit, operation: Instruction) -> Hashable:
+    condition = getattr(operation, "condition", None)
+    if isinstance(condition, tuple):
+        target, value = condition
+        if isinstance(target, ClassicalRegister):
+            condition = (target.name, target.size, value)
+        else:
+            condition = (circuit.find_bit(target).index, value)
+    elif condition is not None:
+        raise TypeError(f"cannot compare the condition of {operation.name}")
+    definition = None
+    if (
+        _STANDARD_OPERATIONS.get(operation.name) is not type(operation)
+        # Unitary gates, including the Quil gates, are identified by their matrix parameter, and synthesizing their
+        # definition is expensive
+        and not isinstance(operation, UnitaryGate)
+        and operation.definition is not None
+    ):
+        # Other operations, such as custom gates and gates controlled by .control(), are not identified by their name
+        # (which need not be unique), type and parameters alone
+        definition = _circuit_key(operation.definition)
+        if definition is None:
+            raise TypeError(f"cannot compare the definition of {operation.name}")
+    return (
+        type(operation),
+        operation.name,
+        operation.num_qubits,
+        operation.num_clbits,
+        tuple(_parameter_key(param) for param in operation.params),
+        condition,
+        definition,
+    )
+
+
+def _parameter_key(param: Any) -> Hashable:
+    if isinstance(param, np.ndarray):
+        return (param.dtype.str, param.shape, param.tobytes())
+    return cast(Hashable, param)
+
+
+def _batch_executions(executions: List[_Execution], max_size: int) -> Iterator[List[_Execution]]:
+    """
+    Group consecutive executions of the same executable with memory maps into batches of up to ``max_size``, which
+    can be submitted together. Executions without memory maps are submitted one at a time.
+    """
+    batch: List[_Execution] = []
+    for execution in executions:
+        if batch and (
+            len(batch) >= max_size
+            or execution.memory_map is None
+            or batch[0].memory_map is None
+            or execution.executable is not batch[0].executable
+        ):
+            yield batch
+            batch = []
+        batch.append(execution)
+    if batch:
+        yield batch
+
+
+async def _await_future(future: "Future[_R]") -> _R:
+    # Shielded so that cancelling the awaiting task does not cancel the job's own future
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+def _decode_readout(states: np.ndarray) -> Tuple[List[str], np.ndarray, List[int]]:
+    """
+    Find the distinct outcomes in a (shots x bits) readout array without formatting every shot.
+
+    Returns:
+        The bitstring of each distinct outcome, in order of first appearance; the index of each shot's outcome into
+        those bitstrings; and the number of shots with each outcome.
+    """
+    num_shots, num_bits = states.shape
+    if num_bits <= 64:
+        # Pack each shot into a single integer, so outcomes can be found with a 1-D sort
+        weights = np.left_shift(np.uint64(1), np.arange(num_bits, dtype=np.uint64))
+        keys = (states.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+        _, first, outcomes, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+    else:
+        packed = np.packbits(states.astype(bool), axis=1)
+        _, first, outcomes, counts = np.unique(
+            packed, axis=0, return_index=True, return_inverse=True, return_counts=True
+        )
+    outcomes = outcomes.reshape(num_shots)
+
+    # np.unique sorts outcomes; reorder them by first appearance, as counting the shots one-by-one would
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+
     # NOTE: According to https://arxiv.org/pdf/1809.03452.pdf, this should be a hex string
     # but it results in missing leading zeros in the displayed output, and binary strings
     # seem to work too. Hex string could be accomplished with:
     #     hex(int(binary_str, 2))
-    binary_str = "".join(map(str, state[::-1]))
-    return binary_str
+    chars = np.ascontiguousarray(states[first[order], ::-1] + ord("0"), dtype=np.uint8)
+    bitstrings = [row.decode() for row in chars.view(f"S{num_bits}").ravel()]
+    return bitstrings, rank[outcomes], counts[order].tolist()
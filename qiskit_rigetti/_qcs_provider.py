@@ -13,14 +13,26 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
-from typing import Any, Optional, List, Dict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Optional, List, Dict, Union
 
 from pyquil.api import QCSClient, list_quantum_computers
 from qcs_sdk.qpu.isa import InstructionSetArchitecture, get_instruction_set_architecture, GetISAError
 from qiskit.providers import ProviderV1
 from qiskit.providers.models import QasmBackendConfiguration
 
-from ._qcs_backend import RigettiQCSBackend, get_coupling_map_from_qc_topology
+from ._discovery_cache import DiscoveryCache
+from ._executable_cache import ExecutableCache, ExecutableStore
+from ._qc_pool import QuantumComputerPool
+from ._qcs_backend import RigettiQCSBackend
+
+_MAX_DISCOVERY_WORKERS = 16
+"""Maximum number of instruction set architectures fetched concurrently."""
+
+_MAX_SHOTS = 10000
+"""Default number of shots per execution; larger shot counts are split across several executions."""
 
 
 class RigettiQCSProvider(ProviderV1):
@@ -34,23 +46,59 @@ class RigettiQCSProvider(ProviderV1):
         compiler_timeout: float = 10.0,
         execution_timeout: float = 10.0,
         client_configuration: Optional[QCSClient] = None,
+        executable_store: Optional[Union[str, "os.PathLike[str]", ExecutableStore]] = None,
+        discovery_cache: Optional[Union[str, "os.PathLike[str]", DiscoveryCache]] = None,
     ) -> None:
         """
         Args:
             execution_timeout: Time limit for execution requests, in seconds.
             compiler_timeout: Time limit for compiler requests, in seconds.
             client_configuration: QCS client configuration. If one is not provided, a default will be loaded.
+            executable_store: Optional SQLite file or directory (or an :class:`ExecutableStore`) in which to persist
+                compiled executables, so that processes sharing it only compile each program once.
+            discovery_cache: Optional SQLite file or directory (or a :class:`DiscoveryCache`) in which to cache the
+                available quantum processors, their instruction set architectures and coupling maps, so that
+                processes sharing it make no discovery requests while it is fresh. See :func:`refresh`.
         """
         super().__init__()
-        self._backends: List[RigettiQCSBackend] = []
+        self._backends: Dict[str, RigettiQCSBackend] = {}
+        self._all_backends_loaded = False
+        self._backends_lock = Lock()
         self._compiler_timeout = compiler_timeout
         self._execution_timeout = execution_timeout
         self._client_configuration = client_configuration or QCSClient.load()
+        if executable_store is not None and not isinstance(executable_store, ExecutableStore):
+            executable_store = ExecutableStore(executable_store)
+        self._executable_store = executable_store
+        if discovery_cache is not None and not isinstance(discovery_cache, DiscoveryCache):
+            discovery_cache = DiscoveryCache(discovery_cache)
+        self._discovery_cache = discovery_cache
+        self._qc_pool = QuantumComputerPool(self._client_configuration)
+
+    @property
+    def discovery_cache(self) -> Optional[DiscoveryCache]:
+        return self._discovery_cache
+
+    def refresh(self) -> None:
+        """
+        Discard cached discovery data, in memory and in the discovery cache, and pooled quantum computers, so that
+        quantum processors, their instruction set architectures and coupling maps are fetched again. Backends already
+        returned are unaffected.
+        """
+        with self._backends_lock:
+            self._qc_pool.clear()
+            self._backends = {}
+            self._all_backends_loaded = False
+            if self._discovery_cache is not None:
+                self._discovery_cache.clear()
 
     def backends(self, name: Optional[str] = None, **__: Any) -> List[RigettiQCSBackend]:
         """
         Get the list of :class:`RigettiQCSBackend` corresponding to the available Quantum Processors.
 
+        Instruction set architectures are fetched concurrently. When ``name`` is given, only that processor is
+        resolved, and backends are created once and reused by later calls.
+
         Args:
             name: An optional QPU name to match against (e.g. "Aspen-9"). If provided, only matching backends will be
                     returned.
@@ -58,27 +106,42 @@ class RigettiQCSProvider(ProviderV1):
         Returns:
             List[RigettiQCSBackend]: The list of matching backends.
         """
-        if not self._backends:
-            for qpu, isa in self._get_quantum_processors().items():
-                num_qubits = len(isa.architecture.nodes)
-                configuration = _configuration(qpu, num_qubits=num_qubits, local=False, simulator=False)
-                self._backends.append(
-                    RigettiQCSBackend(
-                        compiler_timeout=self._compiler_timeout,
-                        execution_timeout=self._execution_timeout,
-                        client_configuration=self._client_configuration,
-                        backend_configuration=configuration,
-                        provider=self,
-                    )
-                )
-
-        if name is None:
-            return self._backends
-        return [b for b in self._backends if b.name() == name]
+        with self._backends_lock:
+            if name is not None:
+                # Resolve only the requested processor; the others are loaded the first time they are asked for
+                backend = self._backends.get(name)
+                if backend is None and not self._all_backends_loaded:
+                    isa = self._get_quantum_processor(name)
+                    if isa is not None:
+                        backend = self._backends[name] = self._make_backend(name, isa)
+                return [backend] if backend is not None else []
+
+            if not self._all_backends_loaded:
+                self._backends = {
+                    qpu: self._backends.get(qpu) or self._make_backend(qpu, isa)
+                    for qpu, isa in self._get_quantum_processors().items()
+                }
+                self._all_backends_loaded = True
+            return list(self._backends.values())
+
+    def _make_backend(self, qpu: str, isa: InstructionSetArchitecture) -> RigettiQCSBackend:
+        num_qubits = len(isa.architecture.nodes)
+        configuration = _configuration(qpu, num_qubits=num_qubits, local=False, simulator=False)
+        return RigettiQCSBackend(
+            compiler_timeout=self._compiler_timeout,
+            execution_timeout=self._execution_timeout,
+            client_configuration=self._client_configuration,
+            backend_configuration=configuration,
+            provider=self,
+            executable_cache=ExecutableCache(store=self._executable_store),
+            discovery_cache=self._discovery_cache,
+            qc_pool=self._qc_pool,
+            isa=isa,
+        )
 
     def get_simulator(self, *, num_qubits: int, noisy: bool = False) -> RigettiQCSBackend:
         """
-        Get a simulator (QVM).
+        Get a simulator (QVM). Simulators with the same number of qubits and noisiness share one `QuantumComputer`.
 
         Args:
             num_qubits: Number of qubits the simulator should have
@@ -98,23 +161,52 @@ class RigettiQCSProvider(ProviderV1):
             client_configuration=self._client_configuration,
             backend_configuration=configuration,
             provider=self,
+            executable_cache=ExecutableCache(store=self._executable_store),
+            discovery_cache=self._discovery_cache,
+            qc_pool=self._qc_pool,
         )
-        configuration.coupling_map = get_coupling_map_from_qc_topology(backend.qc)
+        backend._set_coupling_map_based_on_qc_topology_if_necessary()
 
         return backend
 
     def _get_quantum_processors(self) -> Dict[str, InstructionSetArchitecture]:
-        qpus = list_quantum_computers(qvms=False, client_configuration=self._client_configuration)
-        qpu_to_isa: Dict[str, InstructionSetArchitecture] = {}
-        for qpu in qpus:
-            try:
-                qpu_to_isa[qpu] = get_instruction_set_architecture(qpu, client=self._client_configuration)
-            except GetISAError:
-                pass
-        return qpu_to_isa
-
-
-def _configuration(name: str, num_qubits: int, local: bool, simulator: bool) -> QasmBackendConfiguration:
+        cache = self._discovery_cache
+        qpus = cache.get_quantum_computers() if cache is not None else None
+        if qpus is None:
+            qpus = list_quantum_computers(qvms=False, client_configuration=self._client_configuration)
+            if cache is not None:
+                cache.put_quantum_computers(qpus)
+        if not qpus:
+            return {}
+
+        # ISAs are independent requests, so fetch them concurrently rather than one round trip after another
+        with ThreadPoolExecutor(max_workers=min(_MAX_DISCOVERY_WORKERS, len(qpus))) as pool:
+            isas = list(pool.map(self._get_quantum_processor, qpus))
+        return {qpu: isa for qpu, isa in zip(qpus, isas) if isa is not None}
+
+    def _get_quantum_processor(self, qpu: str) -> Optional[InstructionSetArchitecture]:
+        cache = self._discovery_cache
+        isa = cache.get_isa(qpu) if cache is not None else None
+        if isa is not None:
+            return isa
+
+        try:
+            isa = get_instruction_set_architecture(qpu, client=self._client_configuration)
+        except GetISAError:
+            return None
+        if cache is not None:
+            cache.put_isa(qpu, isa)
+        return isa
+
+
+def _configuration(
+    name: str,
+    num_qubits: int,
+    local: bool,
+    simulator: bool,
+    *,
+    max_shots: int = _MAX_SHOTS,
+) -> QasmBackendConfiguration:
     return QasmBackendConfiguration(
         backend_name=name,
         backend_version="",
@@ -125,8 +217,7 @@ def _configuration(name: str, num_qubits: int, local: bool, simulator: bool) ->
         simulator=simulator,
         conditional=False,
         open_pulse=False,
-        memory=False,
-        max_shots=10000,
+        memory=True,
+        max_shots=max_shots,
         coupling_map=[],
-        max_experiments=8,
     )
@@ -0,0 +1,53 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from typing import Any, Optional
+
+import numpy as np
+from qiskit.exceptions import QiskitError
+from qiskit.result import Result
+
+
+class RigettiQCSResult(Result):
+    """
+    A :class:`qiskit.result.Result` with access to the raw readout of each experiment.
+    """
+
+    def get_memory_array(self, experiment: Any = None, *, packed: bool = False) -> np.ndarray:
+        """
+        Get the readout of an experiment as a (shots x bits) array, where column ``i`` holds ``ro[i]``. For circuits
+        run with an array of ``parameter_binds``, the readout at every sweep point is returned as a
+        (points x shots x bits) array.
+
+        Unlike :func:`get_memory`, this does not require ``memory=True`` and does not format each shot as a string. The
+        array returned is the one stored in the result, not a copy made on each call, and may share memory with the
+        buffer read back from the QAM (unless shots were split across several executions, whose readouts are merged into
+        a new array), so it must be treated as read-only.
+
+        Args:
+            experiment: The index, name or circuit of the experiment. May be omitted if there is only one experiment.
+            packed: Pack each shot's bits into bytes (see :func:`numpy.packbits`, with little-endian bit order) to
+                reduce memory use. Packing makes a copy.
+
+        Raises:
+            QiskitError: If there is no readout for the experiment.
+        """
+        readout: Optional[np.ndarray] = getattr(self._get_experiment(experiment).data, "readout", None)
+        if readout is None:
+            raise QiskitError(f'No readout for experiment "{experiment}".')
+
+        if packed:
+            return np.packbits(readout.astype(bool), axis=-1, bitorder="little")
+        return readout
@@ -0,0 +1,350 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import hashlib
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union, cast
+
+import numpy as np
+from pyquil import Program
+from pyquil.gates import (
+    CCNOT,
+    CNOT,
+    CPHASE,
+    CPHASE00,
+    CPHASE01,
+    CPHASE10,
+    CSWAP,
+    CZ,
+    H,
+    I,
+    ISWAP,
+    MEASURE,
+    PHASE,
+    PSWAP,
+    RESET,
+    RX,
+    RY,
+    RZ,
+    S,
+    SWAP,
+    T,
+    X,
+    XY,
+    Y,
+    Z,
+)
+from pyquil.quilatom import Expression, MemoryReference, Qubit, quil_cos, quil_exp, quil_sin
+from pyquil.quilbase import DefGate, Fence, Gate
+from qiskit import ClassicalRegister, QuantumCircuit
+from qiskit.circuit import Instruction, Parameter, ParameterExpression
+from qiskit.extensions import UnitaryGate
+
+from .gates import CPhase00Gate, CPhase01Gate, CPhase10Gate, PSwapGate, XYGate
+
+PARAMETER_REGION = "qiskit_params"
+"""Name of the Quil memory region that holds the values of a circuit's unbound parameters."""
+
+QuilParameter = Union[float, Expression, MemoryReference]
+
+
+class QuilTranslationError(Exception):
+    """Raised when a circuit cannot be translated directly to Quil."""
+
+
+_GateFactory = Callable[[List[QuilParameter], List[int]], Gate]
+
+_GATES: Dict[str, _GateFactory] = {
+    "id": lambda p, q: I(q[0]),
+    "x": lambda p, q: X(q[0]),
+    "y": lambda p, q: Y(q[0]),
+    "z": lambda p, q: Z(q[0]),
+    "h": lambda p, q: H(q[0]),
+    "s": lambda p, q: S(q[0]),
+    "sdg": lambda p, q: S(q[0]).dagger(),
+    "t": lambda p, q: T(q[0]),
+    "tdg": lambda p, q: T(q[0]).dagger(),
+    "sx": lambda p, q: RX(np.pi / 2, q[0]),
+    "sxdg": lambda p, q: RX(-np.pi / 2, q[0]),
+    "rx": lambda p, q: RX(p[0], q[0]),
+    "ry": lambda p, q: RY(p[0], q[0]),
+    "rz": lambda p, q: RZ(p[0], q[0]),
+    "p": lambda p, q: PHASE(p[0], q[0]),
+    "u1": lambda p, q: PHASE(p[0], q[0]),
+    "cx": lambda p, q: CNOT(q[0], q[1]),
+    "cy": lambda p, q: Y(q[1]).controlled(q[0]),
+    "cz": lambda p, q: CZ(q[0], q[1]),
+    "ch": lambda p, q: H(q[1]).controlled(q[0]),
+    "cp": lambda p, q: CPHASE(p[0], q[0], q[1]),
+    "cu1": lambda p, q: CPHASE(p[0], q[0], q[1]),
+    "crx": lambda p, q: RX(p[0], q[1]).controlled(q[0]),
+    "cry": lambda p, q: RY(p[0], q[1]).controlled(q[0]),
+    "crz": lambda p, q: RZ(p[0], q[1]).controlled(q[0]),
+    "swap": lambda p, q: SWAP(q[0], q[1]),
+    "iswap": lambda p, q: ISWAP(q[0], q[1]),
+    "ccx": lambda p, q: CCNOT(q[0], q[1], q[2]),
+    "cswap": lambda p, q: CSWAP(q[0], q[1], q[2]),
+}
+
+# U(theta, phi, lambda) = RZ(phi) RY(theta) RZ(lambda), up to global phase
+_EULER_GATES = {"u", "u3", "u2"}
+
+# QuilCircuit gates are unitaries built from pyquil's matrices, so their angle can be recovered from a single entry.
+# Qiskit orders a unitary's qubits least-significant first and Quil most-significant first, so qubits are reversed.
+_QUIL_GATES: Dict[type, Callable[[np.ndarray, List[int]], Gate]] = {
+    XYGate: lambda m, q: XY(2 * np.arctan2(m[1, 2].imag, m[1, 1].real), q[1], q[0]),
+    PSwapGate: lambda m, q: PSWAP(np.angle(m[1, 2]), q[1], q[0]),
+    CPhase00Gate: lambda m, q: CPHASE00(np.angle(m[0, 0]), q[1], q[0]),
+    CPhase01Gate: lambda m, q: CPHASE01(np.angle(m[1, 1]), q[1], q[0]),
+    CPhase10Gate: lambda m, q: CPHASE10(np.angle(m[2, 2]), q[1], q[0]),
+}
+
+
+def circuit_to_program(circuit: QuantumCircuit, parameters: Optional[Sequence[Parameter]] = None) -> Program:
+    """
+    Translate a prepared circuit (one measuring into a single register) directly to a Quil program, without an
+    OpenQASM round trip. The register measured into is emitted as Quil's ``ro`` register, whatever its name.
+
+    Standard Quil gates added by :class:`QuilCircuit` are emitted as themselves, other unitaries as ``DEFGATE``s, and
+    barriers as ``FENCE``s on the same qubits.
+
+    Args:
+        circuit: Circuit to translate.
+        parameters: Unbound circuit parameters to read from the :data:`PARAMETER_REGION` memory region, in the order
+            their values will be written to it. Must cover all of the circuit's unbound parameters.
+
+    Raises:
+        QuilTranslationError: If the circuit uses an instruction that cannot be translated.
+    """
+    return circuits_to_program([circuit], parameters=parameters)
+
+
+def circuits_to_program(
+    circuits: Sequence[QuantumCircuit],
+    layouts: Optional[Sequence[Sequence[int]]] = None,
+    parameters: Optional[Sequence[Parameter]] = None,
+    *,
+    reset_between: bool = False,
+) -> Program:
+    """
+    Translate several prepared circuits into one Quil program, as :func:`circuit_to_program` does for one. The
+    program's ``ro`` register is the concatenation of the circuits' readout registers, in order (see
+    :func:`readout_size`).
+
+    Args:
+        circuits: Circuits to translate.
+        layouts: For each circuit, the qubit on which to place each of its qubits. If not provided, circuits are
+            placed on qubits with the same indices as their own.
+        parameters: Unbound circuit parameters to read from the :data:`PARAMETER_REGION` memory region, in the order
+            their values will be written to it. Must cover all of the circuits' unbound parameters.
+        reset_between: Whether to actively reset all qubits between consecutive circuits, so that circuits on the same
+            qubits can run one after another.
+
+    Raises:
+        QuilTranslationError: If a circuit uses an instruction that cannot be translated.
+    """
+    program = Program()
+
+    ro_sizes = [readout_size(circuit) for circuit in circuits]
+    program.declare("ro", "BIT", sum(ro_sizes))
+
+    memory: Dict[Parameter, MemoryReference] = {}
+    if parameters:
+        program.declare(PARAMETER_REGION, "REAL", len(parameters))
+        memory = {parameter: MemoryReference(PARAMETER_REGION, i) for i, parameter in enumerate(parameters)}
+
+    missing = {p for circuit in circuits for p in circuit.parameters} - set(memory)
+    if missing:
+        raise QuilTranslationError(f"Circuit has unbound parameters: {', '.join(sorted(p.name for p in missing))}")
+
+    defgates: Dict[str, DefGate] = {}
+    ro_offset = 0
+    for i, circuit in enumerate(circuits):
+        if reset_between and i > 0:
+            program += RESET()
+        layout = layouts[i] if layouts is not None else None
+        readout = readout_register(circuit)
+        ro_indices: Dict[Any, int] = {clbit: ro_offset + j for j, clbit in enumerate(readout or [])}
+        for instruction in circuit.data:
+            qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+            _append(
+                program,
+                instruction.operation,
+                qubits if layout is None else [layout[q] for q in qubits],
+                [ro_indices.get(clbit) for clbit in instruction.clbits],
+                memory,
+                defgates,
+            )
+        ro_offset += ro_sizes[i]
+
+    return program
+
+
+def readout_size(circuit: QuantumCircuit) -> int:
+    """Number of bits in the readout register of a prepared circuit (see :func:`readout_register`)."""
+    readout = readout_register(circuit)
+    return 0 if readout is None else readout.size
+
+
+def readout_register(circuit: QuantumCircuit) -> Optional[ClassicalRegister]:
+    """
+    The register a prepared circuit measures into: its only register, its register named ``ro``, or otherwise the
+    register of its first measurement. `None` if it has no registers.
+    """
+    if len(circuit.cregs) == 1:
+        return circuit.cregs[0]
+    for reg in circuit.cregs:
+        if reg.name == "ro":
+            return reg
+    for instruction in circuit.data:
+        if instruction.operation.name == "measure":
+            registers = circuit.find_bit(instruction.clbits[0]).registers
+            if registers:
+                return cast(ClassicalRegister, registers[0][0])
+    return None
+
+
+def _append(
+    program: Program,
+    operation: Instruction,
+    qubits: List[int],
+    clbits: List[Optional[int]],
+    memory: Mapping[Parameter, MemoryReference],
+    defgates: Dict[str, DefGate],
+) -> None:
+    name = operation.name
+
+    if getattr(operation, "condition", None) is not None:
+        raise QuilTranslationError(f"Classically-conditioned instruction '{name}' is not supported")
+
+    if name == "measure":
+        if clbits[0] is None:
+            raise QuilTranslationError("Measurement into a register other than the readout register")
+        program += MEASURE(qubits[0], MemoryReference("ro", clbits[0]))
+        return
+
+    if name == "reset":
+        program += RESET(qubits[0])
+        return
+
+    if name == "barrier":
+        program += Fence([Qubit(q) for q in qubits])
+        return
+
+    if name in _GATES:
+        program += _GATES[name](_to_quil_parameters(operation, memory), qubits)
+        return
+
+    if name in _EULER_GATES:
+        params = _to_quil_parameters(operation, memory)
+        theta, phi, lam = [np.pi / 2, *params] if name == "u2" else params
+        program += RZ(lam, qubits[0])
+        program += RY(theta, qubits[0])
+        program += RZ(phi, qubits[0])
+        return
+
+    if name == "xx_plus_yy":
+        # XX+YY(theta, beta) = RZ(-beta) XY(-theta) RZ(beta) on the first qubit
+        theta, beta = _to_quil_parameters(operation, memory)
+        if isinstance(beta, float) and beta == 0.0:
+            program += XY(-theta, qubits[0], qubits[1])
+        else:
+            program += RZ(beta, qubits[0])
+            program += XY(-theta, qubits[0], qubits[1])
+            program += RZ(-beta, qubits[0])
+        return
+
+    if isinstance(operation, UnitaryGate):
+        matrix = operation.to_matrix()
+        quil_gate = _QUIL_GATES.get(type(operation))
+        if quil_gate is not None:
+            program += quil_gate(matrix, qubits)
+            return
+
+        defgate = _defgate(operation, matrix)
+        if defgate.name not in defgates:
+            defgates[defgate.name] = defgate
+            program += defgate
+        program += cast(Gate, defgate.get_constructor()(*reversed(qubits)))
+        return
+
+    definition = operation.definition
+    if definition is None:
+        raise QuilTranslationError(f"Instruction '{name}' has no Quil equivalent")
+
+    for instruction in definition.data:
+        _append(
+            program,
+            instruction.operation,
+            [qubits[definition.find_bit(qubit).index] for qubit in instruction.qubits],
+            [clbits[definition.find_bit(clbit).index] for clbit in instruction.clbits],
+            memory,
+            defgates,
+        )
+
+
+def _defgate(operation: UnitaryGate, matrix: np.ndarray) -> DefGate:
+    # Name by content, so identical unitaries share one definition and distinct ones never collide
+    label = re.sub(r"\W", "_", operation.label or operation.name).upper()
+    digest = hashlib.sha256(np.ascontiguousarray(matrix, dtype=complex).tobytes()).hexdigest()[:12]
+    return DefGate(f"{label}_{digest}", matrix)
+
+
+def _to_quil_parameters(operation: Instruction, memory: Mapping[Parameter, MemoryReference]) -> List[QuilParameter]:
+    return [_to_quil_parameter(param, memory) for param in operation.params]
+
+
+def _to_quil_parameter(param: Any, memory: Mapping[Parameter, MemoryReference]) -> QuilParameter:
+    if not isinstance(param, ParameterExpression):
+        try:
+            return float(param)
+        except (TypeError, ValueError) as e:
+            raise QuilTranslationError(f"Unsupported gate parameter {param!r}") from e
+
+    if not param.parameters:
+        return float(param)
+
+    if isinstance(param, Parameter):
+        return memory[param]
+
+    symbols = {parameter.name: memory[parameter] for parameter in param.parameters}
+    return _to_quil_expression(param.sympify(), symbols)
+
+
+def _to_quil_expression(expr: Any, symbols: Mapping[str, MemoryReference]) -> QuilParameter:
+    if expr.is_Number:
+        return float(expr)
+    if expr.is_Symbol:
+        return symbols[str(expr)]
+
+    args = [_to_quil_expression(arg, symbols) for arg in expr.args]
+    if expr.is_Add:
+        result = args[0]
+        for arg in args[1:]:
+            result = result + arg
+        return result
+    if expr.is_Mul:
+        result = args[0]
+        for arg in args[1:]:
+            result = result * arg
+        return result
+    if expr.is_Pow:
+        return args[0] ** args[1]
+
+    functions = {"sin": quil_sin, "cos": quil_cos, "exp": quil_exp}
+    function = functions.get(type(expr).__name__)
+    if function is None or len(args) != 1:
+        raise QuilTranslationError(f"Unsupported parameter expression {expr}")
+    return function(args[0])
@@ -0,0 +1,148 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple, Union
+
+from pyquil.external.rpcq import CompilerISA, GateInfo, MeasureInfo
+from qiskit.circuit import Instruction, Measure, Parameter
+from qiskit.circuit.library import (
+    CPhaseGate,
+    CZGate,
+    IGate,
+    RZGate,
+    SXdgGate,
+    SXGate,
+    XXPlusYYGate,
+    iSwapGate,
+)
+from qiskit.transpiler import InstructionProperties, Target
+
+_MAX_TARGETS = 64
+_targets: "OrderedDict[str, Target]" = OrderedDict()
+_targets_lock = Lock()
+
+_Qargs = Tuple[int, ...]
+
+
+def get_target(compiler_isa: CompilerISA, num_qubits: int) -> Target:
+    """
+    Get the :class:`Target` describing a compiler ISA, building it only once per distinct ISA.
+
+    Args:
+        compiler_isa: ISA of the quantum computer, e.g. from ``qc.quantum_processor.to_compiler_isa()``.
+        num_qubits: Minimum number of qubits in the target.
+    """
+    isa = json.dumps(compiler_isa.dict(), sort_keys=True, default=str)  # type: ignore[no-untyped-call]
+    key = hashlib.sha256(f"{num_qubits}\n{isa}".encode()).hexdigest()
+    with _targets_lock:
+        target = _targets.get(key)
+        if target is not None:
+            _targets.move_to_end(key)
+            return target
+
+    target = build_target(compiler_isa, num_qubits)
+    with _targets_lock:
+        _targets[key] = target
+        while len(_targets) > _MAX_TARGETS:
+            _targets.popitem(last=False)
+    return target
+
+
+def build_target(compiler_isa: CompilerISA, num_qubits: int) -> Target:
+    """
+    Build a :class:`Target` containing the gates a compiler ISA implements natively, on each live qubit and edge, with
+    their durations and errors. Every gate maps back to a native Quil gate, so circuits transpiled to this target need
+    little or no work from quilc.
+    """
+    instructions: Dict[str, Tuple[Instruction, Dict[_Qargs, Optional[InstructionProperties]]]] = {}
+    max_qubit = num_qubits - 1
+
+    for qubit in compiler_isa.qubits.values():
+        if qubit.dead:
+            continue
+        max_qubit = max(max_qubit, qubit.id)
+        for gate in qubit.gates:
+            instruction = _to_instruction(gate)
+            if instruction is not None:
+                _add(instructions, instruction, (qubit.id,), gate)
+
+    for edge in compiler_isa.edges.values():
+        if edge.dead:
+            continue
+        for gate in edge.gates:
+            instruction = _to_instruction(gate)
+            if instruction is not None:
+                # Native two-qubit gates are symmetric, so are available in both directions
+                a, b = edge.ids
+                _add(instructions, instruction, (a, b), gate)
+                _add(instructions, instruction, (b, a), gate)
+
+    target = Target(num_qubits=max_qubit + 1)
+    for instruction, properties in instructions.values():
+        target.add_instruction(instruction, properties)
+    return target
+
+
+def _to_instruction(gate: Union[GateInfo, MeasureInfo]) -> Optional[Instruction]:
+    if isinstance(gate, MeasureInfo):
+        # Measurements are listed both with and without a classical target; either way they map to one instruction
+        return Measure()
+
+    if gate.operator == "RX":
+        angle = float(gate.parameters[0])
+        if math.isclose(angle, math.pi / 2):
+            return SXGate()
+        if math.isclose(angle, -math.pi / 2):
+            return SXdgGate()
+        return None  # RX(0) is covered by I, and RX(pi) by two SX gates
+    if gate.operator == "RZ":
+        return RZGate(Parameter("theta"))
+    if gate.operator == "I":
+        return IGate()
+    if gate.operator == "CZ":
+        return CZGate()
+    if gate.operator == "CPHASE":
+        return CPhaseGate(Parameter("theta"))
+    if gate.operator == "XY":
+        return XXPlusYYGate(Parameter("theta"), Parameter("beta"))
+    if gate.operator == "ISWAP":
+        return iSwapGate()
+    return None
+
+
+def _add(
+    instructions: Dict[str, Tuple[Instruction, Dict[_Qargs, Optional[InstructionProperties]]]],
+    instruction: Instruction,
+    qargs: _Qargs,
+    gate: Union[GateInfo, MeasureInfo],
+) -> None:
+    _, properties = instructions.setdefault(instruction.name, (instruction, {}))
+    if qargs in properties:
+        return
+    properties[qargs] = InstructionProperties(duration=_duration(gate), error=_error(gate))
+
+
+def _duration(gate: Any) -> Optional[float]:
+    # ISA durations are in nanoseconds, Qiskit's in seconds
+    return None if gate.duration is None else float(gate.duration) * 1e-9
+
+
+def _error(gate: Any) -> Optional[float]:
+    return None if gate.fidelity is None else max(0.0, 1.0 - float(gate.fidelity))
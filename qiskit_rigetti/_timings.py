@@ -0,0 +1,70 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict, Iterator
+
+TimingObserver = Callable[[str, int, Dict[str, float]], None]
+"""
+Called once per experiment, as soon as its result is available, with the job ID, the experiment's index within the
+job's results, and the time spent in each stage (see :class:`StageTimings`).
+"""
+
+
+class StageTimings:
+    """
+    Thread-safe accumulator of the monotonic time spent in each stage of running an experiment, in seconds:
+
+    * ``translate``: exporting the circuit to OpenQASM, or translating it to Quil.
+    * ``before_compile``: ``before_compile`` or ``before_compile_quil`` hooks.
+    * ``compile``: compiling to native Quil with quilc.
+    * ``before_execute``: ``before_execute`` hooks, and recompiling their output if ``ensure_native_quil``.
+    * ``executable``: building the executable from native Quil.
+    * ``submit``: submitting executions to the QAM.
+    * ``queue``: waiting for executions to be queued, run and their results retrieved.
+    * ``decode``: decoding readout into counts and memory.
+
+    Stages that are skipped (e.g. when an executable is found in the cache) are not recorded. Compilation stages are
+    recorded once per circuit, and shared by the circuit's experiments (e.g. one per parameter binding).
+    """
+
+    def __init__(self) -> None:
+        self._seconds: Dict[str, float] = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the time spent in the ``with`` block against stage ``name``."""
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, monotonic() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to stage ``name``, which accumulates over repeated stages (e.g. chunks of shots)."""
+        with self._lock:
+            self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+
+    def copy(self) -> "StageTimings":
+        timings = StageTimings()
+        timings._seconds = self.as_dict()
+        return timings
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._seconds)
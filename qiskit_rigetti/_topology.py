@@ -0,0 +1,128 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from collections import deque
+from threading import Lock
+from typing import Dict, FrozenSet, List, Sequence, Set, Tuple
+
+import numpy as np
+from qiskit.transpiler import CouplingMap
+
+
+class Topology:
+    """
+    Precomputed, read-only index of a backend's qubit connectivity, built once per coupling map so that repeated
+    transpilation and layout decisions skip the graph work.
+    """
+
+    def __init__(self, edges: Sequence[Tuple[int, int]]) -> None:
+        """
+        Args:
+            edges: Directed coupling map edges, as in :attr:`QasmBackendConfiguration.coupling_map`.
+        """
+        self._edges = [(a, b) for a, b in edges]
+        self._coupling_map = CouplingMap([list(edge) for edge in self._edges])
+        self._coupling_map.compute_distance_matrix()
+
+        # The coupling map also has isolated qubits filling any gaps in the indices, which are not really there
+        neighbors: Dict[int, Set[int]] = {qubit: set() for edge in self._edges for qubit in edge}
+        for a, b in self._edges:
+            neighbors[a].add(b)
+            neighbors[b].add(a)
+        self._neighbors = {qubit: tuple(sorted(adjacent)) for qubit, adjacent in neighbors.items()}
+
+        self._components: List[FrozenSet[int]] = []
+        self._component_of: Dict[int, int] = {}
+        for qubit in sorted(self._neighbors):
+            if qubit in self._component_of:
+                continue
+            component = frozenset(self._breadth_first(qubit))
+            for member in component:
+                self._component_of[member] = len(self._components)
+            self._components.append(component)
+
+        self._regions: Dict[int, List[Tuple[int, ...]]] = {}
+        self._regions_lock = Lock()
+
+    @property
+    def edges(self) -> List[Tuple[int, int]]:
+        """Directed coupling map edges this topology was built from."""
+        return list(self._edges)
+
+    @property
+    def coupling_map(self) -> CouplingMap:
+        """Coupling map, with its distance matrix already computed. Must not be modified."""
+        return self._coupling_map
+
+    @property
+    def distance_matrix(self) -> np.ndarray:
+        """All-pairs shortest path lengths between physical qubits, ignoring edge direction (`inf` if disconnected)."""
+        distance_matrix: np.ndarray = self._coupling_map.distance_matrix
+        return distance_matrix
+
+    @property
+    def neighbors(self) -> Dict[int, Tuple[int, ...]]:
+        """Qubits adjacent to each qubit in the coupling map edges, ignoring edge direction."""
+        return self._neighbors
+
+    @property
+    def components(self) -> List[FrozenSet[int]]:
+        """Connected components of the coupling map edges, ordered by their lowest qubit."""
+        return self._components
+
+    def component_of(self, qubit: int) -> int:
+        """Index into :attr:`components` of the component containing ``qubit``."""
+        return self._component_of[qubit]
+
+    def distance(self, qubit1: int, qubit2: int) -> float:
+        """Shortest path length between two qubits, ignoring edge direction (`inf` if disconnected)."""
+        return float(self.distance_matrix[qubit1, qubit2])
+
+    def regions(self, size: int) -> List[Tuple[int, ...]]:
+        """
+        Compact connected regions of ``size`` qubits: for each qubit, the ``size`` qubits nearest to it (breadth-first,
+        lowest index first). Regions are sorted and de-duplicated, and computed once per size.
+        """
+        if size <= 0:
+            return []
+
+        with self._regions_lock:
+            regions = self._regions.get(size)
+            if regions is None:
+                found = set()
+                for root in sorted(self._neighbors):
+                    if len(self._components[self._component_of[root]]) < size:
+                        continue
+                    region = []
+                    for qubit in self._breadth_first(root):
+                        region.append(qubit)
+                        if len(region) == size:
+                            break
+                    found.add(tuple(sorted(region)))
+                regions = self._regions[size] = sorted(found)
+            return regions
+
+    def _breadth_first(self, root: int) -> List[int]:
+        visited = {root}
+        order = []
+        queue = deque([root])
+        while queue:
+            qubit = queue.popleft()
+            order.append(qubit)
+            for adjacent in self._neighbors[qubit]:
+                if adjacent not in visited:
+                    visited.add(adjacent)
+                    queue.append(adjacent)
+        return order
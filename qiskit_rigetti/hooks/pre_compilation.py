@@ -1,8 +1,15 @@
 from typing import Callable
 
+from pyquil import Program
+from pyquil.quilbase import Pragma
+
 PreCompilationHook = Callable[[str], str]
 """Represents a function that can transform a QASM program string just before compilation."""
 
+QuilPreCompilationHook = Callable[[Program], Program]
+"""Represents a function that can transform a Quil program, translated directly from a circuit, just before
+compilation."""
+
 
 def set_rewiring(rewiring: str) -> PreCompilationHook:
     """
@@ -34,3 +41,36 @@ def set_rewiring(rewiring: str) -> PreCompilationHook:
         return qasm.replace("OPENQASM 2.0;", f'OPENQASM 2.0;\n#pragma INITIAL_REWIRING "{rewiring}";')
 
     return fn
+
+
+def set_quil_rewiring(rewiring: str) -> QuilPreCompilationHook:
+    """
+    Create a hook which will apply rewiring before compilation of a directly-translated Quil program. This is the
+    ``before_compile_quil`` equivalent of :func:`set_rewiring`.
+
+    See: https://pyquil-docs.rigetti.com/en/stable/compiler.html#initial-rewiring for more information.
+
+    Args:
+        rewiring: Rewiring directive to apply.
+
+    Returns:
+        QuilPreCompilationHook: A hook to apply rewiring.
+
+    Examples:
+        Applying rewiring to a program::
+
+            >>> from qiskit import execute
+            >>> from qiskit_rigetti import RigettiQCSProvider, QuilCircuit
+            >>> from qiskit_rigetti.hooks.pre_compilation import set_quil_rewiring
+
+            >>> p = RigettiQCSProvider()
+            >>> backend = p.get_simulator(num_qubits=2, noisy=True)
+            >>> circuit = QuilCircuit(2, 2)
+            >>> _ = circuit.measure([0, 1], [0, 1])
+            >>> job = execute(circuit, backend, shots=10, before_compile_quil=[set_quil_rewiring("NAIVE")])
+    """
+
+    def fn(quil: Program) -> Program:
+        return quil.prepend_instructions([Pragma("INITIAL_REWIRING", freeform_string=rewiring)])
+
+    return fn
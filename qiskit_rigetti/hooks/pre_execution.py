@@ -4,7 +4,10 @@ from pyquil import Program
 from pyquil.gates import RESET
 
 PreExecutionHook = Callable[[Program], Program]
-"""Represents a function that can transform a Quil program just before execution."""
+"""
+Represents a function that can transform a Quil program just before execution. Executables are only cached for hooks
+with a ``cache_key`` attribute, declaring that the hook's output depends only on its input, code, state and that key.
+"""
 
 
 def enable_active_reset(quil: Program) -> Program:
@@ -20,3 +23,6 @@ def enable_active_reset(quil: Program) -> Program:
         Copy of the input program, with active reset enabled.
     """
     return quil.prepend_instructions([RESET()])
+
+
+enable_active_reset.cache_key = "enable_active_reset"  # type: ignore[attr-defined]
@@ -0,0 +1,66 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import json
+import time
+
+from qcs_sdk.qpu.isa import InstructionSetArchitecture
+
+from qiskit_rigetti import DiscoveryCache
+
+
+def test_get__round_trip(tmp_path):
+    cache = DiscoveryCache(tmp_path)
+    isa = InstructionSetArchitecture.from_raw(
+        json.dumps(
+            {
+                "architecture": {"nodes": [{"node_id": 0}, {"node_id": 1}], "edges": [{"node_ids": [0, 1]}]},
+                "benchmarks": [],
+                "instructions": [],
+                "name": "Device-2",
+            }
+        )
+    )
+
+    assert cache.get_quantum_computers() is None
+    assert cache.get_isa("Device-2") is None
+    assert cache.get_coupling_map("Device-2") is None
+
+    cache.put_quantum_computers(["Device-2"])
+    cache.put_isa("Device-2", isa)
+    cache.put_coupling_map("Device-2", [(0, 1), (1, 0)])
+
+    other = DiscoveryCache(tmp_path / DiscoveryCache.FILENAME)
+    assert other.get_quantum_computers() == ["Device-2"]
+    assert other.get_isa("Device-2").json() == isa.json()
+    assert other.get_coupling_map("Device-2") == [(0, 1), (1, 0)]
+
+
+def test_get__stale(tmp_path, monkeypatch):
+    cache = DiscoveryCache(tmp_path, ttl=60)
+    cache.put_quantum_computers(["Device-1"])
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    assert cache.get_quantum_computers() is None
+
+
+def test_clear(tmp_path):
+    cache = DiscoveryCache(tmp_path)
+    cache.put_quantum_computers(["Device-1"])
+    cache.clear()
+
+    assert cache.get_quantum_computers() is None
@@ -0,0 +1,177 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from functools import partial
+
+from pyquil import Program
+
+from qiskit_rigetti import ExecutableCache, ExecutableStore
+from qiskit_rigetti._executable_cache import executable_cache_key
+from qiskit_rigetti.hooks.pre_execution import enable_active_reset
+
+
+def test_get__miss_then_hit():
+    cache = ExecutableCache()
+    program = Program("DECLARE ro BIT[1]")
+
+    assert cache.get("key") is None
+    cache.put("key", program)
+    assert cache.get("key") is program
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.evictions == 0
+    assert len(cache) == 1
+
+
+def test_put__evicts_least_recently_used():
+    cache = ExecutableCache(max_size=2)
+    cache.put("a", Program())
+    cache.put("b", Program())
+    cache.get("a")
+    cache.put("c", Program())
+
+    assert cache.get("b") is None, "least-recently used entry not evicted"
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_put__disabled():
+    cache = ExecutableCache(max_size=0)
+    cache.put("a", Program())
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_clear():
+    cache = ExecutableCache()
+    cache.put("a", Program())
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+
+
+def test_get__falls_back_to_store(tmp_path):
+    store = ExecutableStore(tmp_path)
+    program = Program("DECLARE ro BIT[1]").wrap_in_numshots_loop(10)
+    ExecutableCache(store=store).put("key", program, name="qc", fingerprint="isa")
+
+    cache = ExecutableCache(store=ExecutableStore(tmp_path))  # e.g. another process sharing the store
+    cached = cache.get("key")
+
+    assert cached == program
+    assert cached.num_shots == 10
+    assert cache.hits == 1
+    assert len(cache) == 1, "store hit not remembered in memory"
+
+
+def test_store__path(tmp_path):
+    assert ExecutableStore(tmp_path).path == str(tmp_path / ExecutableStore.FILENAME)
+    assert ExecutableStore(tmp_path / "custom.db").path == str(tmp_path / "custom.db")
+
+
+def test_store__put_invalidates_other_fingerprints(tmp_path):
+    store = ExecutableStore(tmp_path)
+    store.put("a", Program(), name="qc", fingerprint="isa-1")
+    store.put("b", Program(), name="other-qc", fingerprint="isa-1")
+
+    store = ExecutableStore(tmp_path)
+    store.put("c", Program(), name="qc", fingerprint="isa-2")
+
+    assert store.get("a") is None, "executable compiled against previous ISA not invalidated"
+    assert store.get("b") is not None
+    assert store.get("c") is not None
+    assert len(store) == 2
+
+    store.clear()
+    assert len(store) == 0
+
+
+def test_executable_cache_key():
+    def key(**overrides):
+        return executable_cache_key(
+            **{"source": "OPENQASM 2.0;", "shots": 10, "hooks": [], "fingerprint": "qc", **overrides}
+        )
+
+    assert key() == key(), "key not deterministic"
+    assert key() != key(source="OPENQASM 2.0;\n")
+    assert key() != key(shots=11)
+    assert key() != key(fingerprint="other-qc")
+    assert key() != key(hooks=[enable_active_reset])
+    assert key(hooks=[enable_active_reset]) == key(hooks=[enable_active_reset])
+    assert key() != key(ensure_native_quil=True)
+
+
+class _TaggingHook:
+    cache_key = 1
+
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+
+    def __call__(self, program: Program) -> Program:
+        return program
+
+
+class _SlotsHook:
+    __slots__ = ("tag",)
+    cache_key = 1
+
+    def __call__(self, program: Program) -> Program:
+        return program
+
+
+def _tagging_hook(program: Program, *, tag: str) -> Program:
+    return program
+
+
+def _cacheable(hook, cache_key=1):
+    hook.cache_key = cache_key
+    return hook
+
+
+THETA = 0.1
+
+
+def _global_hook(program: Program) -> Program:
+    return program if THETA else Program()
+
+
+def test_executable_cache_key__hook_state():
+    def key(hook):
+        return executable_cache_key(source="OPENQASM 2.0;", shots=10, hooks=[hook], fingerprint="qc")
+
+    assert key(_cacheable(partial(_tagging_hook, tag="A"))) == key(_cacheable(partial(_tagging_hook, tag="A")))
+    assert key(_cacheable(partial(_tagging_hook, tag="A"))) != key(_cacheable(partial(_tagging_hook, tag="B")))
+    assert key(_TaggingHook("A")) == key(_TaggingHook("A"))
+    assert key(_TaggingHook("A")) != key(_TaggingHook("B"))
+    assert key(_cacheable(lambda p, tag="A": p)) != key(_cacheable(lambda p, tag="B": p))
+    assert key(_cacheable(lambda p, *, tag="A": p)) != key(_cacheable(lambda p, *, tag="B": p))
+    assert key(_SlotsHook()) is None, "hook without inspectable state should not be cacheable"
+    assert (
+        key(_cacheable(partial(_tagging_hook, tag=object()))) is None
+    ), "hook with opaque state should not be cacheable"
+
+
+def test_executable_cache_key__hook_opt_in():
+    def key(hook):
+        return executable_cache_key(source="OPENQASM 2.0;", shots=10, hooks=[hook], fingerprint="qc")
+
+    assert key(_global_hook) is None, "hook reading globals cached without opting in"
+    assert key(partial(_tagging_hook, tag="A")) is None, "hook cached without opting in"
+    assert key(_cacheable(_global_hook, "a")) != key(_cacheable(_global_hook, "b"))
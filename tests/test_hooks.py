@@ -1,6 +1,6 @@
 from pyquil import Program
 
-from qiskit_rigetti.hooks.pre_compilation import set_rewiring
+from qiskit_rigetti.hooks.pre_compilation import set_rewiring, set_quil_rewiring
 from qiskit_rigetti.hooks.pre_execution import enable_active_reset
 
 
@@ -24,6 +24,22 @@ def test_set_rewiring():
     )
 
 
+def test_set_quil_rewiring():
+    hook = set_quil_rewiring("NAIVE")
+    quil = Program(
+        "DECLARE ro BIT[2]",
+        "H 0",
+    )
+
+    new_quil = hook(quil)
+
+    assert new_quil == Program(
+        "DECLARE ro BIT[2]",
+        'PRAGMA INITIAL_REWIRING "NAIVE"',
+        "H 0",
+    )
+
+
 def test_enable_active_reset():
     hook = enable_active_reset
     quil = Program(
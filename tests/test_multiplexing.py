@@ -0,0 +1,66 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from qiskit_rigetti import Topology
+from qiskit_rigetti._multiplexing import Placement, pack_circuits
+
+
+def test_pack_circuits():
+    topology = line(10)
+
+    groups = pack_circuits([2, 2, 2, 3], topology)
+
+    assert groups == [
+        [Placement(0, (0, 1)), Placement(1, (3, 4)), Placement(2, (6, 7))],
+        [Placement(3, (0, 1, 2))],
+    ]
+
+
+def test_pack_circuits__crosstalk_distance():
+    topology = line(10)
+
+    assert pack_circuits([2, 2, 2, 3], topology, crosstalk_distance=1) == [
+        [Placement(0, (0, 1)), Placement(1, (2, 3)), Placement(2, (4, 5)), Placement(3, (6, 7, 8))]
+    ]
+    assert pack_circuits([2, 2], topology, crosstalk_distance=4) == [[Placement(0, (0, 1)), Placement(1, (5, 6))]]
+
+
+def test_pack_circuits__first_fit():
+    topology = line(7)
+
+    groups = pack_circuits([4, 2, 2], topology)
+
+    assert groups == [[Placement(0, (0, 1, 2, 3)), Placement(1, (5, 6))], [Placement(2, (0, 1))]]
+
+
+def test_pack_circuits__too_large():
+    topology = line(4)
+
+    groups = pack_circuits([2, 6, 1], topology)
+
+    assert groups == [[Placement(0, (0, 1)), Placement(2, (3,))], [Placement(1, (0, 1, 2, 3, 4, 5))]]
+
+
+def test_pack_circuits__disconnected():
+    # Two components, 0-1-2 and 3-4-5-6
+    topology = Topology([(0, 1), (1, 2), (3, 4), (4, 5), (5, 6)])
+
+    groups = pack_circuits([3, 3], topology)
+
+    assert groups == [[Placement(0, (0, 1, 2)), Placement(1, (3, 4, 5))]]
+
+
+def line(num_qubits: int) -> Topology:
+    return Topology([(q, q + 1) for q in range(num_qubits - 1)])
@@ -0,0 +1,62 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from unittest.mock import MagicMock
+
+import networkx as nx
+import pytest
+from pyquil import Program
+from pyquil.quantum_processor import NxQuantumProcessor
+
+from qiskit_rigetti._native_quil import is_native_program
+
+
+@pytest.mark.parametrize(
+    "instructions",
+    [
+        ["RX(pi/2) 0", "RX(-pi/2) 1", "RZ(0.123) 2"],
+        ["CZ 1 0", "CZ 1 2", "XY(0.5) 0 1"],
+        ["DECLARE theta REAL[1]", "RZ(theta[0]) 0"],
+        ["RESET", "FENCE 0 1", 'PRAGMA INITIAL_REWIRING "NAIVE"', "MEASURE 2 ro[0]"],
+    ],
+)
+def test_is_native_program(instructions):
+    program = Program("DECLARE ro BIT[1]", *instructions)
+
+    assert is_native_program(program, make_qc())
+
+
+@pytest.mark.parametrize(
+    "instructions",
+    [
+        ["H 0"],
+        ["RX(0.5) 0"],
+        ["DECLARE theta REAL[1]", "RX(theta[0]) 0"],
+        ["CZ 0 2"],
+        ["DAGGER RZ(0.5) 0"],
+        ["CCNOT 0 1 2"],
+        ["RX(pi/2) 3"],
+    ],
+)
+def test_is_native_program__not_native(instructions):
+    program = Program("DECLARE ro BIT[1]", *instructions)
+
+    assert not is_native_program(program, make_qc())
+
+
+def make_qc() -> MagicMock:
+    qc = MagicMock()
+    qc.quantum_processor = NxQuantumProcessor(nx.Graph([(0, 1), (1, 2)]))
+    return qc
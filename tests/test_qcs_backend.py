@@ -13,13 +13,19 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
+import asyncio
+import json
+
 import pytest
+from qcs_sdk.qpu.isa import InstructionSetArchitecture
 from qiskit import execute, QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
 from qiskit.providers import JobStatus
 from qiskit.circuit import Parameter, Qubit
 from qiskit.circuit.library import CZGate
 
 from qiskit_rigetti import RigettiQCSProvider, RigettiQCSBackend, QuilCircuit
+from qiskit_rigetti._qcs_backend import _prepare_circuit
+from qiskit_rigetti._qcs_provider import _configuration
 from qiskit_rigetti.gates import XYGate
 
 
@@ -37,6 +43,30 @@ def test_run(backend: RigettiQCSBackend):
     assert result.get_counts().keys() == {"00"}
 
 
+def test_run__executable_cache(backend: RigettiQCSBackend):
+    circuit = make_circuit()
+
+    execute(circuit, backend, shots=10).result()
+    execute(circuit, backend, shots=10).result()
+
+    assert backend.executable_cache.misses == 1
+    assert backend.executable_cache.hits == 1
+
+
+def test_run_async(backend: RigettiQCSBackend):
+    circuit = make_circuit()
+
+    async def run():
+        job = await backend.run_async(circuit, shots=10)
+        return job, await job.result_async()
+
+    job, result = asyncio.run(run())
+
+    assert job.backend() is backend
+    assert job.status() == JobStatus.DONE
+    assert result.get_counts().keys() == {"00"}
+
+
 def test_run__multiple_circuits(backend: RigettiQCSBackend):
     circuit1 = make_circuit(num_qubits=2)
     circuit2 = make_circuit(num_qubits=3)
@@ -157,6 +187,41 @@ def test_run__no_measurments(backend: RigettiQCSBackend):
         execute(circuit, backend, shots=10)
 
 
+def test_prepare_circuit__not_modified():
+    readout = ClassicalRegister(2, "not_ro")
+    circuit = QuantumCircuit(QuantumRegister(2, "q"), ClassicalRegister(2, "c"), readout)
+    circuit.measure([0, 1], [readout[0], readout[1]])
+    qasm_before = circuit.qasm()
+
+    assert _prepare_circuit(circuit).qasm() == qasm_before
+    assert circuit.qasm() == qasm_before, "should not modify original circuit"
+
+
+def test_prepare_circuit__snapshot():
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(2, 2)
+    circuit.rx(theta, 0)
+    circuit.measure([0, 1], [0, 1])
+
+    prepared = _prepare_circuit(circuit)
+    circuit.assign_parameters({theta: 0.5}, inplace=True)
+    circuit.x(1)
+    circuit.data.pop(0)
+
+    assert [instruction.operation.name for instruction in prepared.data] == ["rx", "measure", "measure"]
+    assert prepared.parameters == {theta}, "parameters bound in place in the job's circuit"
+    assert prepared.cregs == circuit.cregs
+
+
+def test_prepare_circuit__readout_conflicts_with_ro():
+    readout = ClassicalRegister(2, "c")
+    circuit = QuantumCircuit(QuantumRegister(2, "q"), ClassicalRegister(2, "ro"), readout)
+    circuit.measure([0, 1], [readout[0], readout[1]])
+
+    with pytest.raises(RuntimeError, match="Readout register c conflicts with another register named ro"):
+        _prepare_circuit(circuit)
+
+
 def test_run__backend_coupling_map():
     backend = RigettiQCSProvider().get_simulator(num_qubits=3)
     assert backend.configuration().coupling_map
@@ -164,6 +229,87 @@ def test_run__backend_coupling_map():
     assert [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1)] == sorted(backend.coupling_map.get_edges())
 
 
+def test_coupling_map__cached(mocker):
+    configuration = _configuration("Device", num_qubits=3, local=False, simulator=False)
+    configuration.coupling_map = [(0, 1), (1, 0), (1, 2), (2, 1)]
+    backend = RigettiQCSBackend(
+        compiler_timeout=1.0,
+        execution_timeout=1.0,
+        client_configuration=mocker.MagicMock(),
+        backend_configuration=configuration,
+        provider=None,
+    )
+
+    coupling_map = backend.coupling_map
+
+    assert backend.coupling_map is coupling_map, "coupling map rebuilt"
+    assert coupling_map.distance(0, 2) == 2
+    assert backend.topology.neighbors[1] == (0, 2)
+
+    configuration.coupling_map = [(0, 1), (1, 0)]
+    assert backend.coupling_map is not coupling_map, "coupling map not rebuilt after change"
+    assert backend.coupling_map.get_edges() == [(0, 1), (1, 0)]
+
+
+def test_as_backend_v2(mocker):
+    configuration = _configuration("Device-2", num_qubits=2, local=False, simulator=False)
+    backend = RigettiQCSBackend(
+        compiler_timeout=1.0,
+        execution_timeout=1.0,
+        client_configuration=mocker.MagicMock(),
+        backend_configuration=configuration,
+        provider=None,
+        isa=InstructionSetArchitecture.from_raw(
+            json.dumps(
+                {
+                    "architecture": {"nodes": [{"node_id": 0}, {"node_id": 1}], "edges": [{"node_ids": [0, 1]}]},
+                    "benchmarks": [],
+                    "instructions": [
+                        {
+                            "name": name,
+                            "node_count": len(sites[0]),
+                            "parameters": [],
+                            "arguments": ["_"] * len(sites[0]),
+                            "sites": [{"node_ids": site, "characteristics": []} for site in sites],
+                            "characteristics": [],
+                        }
+                        for name, sites in [("RX", [[0], [1]]), ("RZ", [[0], [1]]), ("CZ", [[0, 1]])]
+                    ],
+                    "name": "Device-2",
+                }
+            )
+        ),
+    )
+
+    backend_v2 = backend.as_backend_v2()
+
+    assert backend_v2.name == "Device-2"
+    assert backend_v2.backend_v1 is backend
+    assert backend_v2.target is backend.target
+    assert set(backend_v2.target.qargs_for_operation_name("cz")) == {(0, 1), (1, 0)}
+    assert backend_v2.target["sx"][(0,)].duration == pytest.approx(50e-9)
+    assert backend_v2.target["cz"][(0, 1)].error == pytest.approx(1 - 0.89)
+    assert backend._qc is None, "quantum computer loaded to build target"
+    assert backend_v2.max_circuits is None, "jobs limited to a number of circuits"
+    assert getattr(configuration, "max_experiments", None) is None
+
+
+def test_as_backend_v2__coupling_map(mocker):
+    configuration = _configuration("Device-3", num_qubits=3, local=False, simulator=False)
+    configuration.coupling_map = [(0, 1), (1, 0), (1, 2), (2, 1)]
+    backend = RigettiQCSBackend(
+        compiler_timeout=1.0,
+        execution_timeout=1.0,
+        client_configuration=mocker.MagicMock(),
+        backend_configuration=configuration,
+        provider=None,
+    )
+    backend_v2 = backend.as_backend_v2()
+
+    assert backend_v2.coupling_map is backend.coupling_map, "coupling map not shared with the V1 backend"
+    assert backend_v2.coupling_map.distance(0, 2) == 2
+
+
 def test_decomposition(backend: RigettiQCSBackend):
     """Test that CZGate remains after the transpile."""
     circuit = QuilCircuit(2, 2)
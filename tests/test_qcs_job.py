@@ -13,23 +13,41 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
-from typing import Optional, Any
+import asyncio
+from collections import Counter
+from functools import partial
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from threading import Event
+from time import sleep
+from typing import Optional, Any, Callable, List
+from unittest.mock import MagicMock
 
+import networkx as nx
+import numpy as np
 import pytest
 from pyquil import get_qc, Program
 from pyquil.api import QuantumComputer
+from pyquil.quantum_processor import NxQuantumProcessor
 from pytest_mock import MockerFixture
 from qiskit import QuantumRegister, ClassicalRegister
-from qiskit.providers import JobStatus
+from qiskit.circuit import Parameter
+from qiskit.providers import JobStatus, JobTimeoutError
+from qiskit.providers.models import QasmBackendConfiguration
 
-from qiskit_rigetti import RigettiQCSJob, RigettiQCSProvider, RigettiQCSBackend, QuilCircuit
+from qiskit_rigetti import RigettiQCSJob, RigettiQCSProvider, RigettiQCSBackend, QuilCircuit, ExecutableCache
+from qiskit_rigetti._qcs_job import _circuit_key, _decode_readout
+from qiskit_rigetti._qcs_provider import _configuration
+from qiskit_rigetti.gates import XYGate
+from qiskit_rigetti.hooks.pre_compilation import set_quil_rewiring
 from qiskit_rigetti.hooks.pre_execution import enable_active_reset
 
 
 def test_init__start_circuit_unsuccessful(backend: RigettiQCSBackend):
     circuit = make_circuit(num_qubits=backend.configuration().num_qubits + 1)  # Use too many qubits
+    job = make_job(backend, circuit)
     with pytest.raises(Exception):
-        make_job(backend, circuit)
+        job.result()
 
 
 def test_init__before_compile_hook(backend: RigettiQCSBackend, mocker: MockerFixture):
@@ -69,6 +87,22 @@ def test_init__before_compile_hook(backend: RigettiQCSBackend, mocker: MockerFix
     assert transpile_qasm_2_spy.call_args[0][0] == new_qasm
 
 
+def test_init__readout_not_named_ro(mock_qc: MagicMock):
+    readout = ClassicalRegister(2, "not_ro")
+    circuit = QuilCircuit(QuantumRegister(2, "q"), ClassicalRegister(1, "c"), readout)
+    circuit.x(0).c_if(readout, 1)
+    circuit.measure([0, 1], [readout[0], readout[1]])
+
+    make_mock_job(mock_qc, circuit, native_fast_path=False).result(timeout=5)
+
+    qasm = mock_qc.compiler.transpile_qasm_2.call_args.args[0]
+    assert "creg ro[2];" in qasm
+    assert "creg c[1];" in qasm
+    assert "if(ro==1) x q[0];" in qasm
+    assert "measure q[1] -> ro[1];" in qasm
+    assert "not_ro" not in qasm
+
+
 def test_init__before_execute_hook(backend: RigettiQCSBackend, mocker: MockerFixture):
     circuit = make_circuit(num_qubits=2)
     qc = get_qc(backend.configuration().backend_name)
@@ -174,12 +208,231 @@ def test_init__circuit_with_barrier(backend: RigettiQCSBackend, mocker: MockerFi
     assert transpile_qasm_2_spy.call_args[0][0] == expected_qasm
 
 
-def test_result(job: RigettiQCSJob):
-    assert job._status == JobStatus.RUNNING
-    assert job.status() == JobStatus.DONE, "Checking status did not wait for completion"
-    assert job._status == JobStatus.DONE
+def test_init__executable_cache(backend: RigettiQCSBackend, mocker: MockerFixture):
+    circuit = make_circuit(num_qubits=2)
+    qc = get_qc(backend.configuration().backend_name)
+    transpile_qasm_2_spy = mocker.spy(qc.compiler, "transpile_qasm_2")
+    native_quil_to_executable_spy = mocker.spy(qc.compiler, "native_quil_to_executable")
+    cache = ExecutableCache()
+
+    make_job(backend, circuit, qc, executable_cache=cache)
+    make_job(backend, circuit, qc, executable_cache=cache)
+
+    assert transpile_qasm_2_spy.call_count == 1, "transpile not skipped on cache hit"
+    assert native_quil_to_executable_spy.call_count == 1, "translation not skipped on cache hit"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    make_job(backend, circuit, qc, executable_cache=cache, shots=10)
+
+    assert transpile_qasm_2_spy.call_count == 2, "shot count not part of cache key"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_init__executable_cache__before_execute_hook_state(mock_qc: MagicMock):
+    def tag(program: Program, *, tag: str) -> Program:
+        return program
+
+    circuit = make_circuit(num_qubits=2)
+    cache = ExecutableCache()
+
+    def hook(tag_value: str) -> Callable[[Program], Program]:
+        tagged = partial(tag, tag=tag_value)
+        tagged.cache_key = 1
+        return tagged
+
+    make_mock_job(mock_qc, circuit, executable_cache=cache, before_execute=[hook("A")]).result(timeout=5)
+    make_mock_job(mock_qc, circuit, executable_cache=cache, before_execute=[hook("B")]).result(timeout=5)
+    make_mock_job(mock_qc, circuit, executable_cache=cache, before_execute=[hook("A")]).result(timeout=5)
+
+    assert (cache.hits, cache.misses) == (1, 2), "executable reused for a different hook"
+    assert mock_qc.compiler.native_quil_to_executable.call_count == 2
+
+
+def test_init__executable_cache__before_execute_hook_not_cacheable(mock_qc: MagicMock):
+    circuit = make_circuit(num_qubits=2)
+    cache = ExecutableCache()
+
+    for _ in range(2):
+        make_mock_job(mock_qc, circuit, executable_cache=cache, before_execute=[lambda p: p]).result(timeout=5)
+
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0), "hook without a cache_key cached"
+    assert mock_qc.compiler.native_quil_to_executable.call_count == 2
+
+
+def test_init__parameter_binds__compiled_once(backend: RigettiQCSBackend, mocker: MockerFixture):
+    theta = Parameter("theta")
+    circuit = QuilCircuit(QuantumRegister(1, "q"), ClassicalRegister(1, "ro"))
+    circuit.rx(theta, 0)
+    circuit.measure([0], [0])
+    qc = get_qc(backend.configuration().backend_name)
+    quil_to_native_quil_spy = mocker.spy(qc.compiler, "quil_to_native_quil")
+    transpile_qasm_2_spy = mocker.spy(qc.compiler, "transpile_qasm_2")
+
+    job = make_job(backend, circuit, qc, parameter_binds=[{theta: 0.0}, {theta: np.pi}])
+
+    assert quil_to_native_quil_spy.call_count == 1, "parametric circuit not compiled exactly once"
+    assert transpile_qasm_2_spy.call_count == 0
+    assert "DECLARE qiskit_params REAL[1]" in str(quil_to_native_quil_spy.call_args[0][0])
 
     result = job.result()
+    assert len(result.results) == 2
+    assert result.get_counts(0) == {"0": 1000}
+    assert result.get_counts(1) == {"1": 1000}
+
+
+def test_init__parameter_binds__before_compile_hook(backend: RigettiQCSBackend, mocker: MockerFixture):
+    theta = Parameter("theta")
+    circuit = QuilCircuit(QuantumRegister(1, "q"), ClassicalRegister(1, "ro"))
+    circuit.rx(theta, 0)
+    circuit.measure([0], [0])
+    qc = get_qc(backend.configuration().backend_name)
+    transpile_qasm_2_spy = mocker.spy(qc.compiler, "transpile_qasm_2")
+
+    job = make_job(
+        backend, circuit, qc, parameter_binds=[{theta: 0.0}, {theta: np.pi}], before_compile=[lambda qasm: qasm]
+    )
+
+    assert transpile_qasm_2_spy.call_count == 2, "QASM hooks not applied to each bound circuit"
+    assert len(job.result().results) == 2
+
+
+def test_init__direct_translation(mock_qc: MagicMock):
+    circuit = QuilCircuit(QuantumRegister(2, "q"), ClassicalRegister(2, "ro"))
+    circuit.h(0)
+    circuit.barrier()
+    circuit.xy(np.pi, 0, 1)
+    circuit.measure([0, 1], [0, 1])
+
+    make_mock_job(mock_qc, circuit, direct_translation=True, before_compile_quil=[set_quil_rewiring("NAIVE")]).result(
+        timeout=5
+    )
+
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 0, "circuit translated via QASM"
+    assert mock_qc.compiler.quil_to_native_quil.call_args[0][0] == Program(
+        "DECLARE ro BIT[2]",
+        'PRAGMA INITIAL_REWIRING "NAIVE"',
+        "H 0",
+        "FENCE 0 1",
+        f"XY({np.pi}) 1 0",
+        "MEASURE 0 ro[0]",
+        "MEASURE 1 ro[1]",
+    )
+
+
+def test_init__direct_translation__before_compile_hook(mock_qc: MagicMock):
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2), direct_translation=True, before_compile=[lambda q: q])
+
+    with pytest.raises(ValueError, match="use 'before_compile_quil' hooks instead"):
+        job.result(timeout=5)
+
+
+def test_init__native_fast_path(mock_qc: MagicMock):
+    mock_qc.quantum_processor = NxQuantumProcessor(nx.Graph([(0, 1)]))
+    native = QuilCircuit(QuantumRegister(2, "q"), ClassicalRegister(2, "ro"))
+    native.rx(np.pi / 2, 0)
+    native.rz(0.5, 1)
+    native.cz(0, 1)
+    native.measure([0, 1], [0, 1])
+
+    make_mock_job(mock_qc, native, make_circuit(num_qubits=2)).result(timeout=5)
+
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 1, "non-native circuit not compiled"
+    assert mock_qc.compiler.quil_to_native_quil.call_count == 0, "native circuit compiled"
+    assert mock_qc.compiler.native_quil_to_executable.call_args_list[0][0][0] == Program(
+        "DECLARE ro BIT[2]",
+        f"RX({np.pi / 2}) 0",
+        "RZ(0.5) 1",
+        "CZ 0 1",
+        "MEASURE 0 ro[0]",
+        "MEASURE 1 ro[1]",
+    ).wrap_in_numshots_loop(1000)
+
+    make_mock_job(mock_qc, native, native_fast_path=False).result(timeout=5)
+
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 2, "fast path not disabled"
+
+
+def test_init__max_compile_workers(backend: RigettiQCSBackend, mocker: MockerFixture):
+    circuits = []
+    for i, num_qubits in enumerate((1, 2, 3, 2, 1)):
+        circuit = QuilCircuit(
+            QuantumRegister(num_qubits, "q"), ClassicalRegister(num_qubits, "ro"), name=f"circuit-{i}"
+        )
+        circuit.h(0)
+        circuit.rz(0.1 * i, 0)  # Distinct, so that none of them is deduplicated
+        circuit.measure(range(num_qubits), range(num_qubits))
+        circuits.append(circuit)
+    qc = get_qc(backend.configuration().backend_name)
+    transpile_qasm_2_spy = mocker.spy(qc.compiler, "transpile_qasm_2")
+
+    job = RigettiQCSJob(
+        job_id="some_job",
+        circuits=circuits,
+        options={"shots": 10, "max_compile_workers": 4},
+        qc=qc,
+        backend=backend,
+        configuration=backend.configuration(),
+    )
+    result = job.result()
+
+    assert transpile_qasm_2_spy.call_count == 5
+    assert [r.header.name for r in result.results] == [c.name for c in circuits], "submission order not preserved"
+    assert [len(next(iter(result.get_counts(i)))) for i in range(5)] == [1, 2, 3, 2, 1]
+
+
+def test_init__max_compile_workers__error(backend: RigettiQCSBackend):
+    too_big = backend.configuration().num_qubits + 1
+    circuits = [make_circuit(num_qubits=2), make_circuit(num_qubits=too_big), make_circuit(num_qubits=2)]
+
+    job = RigettiQCSJob(
+        job_id="some_job",
+        circuits=circuits,
+        options={"shots": 10, "max_compile_workers": 3},
+        qc=get_qc(backend.configuration().backend_name),
+        backend=backend,
+        configuration=backend.configuration(),
+    )
+    with pytest.raises(Exception):
+        job.result()
+
+
+def test_init__max_compile_workers__earliest_error(mock_qc: MagicMock):
+    def transpile_qasm_2(qasm: str) -> Program:
+        if "x q[0];" in qasm:
+            raise RuntimeError("first")
+        if "y q[0];" in qasm:
+            raise RuntimeError("second")
+        return Program()
+
+    mock_qc.compiler.transpile_qasm_2.side_effect = transpile_qasm_2
+    circuits = [make_circuit(num_qubits=2) for _ in range(3)]
+    circuits[1].x(0)
+    circuits[2].y(0)
+
+    job = make_mock_job(mock_qc, *circuits, native_fast_path=False, max_compile_workers=3)
+
+    with pytest.raises(RuntimeError, match="first"):
+        job.result(timeout=5)
+    assert job.status() == JobStatus.ERROR
+
+
+def test_init__shared_executor(mock_qc: MagicMock):
+    released = Event()
+    mock_qc.qam.get_result.side_effect = lambda _: released.wait() and make_execution_result([[0, 0]] * 10)
+    num_threads = threading.active_count()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        jobs = [make_mock_job(mock_qc, make_circuit(num_qubits=2), shots=10, executor=executor) for _ in range(50)]
+        assert threading.active_count() <= num_threads + 2, "jobs started threads of their own"
+        released.set()
+        results = [job.result(timeout=5) for job in jobs]
+
+    assert all(result.get_counts() == {"00": 10} for result in results)
+
+
+def test_result(job: RigettiQCSJob):
+    result = job.result()
+    assert job.status() == JobStatus.DONE
 
     assert result.date == job.result().date, "Result not cached"
 
@@ -198,9 +451,636 @@ def test_result(job: RigettiQCSJob):
     assert result_0.data.counts.keys() == {"00", "01"}
 
 
+def test_result__timeout(mock_qc: MagicMock):
+    released = Event()
+    mock_qc.qam.get_result.side_effect = lambda _: released.wait() and make_execution_result([[0, 0]] * 10)
+
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2))
+
+    assert job.status() in {
+        JobStatus.INITIALIZING,
+        JobStatus.QUEUED,
+        JobStatus.RUNNING,
+    }, "status blocked or job completed early"
+    with pytest.raises(JobTimeoutError):
+        job.result(timeout=0.1)
+
+    released.set()
+    result = job.result(timeout=5)
+    assert job.status() == JobStatus.DONE
+    assert result.get_counts() == {"00": 10}
+
+
+def test_status__running(mock_qc: MagicMock):
+    retrieving = Event()
+    released = Event()
+    mock_qc.qam.get_result.side_effect = lambda _: (
+        retrieving.set() or released.wait() and make_execution_result([[0, 0]] * 10)
+    )
+
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2))
+    assert retrieving.wait(timeout=5)
+
+    assert job.status() == JobStatus.RUNNING, "status not RUNNING while the execution runs"
+    released.set()
+    job.result(timeout=5)
+    assert job.status() == JobStatus.DONE
+
+
+def test_status__error(mock_qc: MagicMock):
+    mock_qc.compiler.transpile_qasm_2.side_effect = RuntimeError("quilc unavailable")
+
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2))
+
+    with pytest.raises(RuntimeError, match="quilc unavailable"):
+        job.result(timeout=5)
+    assert job.status() == JobStatus.ERROR
+
+
+def test_status__error_while_submitting(mock_qc: MagicMock):
+    submitting = Event()
+    released = Event()
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: (
+        submitting.set() or released.wait() and executable
+    )
+
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2))
+    assert submitting.wait(timeout=5)
+    job._fail(RuntimeError("lost connection"))
+    released.set()
+
+    with pytest.raises(RuntimeError, match="lost connection"):
+        job.result(timeout=5)
+    for _ in range(50):
+        if mock_qc.qam.get_result.called:
+            break
+        sleep(0.1)
+    assert mock_qc.qam.get_result.called
+    assert job.status() == JobStatus.ERROR, "final status overwritten by a later submission"
+
+
+def test_result_async(mock_qc: MagicMock):
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2), make_circuit(num_qubits=2))
+
+    async def consume():
+        results = [r async for r in job.iter_results_async()]
+        return results, await job.result_async(timeout=5)
+
+    experiment_results, result = asyncio.run(consume())
+
+    assert len(experiment_results) == 2
+    assert [r.data.counts for r in experiment_results] == [{"00": 1000}, {"00": 1000}]
+    assert result.results == experiment_results
+
+
+def test_result_async__timeout(mock_qc: MagicMock):
+    released = Event()
+    mock_qc.qam.get_result.side_effect = lambda _: released.wait() and make_execution_result([[0, 0]] * 10)
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2))
+
+    with pytest.raises(JobTimeoutError):
+        asyncio.run(job.result_async(timeout=0.1))
+
+    released.set()
+    assert job.result(timeout=5).get_counts() == {"00": 10}, "timing out cancelled the job"
+
+
+def test_as_completed(mock_qc: MagicMock):
+    released = Event()
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: object()
+    responses = []
+
+    def get_result(response):
+        responses.append(response)
+        if len(responses) == 1:
+            released.wait()
+        return make_execution_result([[len(responses) % 2, 0]] * 10)
+
+    mock_qc.qam.get_result.side_effect = get_result
+    job = make_mock_job(mock_qc, *[make_circuit(num_qubits=2) for _ in range(3)], max_result_workers=3)
+
+    completed = job.as_completed(timeout=5)
+    later = [next(completed)[0], next(completed)[0]]
+    released.set()
+    first = next(completed)
+
+    assert sorted(later) == [1, 2]
+    assert first[0] == 0
+    assert first[1].data.counts == {"01": 10}
+    assert list(completed) == []
+    assert job.result(timeout=5).results[0] is first[1]
+
+
+def test_as_completed__timeout(mock_qc: MagicMock):
+    released = Event()
+    mock_qc.qam.get_result.side_effect = lambda _: released.wait() and make_execution_result([[0, 0]] * 10)
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2))
+
+    with pytest.raises(JobTimeoutError):
+        list(job.as_completed(timeout=0.1))
+
+    released.set()
+
+
+def test_result__max_shots(mock_qc: MagicMock):
+    # Each executable is its native program, and each response the executable that was executed
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: executable
+    mock_qc.qam.get_result.side_effect = lambda program: make_execution_result(
+        [[1, 0] if program.num_shots == 4 else [0, 0]] * program.num_shots
+    )
+    configuration = _configuration(mock_qc.name, num_qubits=2, local=True, simulator=True, max_shots=4)
+
+    result = make_mock_job(mock_qc, make_circuit(num_qubits=2), configuration=configuration, shots=10, memory=True)
+    result = result.result(timeout=5)
+
+    assert [call.args[0].num_shots for call in mock_qc.qam.execute.call_args_list] == [4, 4, 2]
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 1, "compiled once per chunk size"
+    assert result.results[0].shots == 10
+    assert result.get_counts() == {"01": 8, "00": 2}
+    assert result.get_memory() == ["01"] * 8 + ["00"] * 2
+
+
+def test_result__max_outstanding_executions(mock_qc: MagicMock):
+    released = Event()
+    submitted = []
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: submitted.append(executable) or executable
+    mock_qc.qam.get_result.side_effect = lambda _: released.wait() and make_execution_result([[0, 0]] * 10)
+
+    circuits = [make_circuit(num_qubits=2) for _ in range(5)]
+    job = make_mock_job(mock_qc, *circuits, max_outstanding_executions=2, max_result_workers=5)
+
+    with pytest.raises(JobTimeoutError):
+        job.result(timeout=0.2)
+    assert len(submitted) == 2, "more executions outstanding than max_outstanding_executions"
+
+    released.set()
+    result = job.result(timeout=5)
+    assert len(submitted) == 5
+    assert len(result.results) == 5
+
+
+def test_result__max_outstanding_executions__parameter_binds(mock_qc: MagicMock):
+    mock_qc.qam.execute_with_memory_map_batch.side_effect = lambda executable, memory_maps: [executable] * len(
+        memory_maps
+    )
+    mock_qc.qam.get_result.side_effect = lambda _: make_execution_result([[0, 0]] * 10)
+    theta = Parameter("θ")
+    circuit = make_circuit(num_qubits=2)
+    circuit.rx(theta, 0)
+
+    result = make_mock_job(
+        mock_qc,
+        circuit,
+        max_outstanding_executions=2,
+        shots=10,
+        direct_translation=True,
+        parameter_binds=[{theta: float(i)} for i in range(5)],
+    ).result(timeout=5)
+
+    batch_sizes = [len(call.args[1]) for call in mock_qc.qam.execute_with_memory_map_batch.call_args_list]
+    assert batch_sizes == [2, 2, 1]
+    assert len(result.results) == 5
+
+
+def test_result__parameter_binds__array(mock_qc: MagicMock):
+    # Each response is the executable and memory map executed, and ro[0] reads back the value of θ at that point
+    mock_qc.qam.execute_with_memory_map_batch.side_effect = lambda executable, memory_maps: [
+        (executable, memory_map) for memory_map in memory_maps
+    ]
+    mock_qc.qam.get_result.side_effect = lambda response: make_execution_result(
+        [[int(response[1]["qiskit_params"][0]), 0]] * response[0].num_shots
+    )
+    configuration = _configuration(mock_qc.name, num_qubits=2, local=True, simulator=True, max_shots=4)
+    theta = Parameter("θ")
+    circuit = make_circuit(num_qubits=2)
+    circuit.rx(theta, 0)
+    values = np.array([[0.0], [1.0], [1.0]])
+
+    result = make_mock_job(
+        mock_qc, circuit, configuration=configuration, shots=10, direct_translation=True, parameter_binds=values
+    ).result(timeout=5)
+
+    assert mock_qc.compiler.quil_to_native_quil.call_count == 1
+    memory_values = [
+        memory_map["qiskit_params"]
+        for call in mock_qc.qam.execute_with_memory_map_batch.call_args_list
+        for memory_map in call.args[1]
+    ]
+    assert all(np.shares_memory(v, values) for v in memory_values), "sweep values were copied per point"
+
+    assert len(result.results) == 1
+    readout = result.get_memory_array()
+    assert readout.shape == (3, 10, 2)
+    assert readout[:, :, 0].tolist() == [[0] * 10, [1] * 10, [1] * 10]
+    assert result.get_memory_array(packed=True).shape == (3, 10, 1)
+
+
+def test_result__parameter_binds__dict_of_arrays(mock_qc: MagicMock):
+    theta = Parameter("θ")
+    phi = Parameter("φ")
+    circuits = [make_circuit(num_qubits=2) for _ in range(2)]
+    for circuit in circuits:
+        circuit.rx(theta, 0)
+        circuit.rz(phi, 1)
+    circuits[1].h(1)
+
+    # before_compile hooks require compiling each point separately
+    result = make_mock_job(
+        mock_qc,
+        *circuits,
+        shots=1000,
+        parameter_binds={theta: np.array([0.0, 1.0, 0.0, 1.0]), phi: np.zeros(4)},
+        before_compile=[lambda qasm: qasm],
+    ).result(timeout=5)
+
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 4, "repeated points compiled more than once"
+    assert mock_qc.qam.execute.call_count == 8
+    assert [r.header.name for r in result.results] == [c.name for c in circuits]
+    assert result.get_memory_array(1).shape == (4, 1000, 2)
+
+
+@pytest.mark.parametrize(
+    "parameter_binds, message",
+    [
+        (np.zeros((3, 2)), r"must be a \(points x 1\) array"),
+        (np.zeros((3, 1, 1)), r"must be a \(points x 1\) array"),
+        ({Parameter("θ"): np.zeros(3), Parameter("φ"): np.zeros(2)}, "1-D array of the same length"),
+    ],
+)
+def test_init__parameter_binds__invalid_array(mock_qc: MagicMock, parameter_binds: Any, message: str):
+    circuit = make_circuit(num_qubits=2)
+    circuit.rx(Parameter("θ"), 0)
+
+    with pytest.raises(ValueError, match=message):
+        make_mock_job(mock_qc, circuit, parameter_binds=parameter_binds).result(timeout=5)
+
+
+def test_result__timings(mock_qc: MagicMock):
+    observed = []
+
+    job = RigettiQCSJob(
+        job_id="some_job",
+        circuits=[make_circuit(num_qubits=2), make_circuit(num_qubits=2)],
+        options={"shots": 1000},
+        qc=mock_qc,
+        backend=MagicMock(),
+        configuration=_configuration(mock_qc.name, num_qubits=2, local=True, simulator=True),
+        timing_observer=lambda job_id, experiment_idx, timings: observed.append((job_id, experiment_idx, timings)),
+    )
+    result = job.result(timeout=5)
+
+    for experiment_result in result.results:
+        timings = experiment_result.metadata["timings"]
+        assert set(timings) == {
+            "translate",
+            "before_compile",
+            "compile",
+            "before_execute",
+            "executable",
+            "submit",
+            "queue",
+            "decode",
+        }
+        assert all(seconds >= 0 for seconds in timings.values())
+    assert sorted((job_id, i) for job_id, i, _ in observed) == [("some_job", 0), ("some_job", 1)]
+    assert {i: timings for _, i, timings in observed} == {
+        i: r.metadata["timings"] for i, r in enumerate(result.results)
+    }
+
+
+def test_result__timings__observer_error(mock_qc: MagicMock):
+    def observer(*_: Any) -> None:
+        raise RuntimeError("observer failed")
+
+    job = RigettiQCSJob(
+        job_id="some_job",
+        circuits=[make_circuit(num_qubits=2)],
+        options={"shots": 1000},
+        qc=mock_qc,
+        backend=MagicMock(),
+        configuration=_configuration(mock_qc.name, num_qubits=2, local=True, simulator=True),
+        timing_observer=observer,
+    )
+
+    with pytest.warns(UserWarning, match="timing observer failed"):
+        job.wait_for_final_state(timeout=5, wait=0.01)
+    assert job.result().success is True
+
+
+def test_result__multiplexing(mock_qc: MagicMock):
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: executable
+    # Each circuit measures its first qubit as 1 and the others as 0. The 3-qubit circuit cannot be placed far enough
+    # from the first one, so it runs on its own, via OpenQASM.
+    mock_qc.qam.get_result.side_effect = lambda program: make_execution_result(
+        [[1, 0, 1, 0]] * 10 if "ro" in program.declarations else [[1, 0, 0]] * 10
+    )
+    configuration = _configuration(mock_qc.name, num_qubits=5, local=True, simulator=True)
+    configuration.coupling_map = [(q, q + 1) for q in range(4)]
+    circuits = [make_circuit(num_qubits=2), make_circuit(num_qubits=3), make_circuit(num_qubits=2)]
+    circuits[2].name = "circuit-2"
+
+    result = make_mock_job(
+        mock_qc, *circuits, configuration=configuration, shots=10, multiplexing=True, native_fast_path=False
+    ).result(timeout=5)
+
+    assert mock_qc.compiler.quil_to_native_quil.call_count == 1, "circuits not packed"
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 1
+    packed = mock_qc.compiler.quil_to_native_quil.call_args.args[0].out()
+    assert 'PRAGMA INITIAL_REWIRING "NAIVE"' in packed
+    assert "MEASURE 0 ro[0]" in packed and "MEASURE 1 ro[1]" in packed
+    assert "MEASURE 3 ro[2]" in packed and "MEASURE 4 ro[3]" in packed
+
+    assert [r.header.name for r in result.results] == [c.name for c in circuits]
+    assert result.get_counts(0) == {"01": 10}
+    assert result.get_counts(1) == {"001": 10}
+    assert result.get_counts(2) == {"01": 10}
+
+
+def test_init__multiplexing__parameter_binds(mock_qc: MagicMock):
+    theta = Parameter("θ")
+    circuit = make_circuit(num_qubits=2)
+    circuit.rx(theta, 0)
+
+    with pytest.raises(ValueError, match="'multiplexing' cannot be combined with 'parameter_binds'"):
+        make_mock_job(mock_qc, circuit, multiplexing=True, parameter_binds=[{theta: 1.0}]).result(timeout=5)
+
+
+def test_result__temporal_batch_size(mock_qc: MagicMock):
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: executable
+    # The second circuit measures its first qubit as 1, and every other qubit is measured as 0. The last circuit is
+    # alone in its batch, so runs via OpenQASM as usual.
+    mock_qc.qam.get_result.side_effect = lambda program: make_execution_result(
+        [[0, 0, 1, 0, 0, 0]] * 10 if "ro" in program.declarations else [[0, 0]] * 10
+    )
+    circuits = [make_circuit(num_qubits=2) for _ in range(4)]
+
+    result = make_mock_job(
+        mock_qc, *circuits, shots=10, temporal_batch_size=3, native_fast_path=False, memory=True
+    ).result(timeout=5)
+
+    batched = mock_qc.compiler.quil_to_native_quil.call_args.args[0]
+    assert mock_qc.compiler.quil_to_native_quil.call_count == 1
+    assert batched.declarations["ro"].memory_size == 6
+    assert batched.out().count("RESET") == 2, "circuits not separated by active reset"
+    assert "MEASURE 0 ro[4]" in batched.out()
+    assert mock_qc.qam.execute.call_count == 2
+
+    assert len(result.results) == 4
+    assert [result.get_counts(i) for i in range(4)] == [{"00": 10}, {"01": 10}, {"00": 10}, {"00": 10}]
+    assert result.get_memory(1) == ["01"] * 10
+
+
+def test_init__temporal_batch_size__multiplexing(mock_qc: MagicMock):
+    circuits = [make_circuit(num_qubits=2) for _ in range(2)]
+
+    with pytest.raises(ValueError, match="'multiplexing' cannot be combined with 'temporal_batch_size'"):
+        make_mock_job(mock_qc, *circuits, multiplexing=True, temporal_batch_size=2).result(timeout=5)
+
+
+def test_result__duplicate_circuits(mock_qc: MagicMock):
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: executable
+    circuits = [make_circuit(num_qubits=2) for _ in range(3)]
+    circuits[1].name = "renamed"
+    different = make_circuit(num_qubits=2)
+    different.x(1)
+
+    result = make_mock_job(mock_qc, *circuits, different, shots=10).result(timeout=5)
+
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 2, "duplicate circuits compiled more than once"
+    executed = [call.args[0] for call in mock_qc.qam.execute.call_args_list]
+    assert len(executed) == 4
+    assert executed[0] is executed[1] is executed[2], "duplicate circuits did not share an executable"
+    assert executed[3] is not executed[0]
+    assert [r.header.name for r in result.results] == [c.name for c in [*circuits, different]]
+
+
+def test_init__parameter_binds__duplicate_bindings(mock_qc: MagicMock):
+    theta = Parameter("theta")
+    circuit = make_circuit(num_qubits=2)
+    circuit.rz(theta, 0)
+
+    # before_compile hooks require compiling each binding separately
+    result = make_mock_job(
+        mock_qc,
+        circuit,
+        parameter_binds=[{theta: 1.0}, {theta: 2.0}, {theta: 1.0}],
+        before_compile=[lambda qasm: qasm],
+    ).result(timeout=5)
+
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 2, "duplicate bindings compiled more than once"
+    assert mock_qc.qam.execute.call_count == 3
+    assert len(result.results) == 3
+
+
+@pytest.mark.parametrize(
+    "modify, duplicate",
+    [
+        (lambda c: setattr(c, "name", "other"), True),
+        (lambda c: c.metadata.update(key="value"), True),
+        (lambda c: c.rz(0.5, 0), False),
+        (lambda c: c.h(1), False),
+        (lambda c: c.x(0).c_if(c.cregs[0], 1), False),
+    ],
+)
+def test_circuit_key(modify: Callable[[QuilCircuit], Any], duplicate: bool):
+    circuit, other = make_circuit(num_qubits=2), make_circuit(num_qubits=2)
+    assert _circuit_key(circuit) == _circuit_key(other)
+
+    modify(other)
+
+    assert (_circuit_key(circuit) == _circuit_key(other)) is duplicate
+
+
+def test_circuit_key__custom_gates():
+    def make_custom_circuit(definition: Callable[[QuilCircuit], Any]) -> QuilCircuit:
+        custom = QuilCircuit(2, name="custom")
+        definition(custom)
+        circuit = make_circuit(num_qubits=2)
+        circuit.append(custom.to_gate(), [0, 1])
+        return circuit
+
+    cx = make_custom_circuit(lambda c: c.cx(0, 1))
+
+    assert _circuit_key(cx) == _circuit_key(make_custom_circuit(lambda c: c.cx(0, 1)))
+    assert _circuit_key(cx) != _circuit_key(make_custom_circuit(lambda c: c.cz(0, 1))), "compared by name only"
+
+
+def test_circuit_key__unitary_gates():
+    def make_xy_circuit(theta: float) -> QuilCircuit:
+        circuit = make_circuit(num_qubits=2)
+        circuit.append(XYGate(theta), [0, 1])
+        return circuit
+
+    circuit = make_xy_circuit(0.1)
+
+    assert _circuit_key(circuit) == _circuit_key(make_xy_circuit(0.1))
+    assert _circuit_key(circuit) != _circuit_key(make_xy_circuit(0.2))
+    assert circuit.data[-1].operation._definition is None, "definition synthesized to compare unitary gates"
+
+
+def test_circuit_key__controlled_custom_gates():
+    def make_controlled_circuit(definition: Callable[[QuilCircuit], Any]) -> QuilCircuit:
+        custom = QuilCircuit(2, name="custom")
+        definition(custom)
+        circuit = make_circuit(num_qubits=3)
+        circuit.append(custom.to_gate().control(), [2, 0, 1])
+        return circuit
+
+    cx = make_controlled_circuit(lambda c: c.cx(0, 1))
+
+    assert _circuit_key(cx) == _circuit_key(make_controlled_circuit(lambda c: c.cx(0, 1)))
+    assert _circuit_key(cx) != _circuit_key(make_controlled_circuit(lambda c: c.cz(0, 1))), "compared by name only"
+
+
+def test_result__memory(mock_qc: MagicMock):
+    readout = [[1, 0], [0, 0], [1, 0]]
+    mock_qc.qam.get_result.side_effect = lambda _: make_execution_result(readout)
+
+    result = make_mock_job(mock_qc, make_circuit(num_qubits=2), shots=3, memory=True).result(timeout=5)
+
+    assert result.get_memory() == ["01", "00", "01"]
+    assert result.get_counts() == {"01": 2, "00": 1}
+
+
+def test_result__no_memory(mock_qc: MagicMock):
+    readout = [[1, 0], [0, 0], [1, 0]]
+    mock_qc.qam.get_result.side_effect = lambda _: make_execution_result(readout)
+
+    result = make_mock_job(mock_qc, make_circuit(num_qubits=2), shots=3).result(timeout=5)
+
+    assert "memory" not in result.data()
+    assert result.get_counts() == {"01": 2, "00": 1}
+    assert result.get_memory_array().tolist() == readout
+    assert result.get_memory_array(0, packed=True).tolist() == [[0b01], [0b00], [0b01]]
+
+
+@pytest.mark.parametrize("num_bits", [1, 2, 64, 80])
+def test_decode_readout(num_bits: int):
+    states = (np.random.default_rng(1234).random((2000, num_bits)) < 0.05).astype(np.int64)
+    memory = ["".join(map(str, state[::-1])) for state in states]  # shot-by-shot decoding, for reference
+
+    bitstrings, outcomes, counts = _decode_readout(states)
+
+    assert [bitstrings[i] for i in outcomes] == memory
+    assert list(zip(bitstrings, counts)) == list(Counter(memory).items()), "counts not in order of first appearance"
+
+
 def test_cancel(job: RigettiQCSJob):
-    with pytest.raises(NotImplementedError, match="Cancelling jobs is not supported"):
-        job.cancel()
+    assert job.cancel() is False
+
+    assert job.status() == JobStatus.DONE, "cancelling a finished job changed its status"
+
+
+def test_cancel__compilation(mock_qc: MagicMock):
+    started = Event()
+    released = Event()
+    mock_qc.compiler.transpile_qasm_2.side_effect = lambda _: started.set() or released.wait() and Program()
+
+    circuits = [make_circuit(num_qubits=2) for _ in range(3)]
+    for i, circuit in enumerate(circuits):
+        circuit.rz(i, 0)
+
+    job = make_mock_job(mock_qc, *circuits)
+    assert started.wait(timeout=5)
+    assert job.cancel() is True
+    released.set()
+    result = job.result(timeout=5)
+
+    assert job.status() == JobStatus.CANCELLED
+    assert mock_qc.compiler.transpile_qasm_2.call_count == 1, "compilations not yet started were not skipped"
+    assert mock_qc.qam.execute.call_count == 0
+    assert result.success is False
+    assert [r.success for r in result.results] == [False, False, False], "not one result per circuit"
+    assert result.results[0].status.startswith("Cancelled")
+
+
+def test_cancel__compilation__parameter_binds(mock_qc: MagicMock):
+    started = Event()
+    released = Event()
+    mock_qc.compiler.transpile_qasm_2.side_effect = lambda _: started.set() or released.wait() and Program()
+    theta = Parameter("θ")
+    circuit = make_circuit(num_qubits=2)
+    circuit.rx(theta, 0)
+
+    job = make_mock_job(mock_qc, circuit, parameter_binds=[{theta: 0.0}, {theta: 1.0}], before_compile=[lambda q: q])
+    assert started.wait(timeout=5)
+    job.cancel()
+    released.set()
+    result = job.result(timeout=5)
+
+    assert job.status() == JobStatus.CANCELLED
+    assert [r.success for r in result.results] == [False, False], "not one result per binding"
+
+
+def test_cancel__executions(mock_qc: MagicMock):
+    started = Event()
+    released = Event()
+    response = object()
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: response
+    mock_qc.qam.get_result.side_effect = (
+        lambda _: started.set() or released.wait() and make_execution_result([[1, 0]] * 10)
+    )
+
+    job = make_mock_job(mock_qc, *[make_circuit(num_qubits=2) for _ in range(3)], max_outstanding_executions=1)
+    assert started.wait(timeout=5)
+    job.cancel()
+    released.set()
+    result = job.result(timeout=5)
+
+    assert job.status() == JobStatus.CANCELLED
+    assert mock_qc.qam.execute.call_count == 1, "executions submitted after cancelling"
+    mock_qc.qam.cancel.assert_called_once_with(response)
+    assert result.success is False
+    assert [r.success for r in result.results] == [True, False, False]
+    assert result.get_counts(0) == {"01": 10}, "partial results unavailable"
+    assert result.results[1].status.startswith("Cancelled")
+
+
+def test_cancel__qpu_cancelled(mock_qc: MagicMock):
+    started = Event()
+    released = Event()
+    responses = [object(), object()]
+    mock_qc.qam.execute.side_effect = lambda executable, memory_map=None: responses.pop(0)
+    mock_qc.qam.get_result.side_effect = (
+        lambda _: started.set() or released.wait() and make_execution_result([[0, 0]] * 10)
+    )
+
+    job = make_mock_job(
+        mock_qc, *[make_circuit(num_qubits=2) for _ in range(2)], max_outstanding_executions=2, max_result_workers=1
+    )
+    assert started.wait(timeout=5)
+    while responses:
+        sleep(0.01)
+    job.cancel()
+    released.set()
+    result = job.result(timeout=5)
+
+    assert job.status() == JobStatus.CANCELLED
+    assert mock_qc.qam.cancel.call_count == 2
+    assert mock_qc.qam.get_result.call_count == 1, "result of a cancelled execution was waited for"
+    assert [r.success for r in result.results] == [True, False]
+
+
+def test_cancel__all_retrieved(mock_qc: MagicMock, mocker):
+    collecting = Event()
+    released = Event()
+    collect_result = RigettiQCSJob._collect_result
+    mocker.patch.object(
+        RigettiQCSJob,
+        "_collect_result",
+        autospec=True,
+        side_effect=lambda job: collecting.set() or released.wait() and collect_result(job),
+    )
+
+    job = make_mock_job(mock_qc, make_circuit(num_qubits=2))
+    assert collecting.wait(timeout=5)
+    assert job.cancel() is False, "job cancelled after all results were retrieved"
+    released.set()
+    result = job.result(timeout=5)
+
+    assert job.status() == JobStatus.DONE
+    assert result.success is True
+    mock_qc.qam.cancel.assert_not_called()
 
 
 def test_submit(job: RigettiQCSJob):
@@ -216,10 +1096,21 @@ def backend():
     return RigettiQCSProvider().get_simulator(num_qubits=3)
 
 
+@pytest.fixture
+def mock_qc(mocker: MockerFixture) -> MagicMock:
+    qc = mocker.MagicMock()
+    qc.name = "2q-mock"
+    qc.compiler.transpile_qasm_2.side_effect = lambda _: Program()
+    qc.compiler.quil_to_native_quil.side_effect = lambda program: program
+    qc.compiler.native_quil_to_executable.side_effect = lambda program: program
+    qc.qam.get_result.side_effect = lambda _: make_execution_result([[0, 0]] * 1000)
+    return qc
+
+
 @pytest.fixture
 def job(backend):
     circuit = make_circuit(num_qubits=2)
-    return make_job(backend, circuit)
+    return make_job(backend, circuit, memory=True)
 
 
 def make_circuit(*, num_qubits) -> QuilCircuit:
@@ -233,6 +1124,7 @@ def make_job(
     backend,
     circuit,
     qc: Optional[QuantumComputer] = None,
+    executable_cache: Optional[ExecutableCache] = None,
     **options: Any,
 ):
     qc = qc or get_qc(backend.configuration().backend_name)
@@ -243,6 +1135,35 @@ def make_job(
         qc=qc,
         backend=backend,
         configuration=backend.configuration(),
+        executable_cache=executable_cache,
     )
+    job.wait_for_final_state(wait=0.1)
 
     return job
+
+
+def make_mock_job(
+    qc: MagicMock,
+    *circuits: QuilCircuit,
+    configuration: Optional[QasmBackendConfiguration] = None,
+    executable_cache: Optional[ExecutableCache] = None,
+    executor: Optional[Executor] = None,
+    **options: Any,
+) -> RigettiQCSJob:
+    return RigettiQCSJob(
+        job_id="some_job",
+        circuits=list(circuits),
+        options={**{"shots": 1000}, **options},
+        qc=qc,
+        backend=MagicMock(),
+        configuration=configuration or _configuration(qc.name, num_qubits=2, local=True, simulator=True),
+        executable_cache=executable_cache,
+        executor=executor,
+    )
+
+
+def make_execution_result(readout: List[List[int]]) -> MagicMock:
+    execution_result = MagicMock()
+    execution_result.readout_data = {"ro": np.array(readout)}
+    execution_result.execution_duration_microseconds = None
+    return execution_result
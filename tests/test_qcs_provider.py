@@ -15,9 +15,10 @@
 ##############################################################################
 import pytest
 import os
+from threading import Barrier
 
-from qcs_sdk.qpu.isa import InstructionSetArchitecture
-from qiskit_rigetti import RigettiQCSProvider
+from qcs_sdk.qpu.isa import InstructionSetArchitecture, GetISAError
+from qiskit_rigetti import RigettiQCSProvider, ExecutableStore
 
 
 def test_get_simulator(monkeypatch):
@@ -66,24 +67,24 @@ def test_get_simulator__remote(qvm_url: str, monkeypatch):
         _ = RigettiQCSProvider().get_simulator(num_qubits=42)
 
 
-def test_backends():
-    def simple_isa(nodes: int):
-        from json import dumps
-
-        return InstructionSetArchitecture.from_raw(
-            dumps(
-                {
-                    "architecture": {
-                        "nodes": [{"node_id": i} for i in range(nodes)],
-                        "edges": [],
-                    },
-                    "benchmarks": [],
-                    "instructions": [],
-                    "name": "_",
-                }
-            )
-        )
+def test_get_simulator__shared_qc(mocker):
+    get_qc = mocker.patch("qiskit_rigetti._qc_pool.get_qc", side_effect=lambda name, **_: mocker.MagicMock())
+    provider = RigettiQCSProvider()
+
+    backend1 = provider.get_simulator(num_qubits=2)
+    backend2 = provider.get_simulator(num_qubits=2)
+    noisy = provider.get_simulator(num_qubits=2, noisy=True)
+
+    assert backend1 is not backend2
+    assert backend1.qc is backend2.qc, "quantum computer not shared"
+    assert noisy.qc is not backend1.qc
+    assert [call.args[0] for call in get_qc.call_args_list] == ["2q-qvm", "2q-noisy-qvm"]
 
+    provider.refresh()
+    assert provider.get_simulator(num_qubits=2).qc is not backend1.qc, "pool not cleared on refresh"
+
+
+def test_backends():
     provider = RigettiQCSProvider()
     provider._get_quantum_processors = lambda: {
         "Device-1": simple_isa(1),
@@ -102,3 +103,111 @@ def test_backends():
     assert backend2.configuration().num_qubits == 2
     assert backend2.configuration().local is False
     assert backend2.configuration().simulator is False
+
+
+def test_backends__name(mocker):
+    provider = RigettiQCSProvider()
+    list_quantum_computers = mocker.patch("qiskit_rigetti._qcs_provider.list_quantum_computers")
+    get_isa = mocker.patch("qiskit_rigetti._qcs_provider.get_instruction_set_architecture")
+    get_isa.side_effect = lambda qpu, client: simple_isa(2)
+
+    (backend,) = provider.backends("Device-2")
+
+    assert backend.configuration().num_qubits == 2
+    assert list_quantum_computers.call_count == 0, "all processors listed for a single name"
+    assert [call.args[0] for call in get_isa.call_args_list] == ["Device-2"]
+    assert provider.backends("Device-2")[0] is backend, "backend not reused"
+
+    list_quantum_computers.return_value = ["Device-1", "Device-2"]
+    assert provider.backends() == [mocker.ANY, backend]
+
+
+def test_backends__concurrent(mocker):
+    provider = RigettiQCSProvider()
+    qpus = [f"Device-{i}" for i in range(4)]
+    mocker.patch("qiskit_rigetti._qcs_provider.list_quantum_computers", return_value=qpus)
+    barrier = Barrier(len(qpus), timeout=5)
+
+    def get_isa(qpu, client):
+        barrier.wait()  # Only returns once every ISA is being fetched at the same time
+        if qpu == "Device-3":
+            raise GetISAError("unavailable")
+        return simple_isa(1)
+
+    mocker.patch("qiskit_rigetti._qcs_provider.get_instruction_set_architecture", side_effect=get_isa)
+
+    assert [b.name() for b in provider.backends()] == ["Device-0", "Device-1", "Device-2"]
+
+
+def test_backends__discovery_cache(tmp_path, mocker):
+    list_quantum_computers = mocker.patch(
+        "qiskit_rigetti._qcs_provider.list_quantum_computers", return_value=["Device-1", "Device-2"]
+    )
+    get_isa = mocker.patch("qiskit_rigetti._qcs_provider.get_instruction_set_architecture")
+    get_isa.side_effect = lambda qpu, client: simple_isa(int(qpu[-1]))
+    get_coupling_map = mocker.patch(
+        "qiskit_rigetti._qcs_backend.get_coupling_map_from_qc_topology", return_value=[(0, 1), (1, 0)]
+    )
+
+    backend = RigettiQCSProvider(discovery_cache=tmp_path).backends()[1]
+    backend._qc = mocker.MagicMock()
+    assert backend.coupling_map.get_edges() == [(0, 1), (1, 0)]
+
+    provider = RigettiQCSProvider(discovery_cache=tmp_path)
+    backend = provider.backends("Device-2")[0]
+
+    assert [b.configuration().num_qubits for b in provider.backends()] == [1, 2]
+    assert backend.coupling_map.get_edges() == [(0, 1), (1, 0)]
+    assert backend._qc is None, "quantum computer loaded for a cached coupling map"
+    assert (list_quantum_computers.call_count, get_isa.call_count, get_coupling_map.call_count) == (1, 2, 1)
+
+    provider.refresh()
+    provider.backends()
+
+    assert (list_quantum_computers.call_count, get_isa.call_count) == (2, 4), "refresh did not refetch"
+
+
+def test_backends__qc_from_cached_isa(tmp_path, mocker):
+    mocker.patch("qiskit_rigetti._qcs_provider.list_quantum_computers", return_value=["Device-2"])
+    get_isa = mocker.patch("qiskit_rigetti._qcs_provider.get_instruction_set_architecture")
+    get_isa.side_effect = lambda qpu, client: simple_isa(2)
+    get_qc = mocker.patch("qiskit_rigetti._qc_pool.get_qc")
+    RigettiQCSProvider(discovery_cache=tmp_path).backends()
+
+    (backend,) = RigettiQCSProvider(discovery_cache=tmp_path).backends()
+
+    assert backend.qc.name == "Device-2"
+    assert backend.qc.qubits() == [0, 1]
+    assert get_isa.call_count == 1, "ISA refetched"
+    assert get_qc.call_count == 0, "quantum computer not built from the cached ISA"
+
+
+def test_backends__executable_store(tmp_path):
+    provider = RigettiQCSProvider(executable_store=tmp_path)
+    provider._get_quantum_processors = lambda: {
+        "Device-1": simple_isa(1),
+        "Device-2": simple_isa(2),
+    }
+    backend1, backend2 = provider.backends()
+
+    assert backend1.executable_cache.store is not None
+    assert backend1.executable_cache.store is backend2.executable_cache.store
+    assert backend1.executable_cache.store.path == str(tmp_path / ExecutableStore.FILENAME)
+
+
+def simple_isa(nodes: int):
+    from json import dumps
+
+    return InstructionSetArchitecture.from_raw(
+        dumps(
+            {
+                "architecture": {
+                    "nodes": [{"node_id": i} for i in range(nodes)],
+                    "edges": [],
+                },
+                "benchmarks": [],
+                "instructions": [],
+                "name": "_",
+            }
+        )
+    )
@@ -0,0 +1,224 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import numpy as np
+import pytest
+from pyquil import Program
+from pyquil.simulation.matrices import QUANTUM_GATES
+from pyquil.simulation.tools import program_unitary
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+from qiskit.circuit import Parameter
+from qiskit.circuit.library import XXPlusYYGate
+from qiskit.quantum_info import Operator
+
+from qiskit_rigetti import QuilCircuit
+
+from qiskit_rigetti._quil_translation import circuit_to_program, circuits_to_program, QuilTranslationError
+
+
+def test_circuit_to_program():
+    circuit = QuantumCircuit(QuantumRegister(2, "q"), ClassicalRegister(2, "ro"))
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.sdg(1)
+    circuit.measure([0, 1], [1, 0])
+
+    assert circuit_to_program(circuit) == Program(
+        "DECLARE ro BIT[2]",
+        "H 0",
+        "CNOT 0 1",
+        "DAGGER S 1",
+        "MEASURE 0 ro[1]",
+        "MEASURE 1 ro[0]",
+    )
+
+
+def test_circuit_to_program__readout_not_named_ro():
+    readout = ClassicalRegister(2, "not_ro")
+    circuit = QuantumCircuit(QuantumRegister(2, "q"), ClassicalRegister(1, "c"), readout)
+    circuit.h(0)
+    circuit.measure([0, 1], [readout[1], readout[0]])
+
+    assert circuit_to_program(circuit) == Program(
+        "DECLARE ro BIT[2]",
+        "H 0",
+        "MEASURE 0 ro[1]",
+        "MEASURE 1 ro[0]",
+    )
+    assert [reg.name for reg in circuit.cregs] == ["c", "not_ro"], "circuit was modified"
+
+
+def test_circuit_to_program__parameters():
+    theta = Parameter("theta")
+    phi = Parameter("phi")
+    circuit = QuantumCircuit(QuantumRegister(1, "q"), ClassicalRegister(1, "ro"))
+    circuit.rx(theta, 0)
+    circuit.rz(2 * phi, 0)
+    circuit.measure([0], [0])
+
+    program = circuit_to_program(circuit, [theta, phi])
+
+    assert program == Program(
+        "DECLARE ro BIT[1]",
+        "DECLARE qiskit_params REAL[2]",
+        "RX(qiskit_params[0]) 0",
+        "RZ(2*qiskit_params[1]) 0",
+        "MEASURE 0 ro[0]",
+    )
+
+
+def test_circuit_to_program__unbound_parameters():
+    circuit = QuantumCircuit(QuantumRegister(1, "q"), ClassicalRegister(1, "ro"))
+    circuit.rx(Parameter("theta"), 0)
+
+    with pytest.raises(QuilTranslationError, match="Circuit has unbound parameters: theta"):
+        circuit_to_program(circuit)
+
+
+def test_circuit_to_program__definition():
+    inner = QuantumCircuit(2, name="bell")
+    inner.h(0)
+    inner.cx(0, 1)
+    circuit = QuantumCircuit(QuantumRegister(3, "q"), ClassicalRegister(1, "ro"))
+    circuit.append(inner.to_gate(), [2, 1])
+    circuit.measure([2], [0])
+
+    assert circuit_to_program(circuit) == Program(
+        "DECLARE ro BIT[1]",
+        "H 2",
+        "CNOT 2 1",
+        "MEASURE 2 ro[0]",
+    )
+
+
+def test_circuit_to_program__quil_gates():
+    circuit = QuilCircuit(QuantumRegister(2, "q"), ClassicalRegister(0, "ro"))
+    circuit.h(0)
+    circuit.xy(0.5, 0, 1)
+    circuit.pswap(-1.25, 0, 1)
+    circuit.cphase00(1.5, 0, 1)
+    circuit.cphase01(2.25, 0, 1)
+    circuit.cphase10(-2.5, 0, 1)
+
+    program = circuit_to_program(circuit)
+
+    assert [str(instruction) for instruction in program.instructions[1:]] == [
+        "H 0",
+        "XY(0.5) 1 0",
+        "PSWAP(-1.25) 1 0",
+        "CPHASE00(1.5) 1 0",
+        "CPHASE01(2.25) 1 0",
+        "CPHASE10(-2.5) 1 0",
+    ]
+    assert_equivalent(circuit, program)
+
+
+def test_circuit_to_program__xx_plus_yy():
+    circuit = QuantumCircuit(QuantumRegister(2, "q"), ClassicalRegister(0, "ro"))
+    circuit.h(0)
+    circuit.append(XXPlusYYGate(0.5), [0, 1])
+    circuit.append(XXPlusYYGate(0.5, 0.25), [1, 0])
+
+    program = circuit_to_program(circuit)
+
+    assert [str(instruction) for instruction in program.instructions[1:]] == [
+        "H 0",
+        "XY(-0.5) 0 1",
+        "RZ(0.25) 1",
+        "XY(-0.5) 1 0",
+        "RZ(-0.25) 1",
+    ]
+    assert_equivalent(circuit, program)
+
+
+def test_circuit_to_program__unitary():
+    circuit = QuilCircuit(QuantumRegister(3, "q"), ClassicalRegister(0, "ro"))
+    circuit.h(0)
+    circuit.can(0.1, 0.2, 0.3, 2, 0)
+    circuit.can(0.1, 0.2, 0.3, 0, 1)
+
+    program = circuit_to_program(circuit)
+
+    assert len(program.defined_gates) == 1, "identical unitaries not defined once"
+    assert program.defined_gates[0].name.startswith("CAN_")
+    assert_equivalent(circuit, program)
+
+
+def test_circuit_to_program__barrier():
+    circuit = QuantumCircuit(QuantumRegister(3, "q"), ClassicalRegister(1, "ro"))
+    circuit.h(0)
+    circuit.barrier([0, 2])
+    circuit.measure([2], [0])
+
+    assert circuit_to_program(circuit) == Program(
+        "DECLARE ro BIT[1]",
+        "H 0",
+        "FENCE 0 2",
+        "MEASURE 2 ro[0]",
+    )
+
+
+def test_circuit_to_program__conditional():
+    circuit = QuantumCircuit(QuantumRegister(1, "q"), ClassicalRegister(1, "ro"))
+    circuit.x(0).c_if(circuit.cregs[0], 1)
+
+    with pytest.raises(QuilTranslationError, match="Classically-conditioned instruction 'x' is not supported"):
+        circuit_to_program(circuit)
+
+
+def test_circuits_to_program():
+    bell = QuantumCircuit(QuantumRegister(2, "q"), ClassicalRegister(2, "ro"))
+    bell.h(0)
+    bell.cx(0, 1)
+    bell.measure([0, 1], [0, 1])
+    flip = QuantumCircuit(QuantumRegister(1, "q"), ClassicalRegister(1, "ro"))
+    flip.x(0)
+    flip.measure(0, 0)
+
+    assert circuits_to_program([bell, flip], [[5, 4], [2]]) == Program(
+        "DECLARE ro BIT[3]",
+        "H 5",
+        "CNOT 5 4",
+        "MEASURE 5 ro[0]",
+        "MEASURE 4 ro[1]",
+        "X 2",
+        "MEASURE 2 ro[2]",
+    )
+
+
+def test_circuits_to_program__reset_between():
+    circuit = QuantumCircuit(QuantumRegister(1, "q"), ClassicalRegister(1, "ro"))
+    circuit.x(0)
+    circuit.measure(0, 0)
+
+    assert circuits_to_program([circuit, circuit], reset_between=True) == Program(
+        "DECLARE ro BIT[2]",
+        "X 0",
+        "MEASURE 0 ro[0]",
+        "RESET",
+        "X 0",
+        "MEASURE 0 ro[1]",
+    )
+
+
+def assert_equivalent(circuit: QuantumCircuit, program: Program):
+    gates = {**QUANTUM_GATES, **{gate.name: np.array(gate.matrix, dtype=complex) for gate in program.defined_gates}}
+    instructions = Program([instruction for instruction in program.instructions if hasattr(instruction, "qubits")])
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("pyquil.simulation.tools.QUANTUM_GATES", gates)
+        actual = program_unitary(instructions, circuit.num_qubits)
+
+    expected = Operator(circuit).data
+    assert np.allclose(actual, expected)
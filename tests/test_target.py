@@ -0,0 +1,50 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from unittest.mock import MagicMock
+
+import networkx as nx
+from pyquil.quantum_processor import NxQuantumProcessor
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
+
+from qiskit_rigetti._native_quil import is_native_program
+from qiskit_rigetti._quil_translation import circuit_to_program
+from qiskit_rigetti._target import get_target
+
+
+def test_get_target():
+    compiler_isa = NxQuantumProcessor(nx.Graph([(0, 1), (1, 2)])).to_compiler_isa()
+
+    target = get_target(compiler_isa, num_qubits=3)
+
+    assert target.num_qubits == 3
+    assert set(target.operation_names) == {"id", "sx", "sxdg", "rz", "measure", "cz", "xx_plus_yy"}
+    assert set(target.qargs_for_operation_name("cz")) == {(0, 1), (1, 0), (1, 2), (2, 1)}
+    assert target["cz"][(0, 1)].duration is None
+    assert get_target(compiler_isa, num_qubits=3) is target, "target not cached per ISA"
+
+
+def test_get_target__native_transpilation():
+    qc = MagicMock()
+    qc.quantum_processor = NxQuantumProcessor(nx.Graph([(0, 1), (1, 2)]))
+    target = get_target(qc.quantum_processor.to_compiler_isa(), num_qubits=3)
+    circuit = QuantumCircuit(QuantumRegister(3, "q"), ClassicalRegister(3, "ro"))
+    circuit.h(0)
+    circuit.cx(0, 2)
+    circuit.measure([0, 1, 2], [0, 1, 2])
+
+    transpiled = transpile(circuit, target=target, optimization_level=1)
+
+    assert is_native_program(circuit_to_program(transpiled), qc), "transpiled circuit not native"
@@ -0,0 +1,65 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from threading import Thread
+
+from qiskit_rigetti._timings import StageTimings
+
+
+def test_stage():
+    timings = StageTimings()
+
+    with timings.stage("compile"):
+        pass
+    timings.add("compile", 1.0)
+    timings.add("queue", 0.5)
+
+    assert timings.as_dict()["compile"] >= 1.0
+    assert timings.as_dict()["queue"] == 0.5
+
+
+def test_stage__error():
+    timings = StageTimings()
+
+    try:
+        with timings.stage("compile"):
+            raise RuntimeError("quilc unavailable")
+    except RuntimeError:
+        pass
+
+    assert "compile" in timings.as_dict(), "failed stage not recorded"
+
+
+def test_add__concurrent():
+    timings = StageTimings()
+
+    threads = [Thread(target=lambda: [timings.add("queue", 1.0) for _ in range(1000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert timings.as_dict() == {"queue": 4000.0}
+
+
+def test_copy():
+    timings = StageTimings()
+    timings.add("compile", 1.0)
+
+    copy = timings.copy()
+    copy.add("compile", 1.0)
+
+    assert timings.as_dict() == {"compile": 1.0}
+    assert copy.as_dict() == {"compile": 2.0}
@@ -0,0 +1,53 @@
+##############################################################################
+# Copyright 2021 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+import math
+
+import numpy as np
+
+from qiskit_rigetti._topology import Topology
+
+
+def test_topology():
+    # 0 - 1 - 2 - 3, and 4 - 5 disconnected from them
+    topology = Topology([(0, 1), (1, 0), (1, 2), (2, 3), (4, 5)])
+
+    assert topology.neighbors == {0: (1,), 1: (0, 2), 2: (1, 3), 3: (2,), 4: (5,), 5: (4,)}
+    assert topology.components == [frozenset({0, 1, 2, 3}), frozenset({4, 5})]
+    assert topology.component_of(5) == 1
+    assert topology.distance(0, 3) == 3
+    assert math.isinf(topology.distance(0, 4))
+    assert np.array_equal(topology.distance_matrix, topology.coupling_map.distance_matrix)
+    assert topology.coupling_map._dist_matrix is not None, "distance matrix not precomputed"
+
+
+def test_regions():
+    topology = Topology([(0, 1), (1, 2), (2, 3), (4, 5)])
+
+    assert topology.regions(2) == [(0, 1), (1, 2), (2, 3), (4, 5)]
+    assert topology.regions(3) == [(0, 1, 2), (1, 2, 3)]
+    assert topology.regions(5) == []
+    assert topology.regions(3) is topology.regions(3), "regions not computed once per size"
+
+
+def test_regions__index_gaps():
+    # Qubit 2 is not in any edge, though the coupling map fills the gap with it
+    topology = Topology([(0, 1), (3, 4)])
+
+    assert topology.coupling_map.size() == 5
+    assert sorted(topology.neighbors) == [0, 1, 3, 4]
+    assert topology.components == [frozenset({0, 1}), frozenset({3, 4})]
+    assert topology.regions(1) == [(0,), (1,), (3,), (4,)]
+    assert topology.regions(2) == [(0, 1), (3, 4)]